@@ -0,0 +1,86 @@
+# anytime probabilities: wall-clock budget vs fixed k_max
+#--------------------------------------------------------
+# python -m benchmarks.anytime [GAMES] [MS ...]
+
+import gc
+import sys
+import time
+
+from core.board import Board, CellState, GameState
+from core.rng import RNG
+from core.snapshot import Snapshot
+from core.solver import ComponentStatus, Solver
+
+SIZE = (50, 50, 560)
+K_MAX = (20, 28)
+
+
+def stuck_positions(games: int):
+    """
+    Copies of seeded boards at every point where the solver is stuck.
+    Play goes on by opening a random safe cell.
+    """
+    positions = []
+    width, height, mines = SIZE
+    for seed in range(games):
+        rng = RNG(seed)
+        board = Board(width, height, mines, rng)
+        board.open(width // 2, height // 2)
+        solver = Solver(board)
+        while board.game_state == GameState.PLAYING:
+            moves = solver.step_batch()
+            if moves:
+                solver.apply_moves(moves)
+                continue
+            positions.append(Snapshot.loads(Snapshot.dumps(board)))
+            safe = [(x, y) for y in range(height) for x in range(width)
+                    if board.get_state(x, y) == CellState.UNKNOWN and not board.is_mine(x, y)]
+            if not safe:
+                break
+            board.open(*rng.choice(safe))
+    return positions
+
+
+def measure(positions, k_max: int = 28, budget=None):
+    """
+    Mean, 95th percentile and max wall time of compute_probabilities with
+    an empty cache, and the share of frontier cells in exact components.
+    """
+    times = []
+    exact = cells = 0
+    for board in positions:
+        solver = Solver(board, k_max=k_max)
+        start = time.perf_counter()
+        solver.compute_probabilities(budget)
+        times.append(time.perf_counter() - start)
+        for status in solver.status:
+            cells += len(status.cells)
+            exact += len(status.cells) if status.method == ComponentStatus.EXACT else 0
+        solver.close()
+    times.sort()
+    return (sum(times) / len(times), times[len(times) * 95 // 100], times[-1],
+            exact / cells if cells else 1.0)
+
+
+def main(argv=None):
+    """
+    Compare fixed k_max cutoffs with wall-clock budgets on the same positions.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    games = int(argv[0]) if argv else 20
+    budgets = [float(a) for a in argv[1:]] or [1.0, 5.0, 20.0, 100.0]
+
+    positions = stuck_positions(games)
+    gc.collect()
+    gc.freeze()
+    print(f"{len(positions)} positions from {games} games of {SIZE[0]}x{SIZE[1]}/{SIZE[2]}")
+    print(f"{'mode':<16} {'mean':>9} {'p95':>9} {'max':>9} {'exact cells':>12}")
+    modes = [(f"k_max {k_max}", {"k_max": k_max}) for k_max in K_MAX]
+    modes += [(f"budget {ms:g} ms", {"budget": ms / 1000}) for ms in budgets]
+    for name, options in modes:
+        mean, p95, worst, share = measure(positions, **options)
+        print(f"{name:<16} {mean * 1000:>7.1f}ms {p95 * 1000:>7.1f}ms {worst * 1000:>7.1f}ms {share:>12.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# Board vs FlatBoard: memory per cell and open/flood-fill throughput
+#-------------------------------------------------------------------
+# python -m benchmarks.board_layout [SIZE] [DENSITY]
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from core.board import Board
+from core.flat_board import FlatBoard
+from core.rng import RNG
+
+
+def measure(board_cls, size: int, density: float, seed: int = 1):
+    """
+    Build a size x size board, open the centre and report memory and throughput.
+    Memory and timing are taken in separate runs because tracemalloc slows allocation.
+    """
+    num_mines = int(size * size * density)
+
+    tracemalloc.start()
+    board = board_cls(size, size, num_mines, RNG(seed))
+    _, revealed = board.open(size // 2, size // 2)
+    count = len(revealed)
+    del revealed
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del board
+    gc.collect()
+
+    board = board_cls(size, size, num_mines, RNG(seed))
+    start = time.perf_counter()
+    board.open(size // 2, size // 2)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "layout": board_cls.__name__,
+        "bytes_per_cell": current / (size * size),
+        "first_open_s": elapsed,
+        "revealed": count,
+        "cells_per_s": count / elapsed if elapsed else 0.0,
+    }
+
+
+def main(argv=None):
+    """
+    Print a comparison table.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    size = int(argv[0]) if argv else 500
+    density = float(argv[1]) if len(argv) > 1 else 0.01
+
+    print(f"{size}x{size}, density={density}")
+    print(f"{'layout':<10} {'bytes/cell':>10} {'first open':>11} {'revealed':>9} {'cells/s':>12}")
+    for board_cls in (Board, FlatBoard):
+        r = measure(board_cls, size, density)
+        print(f"{r['layout']:<10} {r['bytes_per_cell']:>10.1f} {r['first_open_s']:>10.3f}s "
+              f"{r['revealed']:>9} {r['cells_per_s']:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# component decomposition: pairwise scan vs union through shared unknowns
+#--------------------------------------------------------------------------
+# python -m benchmarks.components [SIZE ...]
+
+import sys
+import time
+
+from core.dsu import DSU
+from core.flat_board import FlatBoard
+from core.frontier import Frontier
+from core.rng import RNG
+
+DENSITY = 0.16
+OPENINGS_PER_100_CELLS = 1
+
+
+def legacy_get_components(frontier: Frontier):
+    """
+    The original Frontier.get_components: every constraint pair is tested
+    for overlap and unknowns are recovered by scanning every bit position.
+    """
+    if not frontier.constraints:
+        return []
+    dsu = DSU(set(range(len(frontier.constraints))))
+    for i in range(len(frontier.constraints)):
+        for j in range(i + 1, len(frontier.constraints)):
+            if frontier.constraints[i].scope_mask & frontier.constraints[j].scope_mask:
+                dsu.union(i, j)
+    components = []
+    for constraint_set in dsu.get_components().values():
+        comp_constraints = [frontier.constraints[i] for i in sorted(constraint_set)]
+        unknowns_mask = 0
+        for c in comp_constraints:
+            unknowns_mask |= c.scope_mask
+        unknown_indices = set()
+        for idx in range(len(frontier.unknowns)):
+            if unknowns_mask & (1 << idx):
+                unknown_indices.add(idx)
+        components.append((comp_constraints, unknown_indices))
+    return components
+
+
+def build_frontier(size: int, seed: int = 0) -> Frontier:
+    """
+    A size x size board opened at random safe cells until the frontier is long.
+    """
+    rng = RNG(seed)
+    board = FlatBoard(size, size, int(size * size * DENSITY), rng)
+    board.open(size // 2, size // 2)
+    for _ in range(size * size * OPENINGS_PER_100_CELLS // 100):
+        x, y = rng.randint(0, size - 1), rng.randint(0, size - 1)
+        if not board.is_mine(x, y):
+            board.open(x, y)
+    return Frontier(board)
+
+
+def timed(fn, *args):
+    """
+    Best of three wall times.
+    """
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main(argv=None):
+    """
+    Time both decompositions on square boards and check they agree.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(a) for a in argv] or [100, 200, 300]
+
+    print(f"{'board':<10} {'constraints':>11} {'unknowns':>9} {'components':>10} {'pairwise':>10} {'shared':>10}")
+    for size in sizes:
+        frontier = build_frontier(size)
+        new, new_time = timed(frontier.get_components)
+        if len(frontier.constraints) <= 20_000:
+            old, old_time = timed(legacy_get_components, frontier)
+            assert old == new
+            old_text = f"{old_time:>9.3f}s"
+        else:
+            old_text = f"{'—':>10}"
+        print(f"{size}x{size:<6} {len(frontier.constraints):>11} {len(frontier.unknowns):>9}"
+              f" {len(new):>10} {old_text} {new_time:>9.4f}s")
+
+
+if __name__ == '__main__':
+    main()
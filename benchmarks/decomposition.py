@@ -0,0 +1,88 @@
+# path-decomposition DP vs bitset enumeration on large components
+#-----------------------------------------------------------------
+# python -m benchmarks.decomposition [GAMES] [POSITIONS]
+
+import gc
+import sys
+import time
+from collections import defaultdict
+
+from benchmarks.anytime import stuck_positions
+from benchmarks.enumeration import harvest_components
+from core.decomposition import PathEnumerator
+from core.enumeration import BitsetEnumerator
+from core.solver import ComponentStatus, Solver
+
+BITSET_MAX = 24
+BUCKET = 20
+
+
+def components_table(games: int):
+    """
+    Mean and max latency per size bucket for the DP engine on every
+    component of seeded expert games, with the bitset engine where it is
+    still practical, and the largest DP layer width.
+    """
+    components = harvest_components(games, 10 ** 6)
+    print(f"{len(components)} components from {games} expert games")
+    print(f"{'k':>9} {'n':>5} {'dp mean':>9} {'dp max':>9} {'width':>6} {'bitset mean':>12}")
+    buckets = defaultdict(list)
+    for constraints, unknown_indices in components:
+        start = time.perf_counter()
+        enumerator = PathEnumerator(constraints, unknown_indices).run()
+        dp = time.perf_counter() - start
+        bitset = None
+        if len(unknown_indices) <= BITSET_MAX:
+            start = time.perf_counter()
+            BitsetEnumerator(constraints, unknown_indices).run()
+            bitset = time.perf_counter() - start
+        buckets[(len(unknown_indices) - 1) // BUCKET].append((dp, enumerator.width, bitset))
+
+    for bucket in sorted(buckets):
+        rows = buckets[bucket]
+        dp = [row[0] for row in rows]
+        bitset = [row[2] for row in rows if row[2] is not None]
+        k_range = f"{bucket * BUCKET + 1}-{bucket * BUCKET + BUCKET}"
+        bitset_mean = f"{sum(bitset) / len(bitset) * 1e3:>10.2f}ms" if bitset else f"{'':>12}"
+        print(f"{k_range:>9} {len(rows):>5} {sum(dp) / len(dp) * 1e3:>7.2f}ms {max(dp) * 1e3:>7.2f}ms "
+              f"{max(row[1] for row in rows):>6} {bitset_mean}")
+
+
+def positions_table(games: int):
+    """
+    compute_probabilities on stuck 50x50 positions: bitset with the default
+    k_max against the DP engine with no cutoff.
+    """
+    positions = stuck_positions(games)
+    gc.collect()
+    gc.freeze()
+    print(f"\n{len(positions)} stuck positions from {games} games of 50x50/560")
+    print(f"{'mode':<20} {'mean':>9} {'p95':>9} {'max':>9} {'exact cells':>12}")
+    for name, options in (("bitset k_max 28", {}), ("dp, no k_max", {"engine": "dp", "k_max": 10 ** 6})):
+        times = []
+        exact = cells = 0
+        for board in positions:
+            solver = Solver(board, **options)
+            start = time.perf_counter()
+            solver.compute_probabilities()
+            times.append(time.perf_counter() - start)
+            for status in solver.status:
+                cells += len(status.cells)
+                exact += len(status.cells) if status.method == ComponentStatus.EXACT else 0
+            solver.close()
+        times.sort()
+        print(f"{name:<20} {sum(times) / len(times) * 1e3:>7.1f}ms {times[len(times) * 95 // 100] * 1e3:>7.1f}ms "
+              f"{times[-1] * 1e3:>7.1f}ms {exact / cells if cells else 1.0:>12.1%}")
+
+
+def main(argv=None):
+    """
+    Per-component latency by size, then whole-position probabilities.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    components_table(int(argv[0]) if argv else 10)
+    positions_table(int(argv[1]) if len(argv) > 1 else 10)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# enumeration engines: latency by component size
+#------------------------------------------------
+# python -m benchmarks.enumeration [GAMES] [MAX_K]
+
+import sys
+import time
+from collections import defaultdict
+
+from core.board import Board, CellState
+from core.frontier import Frontier
+from core.rng import RNG
+from core.solver import Solver
+
+
+def harvest_components(games: int, max_k: int):
+    """
+    Collect frontier components from seeded expert games. Progress is made by
+    opening a random safe cell whenever the frontier is inspected, so the
+    corpus does not depend on solver quality.
+    """
+    components = []
+    for seed in range(games):
+        rng = RNG(seed)
+        board = Board(30, 16, 99, rng)
+        board.open(15, 8)
+        while board.game_state == 0:
+            frontier = Frontier(board)
+            for constraints, unknown_indices in frontier.get_components():
+                if len(unknown_indices) <= max_k:
+                    components.append((constraints, unknown_indices))
+            safe = [(x, y) for y in range(board.height) for x in range(board.width)
+                    if board.get_state(x, y) == CellState.UNKNOWN and not board.is_mine(x, y)]
+            if not safe:
+                break
+            board.open(*rng.choice(safe))
+    return components
+
+
+def main(argv=None):
+    """
+    Print mean and max latency per size bucket for each engine.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    games = int(argv[0]) if argv else 5
+    max_k = int(argv[1]) if len(argv) > 1 else 24
+
+    components = harvest_components(games, max_k)
+    board = Board(1, 1, 0, RNG(0))
+    print(f"{len(components)} components from {games} games")
+    print(f"{'engine':<10} {'k':>7} {'n':>5} {'mean ms':>9} {'max ms':>9}")
+
+    for engine in Solver.ENGINES:
+        buckets = defaultdict(list)
+        for constraints, unknown_indices in components:
+            solver = Solver(board, engine=engine)
+            start = time.perf_counter()
+            solver._enumerate_component(constraints, unknown_indices, None)
+            buckets[(len(unknown_indices) - 1) // 4].append(time.perf_counter() - start)
+            solver.close()
+
+        for bucket in sorted(buckets):
+            times = buckets[bucket]
+            k_range = f"{bucket * 4 + 1}-{bucket * 4 + 4}"
+            print(f"{engine:<10} {k_range:>7} {len(times):>5} "
+                  f"{sum(times) / len(times) * 1e3:>9.2f} {max(times) * 1e3:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
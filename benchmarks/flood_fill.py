@@ -0,0 +1,91 @@
+# flood fill: set/deque BFS vs flat-index region
+#------------------------------------------------
+# python -m benchmarks.flood_fill [SIZE] [MINES]
+
+import gc
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+from core.board import Board, CellState
+from core.flat_board import FlatBoard
+from core.rng import RNG
+
+
+def legacy_flood_fill(board: Board, x: int, y: int):
+    """
+    The original Board._flood_fill: deque of tuples, visited set, revealed set.
+    """
+    revealed = set()
+    queue = deque([(x, y)])
+    visited = {(x, y)}
+
+    while queue:
+        cx, cy = queue.popleft()
+        board.state[cy][cx] = CellState.REVEALED
+        revealed.add((cx, cy))
+
+        if board.get_count(cx, cy) == 0:
+            for nx, ny in board.neighbors.cells(cx, cy):
+                if (nx, ny) not in visited and board.state[ny][nx] == CellState.UNKNOWN:
+                    visited.add((nx, ny))
+                    queue.append((nx, ny))
+
+    return revealed
+
+
+def prepared(board_cls, size: int, mines: int):
+    """
+    A board with mines placed around the centre but nothing revealed.
+    """
+    board = board_cls(size, size, mines, RNG(3))
+    board._place_mines(size // 2, size // 2)
+    board.first_click_done = True
+    return board
+
+
+def measure(name: str, board_cls, fill, size: int, mines: int):
+    """
+    Time one fill of the giant central region, then rerun under tracemalloc
+    for the peak memory of the fill itself.
+    """
+    board = prepared(board_cls, size, mines)
+    gc.collect()
+    start = time.perf_counter()
+    region = fill(board, size // 2, size // 2)
+    elapsed = time.perf_counter() - start
+    cells = len(region)
+    del region, board
+    gc.collect()
+
+    board = prepared(board_cls, size, mines)
+    gc.collect()
+    tracemalloc.start()
+    region = fill(board, size // 2, size // 2)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del region, board
+    gc.collect()
+
+    print(f"{name:<22} {cells:>10} {elapsed:>9.2f}s {cells / elapsed:>12.0f} {peak / 2 ** 20:>10.1f}")
+
+
+def main(argv=None):
+    """
+    Compare the fills on a sparse board whose centre opens almost everything.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    size = int(argv[0]) if argv else 1000
+    mines = int(argv[1]) if len(argv) > 1 else size // 10
+
+    print(f"{size}x{size}, {mines} mines")
+    print(f"{'fill':<22} {'revealed':>10} {'time':>10} {'cells/s':>12} {'peak MiB':>10}")
+    measure("Board, set/deque", Board, legacy_flood_fill, size, mines)
+    measure("Board, region", Board, Board._flood_fill, size, mines)
+    measure("FlatBoard, set/deque", FlatBoard, legacy_flood_fill, size, mines)
+    measure("FlatBoard, region", FlatBoard, FlatBoard._flood_fill, size, mines)
+
+
+if __name__ == '__main__':
+    main()
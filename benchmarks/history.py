@@ -0,0 +1,77 @@
+# undo: inverse deltas vs restoring a copy of the board
+#-------------------------------------------------------
+# python -m benchmarks.history [SIZE]
+
+import copy
+import sys
+import time
+
+from core.board import Board
+from core.flat_board import FlatBoard
+from core.history import History
+from core.rng import RNG
+from core.snapshot import Snapshot
+from core.solver import Solver
+
+DENSITY = 0.12
+
+
+def timed(fn):
+    """
+    Best of three wall times.
+    """
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure(name: str, board: Board, history: History, copy_restore):
+    """
+    Undo and redo the last call, against one copy-based save and restore.
+    """
+    changed = len(history.undo_stack[-1])
+
+    def undo_redo():
+        history.undo()
+        history.redo()
+
+    both = timed(undo_redo)
+    restore = timed(copy_restore)
+    print(f"{name:<32} {changed:>9} {both / 2 * 1000:>10.3f}ms {restore * 1000:>10.1f}ms")
+
+
+def main(argv=None):
+    """
+    Undo three kinds of call on both board layouts.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    size = int(argv[0]) if argv else 300
+
+    print(f"{size}x{size}, density {DENSITY}")
+    print(f"{'call undone':<32} {'cells':>9} {'undo':>12} {'copy':>12}")
+    for board_cls, label in ((Board, "Board"), (FlatBoard, "FlatBoard")):
+        board = board_cls(size, size, int(size * size * DENSITY), RNG(2))
+        history = History(board)
+        if board_cls is Board:
+            copy_restore = lambda: copy.deepcopy(board.state)
+        else:
+            copy_restore = lambda: Snapshot.loads(Snapshot.dumps(board), compact=True, lazy=True)
+
+        board.open(size // 2, size // 2)
+        measure(f"{label}: first open", board, history, copy_restore)
+
+        solver = Solver(board)
+        solver.apply_moves(solver.step_batch())
+        measure(f"{label}: solver wave", board, history, copy_restore)
+
+        x, y = next((x, y) for y in range(size) for x in range(size) if board.get_state(x, y) == 0)
+        board.flag(x, y)
+        measure(f"{label}: flag", board, history, copy_restore)
+
+
+if __name__ == '__main__':
+    main()
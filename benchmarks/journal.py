@@ -0,0 +1,105 @@
+# autosave and seek: full snapshot per move vs action journal
+#-------------------------------------------------------------
+# python -m benchmarks.journal [SIZE] [EVERY ...]
+
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Tuple
+
+from core.board import GameState
+from core.flat_board import FlatBoard
+from core.journal import Journal, JournalReader
+from core.rng import RNG
+from core.snapshot import Snapshot
+from core.solver import Solver
+
+DENSITY = 0.12
+SEEKS = 20
+NO_CHECKPOINTS = 10 ** 9
+
+
+def play(size: int, autosave) -> Tuple[float, int]:
+    """
+    Let the solver play a fresh board one cell at a time, like a player
+    following its moves (guessing when stuck). autosave(board) returns an
+    action listener, called after every board call; the time spent in it
+    is returned with the number of calls.
+    """
+    board = FlatBoard(size, size, int(size * size * DENSITY), RNG(1))
+    listener = autosave(board)
+    spent = [0.0, 0]
+
+    def timed(delta):
+        start = time.perf_counter()
+        listener(delta)
+        spent[0] += time.perf_counter() - start
+        spent[1] += 1
+
+    board.add_action_listener(timed)
+    solver = Solver(board)
+    board.open(size // 2, size // 2)
+    while board.game_state == GameState.PLAYING:
+        moves = solver.step_batch()
+        if not moves:
+            steps, _ = solver.auto_solve(True, limit=1)
+            if steps == 0:
+                break
+        for move in moves:
+            for x, y in sorted(move.cells):
+                if move.is_mine:
+                    board.flag(x, y)
+                else:
+                    board.open(x, y)
+    board.remove_action_listener(timed)
+    return spent[0], spent[1]
+
+
+def main(argv=None):
+    """
+    Time per-move autosave and random seeks for a few checkpoint intervals.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    size = int(argv[0]) if argv else 200
+    intervals = [int(a) for a in argv[1:]] or [100, 1000, NO_CHECKPOINTS]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "autosave")
+
+        spent, calls = play(size, lambda board: lambda delta: Snapshot.save_binary(board, path))
+        print(f"{size}x{size}, density {DENSITY}, {calls} board calls")
+        print(f"{'autosave':<24} {'per call':>10} {'file KiB':>10} {'actions':>8} {'seek avg':>10} {'seek max':>10}")
+        print(f"{'snapshot per call':<24} {spent / calls * 1000:>8.3f}ms"
+              f" {os.path.getsize(path) / 1024:>10.1f}")
+
+        for every in intervals:
+            journals = []
+
+            def autosave(board):
+                journal = Journal(board, path, every)
+                board.remove_action_listener(journal.record)
+                journals.append(journal)
+                return journal.record
+
+            spent, calls = play(size, autosave)
+            journals[0].close()
+
+            reader = JournalReader(path)
+            rng = random.Random(0)
+            seeks = []
+            for _ in range(SEEKS):
+                n = rng.randint(0, len(reader))
+                start = time.perf_counter()
+                reader.board_at(n, compact=True)
+                seeks.append(time.perf_counter() - start)
+
+            name = "journal, start+mines" if every == NO_CHECKPOINTS else f"journal, every {every}"
+            print(f"{name:<24} {spent / calls * 1000:>8.3f}ms"
+                  f" {os.path.getsize(path) / 1024:>10.1f} {len(reader):>8}"
+                  f" {sum(seeks) / len(seeks) * 1000:>8.1f}ms {max(seeks) * 1000:>8.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# first-click latency: eager count grid vs lazy counts
+#-----------------------------------------------------
+# python -m benchmarks.lazy_counts [SIZE ...]
+
+import gc
+import sys
+import time
+
+from core.flat_board import FlatBoard, LazyCounts
+from core.generator import HAS_NUMPY
+from core.rng import RNG
+
+DENSITY = 0.15
+EAGER_PURE_LIMIT = 3000
+
+
+def first_click(size: int, use_numpy: bool, lazy: bool):
+    """
+    Open the centre of a fresh board; time mine placement (with counts when
+    eager) and the flood fill separately.
+    """
+    board = FlatBoard(size, size, int(size * size * DENSITY), RNG(7), use_numpy=use_numpy,
+                      lazy_counts=lazy)
+    x, y = size // 2, size // 2
+
+    start = time.perf_counter()
+    board._place_mines(x, y)
+    board.first_click_done = True
+    placed = time.perf_counter()
+    _, revealed = board.open(x, y)
+    done = time.perf_counter()
+
+    counts = board.count_buf
+    computed = counts.computed() if isinstance(counts, LazyCounts) else size * size
+    return placed - start, done - placed, len(revealed), computed
+
+
+def main(argv=None):
+    """
+    Print first-click timings per board size and counts mode.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(a) for a in argv] or [1000, 3000, 10000]
+
+    print(f"density {DENSITY}")
+    print(f"{'board':<12} {'counts':<14} {'place':>9} {'fill':>9} {'total':>9} {'revealed':>9} {'computed':>12}")
+    for size in sizes:
+        modes = []
+        if size <= EAGER_PURE_LIMIT:
+            modes.append(("eager", False, False))
+        if HAS_NUMPY:
+            modes.append(("eager (numpy)", True, False))
+        modes.append(("lazy", False, True))
+        if HAS_NUMPY:
+            modes.append(("lazy (numpy)", True, True))
+
+        for name, use_numpy, lazy in modes:
+            gc.collect()
+            place, fill, revealed, computed = first_click(size, use_numpy, lazy)
+            print(f"{size}x{size:<7} {name:<14} {place:>8.2f}s {fill:>8.4f}s {place + fill:>8.2f}s"
+                  f" {revealed:>9} {computed:>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# neighbour lookup: per-call set construction vs cached NeighborTable
+#---------------------------------------------------------------------
+# python -m benchmarks.neighbors [SIZE]
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from core.neighbors import NeighborTable, neighbor_table
+
+
+def legacy_get_neighbors(x: int, y: int, width: int, height: int):
+    """
+    The original Generator.get_neighbors: a fresh set of tuples per call.
+    """
+    neighbors = set()
+    for dx in [-1, 0, 1]:
+        for dy in [-1, 0, 1]:
+            if dx == 0 and dy == 0:
+                continue
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height:
+                neighbors.add((nx, ny))
+    return neighbors
+
+
+def measure(name: str, lookup, size: int):
+    """
+    Call lookup for every cell, keeping the results alive so tracemalloc sees
+    what each call allocates; time a second pass without tracing.
+    """
+    cells = [(x, y) for y in range(size) for x in range(size)]
+    gc.collect()
+
+    tracemalloc.start()
+    results = [lookup(x, y) for x, y in cells]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_call = (current - sys.getsizeof(results)) / len(cells)
+    del results
+    gc.collect()
+
+    start = time.perf_counter()
+    for x, y in cells:
+        for _ in lookup(x, y):
+            pass
+    elapsed = time.perf_counter() - start
+
+    print(f"{name:<28} {per_call:>10.1f} {elapsed / len(cells) * 1e9:>10.0f}")
+
+
+def main(argv=None):
+    """
+    Compare allocation per call and lookup time.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    size = int(argv[0]) if argv else 200
+
+    neighbor_table.cache_clear()
+    table = neighbor_table(size, size)
+    NeighborTable.TABLE_LIMIT, limit = 0, NeighborTable.TABLE_LIMIT
+    untabled = NeighborTable(size, size)
+    NeighborTable.TABLE_LIMIT = limit
+
+    print(f"{size}x{size}")
+    print(f"{'lookup':<28} {'bytes/call':>10} {'ns/call':>10}")
+    measure("get_neighbors (set)", lambda x, y: legacy_get_neighbors(x, y, size, size), size)
+    measure("table.cells (tabled)", table.cells, size)
+    measure("table.neighbors (tabled)", lambda x, y: table.neighbors(y * size + x), size)
+    measure("table.cells (offsets)", untabled.cells, size)
+    measure("table.neighbors (offsets)", lambda x, y: untabled.neighbors(y * size + x), size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+# variable orders and forced-value propagation: search nodes by component size
+#------------------------------------------------------------------------------
+# python -m benchmarks.ordering [GAMES] [MIN_K] [MAX_K]
+
+import sys
+import time
+from collections import defaultdict
+
+from benchmarks.enumeration import harvest_components
+from core.enumeration import BitsetEnumerator, ORDERS
+
+BUCKET = 4
+
+
+def main(argv=None):
+    """
+    Mean search nodes and latency per size bucket for every variable order,
+    with and without propagation, on the same components.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    games = int(argv[0]) if argv else 10
+    min_k = int(argv[1]) if len(argv) > 1 else 13
+    max_k = int(argv[2]) if len(argv) > 2 else 28
+
+    components = [(constraints, unknown_indices)
+                  for constraints, unknown_indices in harvest_components(games, max_k)
+                  if len(unknown_indices) >= min_k]
+    print(f"{len(components)} components of {min_k}-{max_k} unknowns from {games} expert games")
+    print(f"{'order':<12} {'propagate':<9} {'k':>7} {'n':>5} {'nodes':>8} {'mean ms':>9} {'max ms':>9}")
+
+    for order in ORDERS:
+        for propagate in (False, True):
+            buckets = defaultdict(list)
+            for constraints, unknown_indices in components:
+                start = time.perf_counter()
+                enumerator = BitsetEnumerator(constraints, unknown_indices, order, propagate).run()
+                elapsed = time.perf_counter() - start
+                buckets[(len(unknown_indices) - 1) // BUCKET].append((enumerator.nodes, elapsed))
+
+            for bucket in sorted(buckets):
+                rows = buckets[bucket]
+                k_range = f"{bucket * BUCKET + 1}-{bucket * BUCKET + BUCKET}"
+                print(f"{order:<12} {str(propagate):<9} {k_range:>7} {len(rows):>5} "
+                      f"{sum(nodes for nodes, _ in rows) / len(rows):>8.0f} "
+                      f"{sum(t for _, t in rows) / len(rows) * 1e3:>9.2f} {max(t for _, t in rows) * 1e3:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
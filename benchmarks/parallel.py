@@ -0,0 +1,89 @@
+# compute_probabilities: inline vs process-pool component enumeration
+#---------------------------------------------------------------------
+# python -m benchmarks.parallel [GAMES] [WORKERS] [PARALLEL_MIN]
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from core.board import Board, CellState, GameState
+from core.enumeration import enumerate_local
+from core.rng import RNG
+from core.snapshot import Snapshot
+from core.solver import Solver
+
+SIZE = (50, 50, 560)
+MIN_LARGE = 2
+
+
+def stuck_positions(games: int, parallel_min: int):
+    """
+    Copies of seeded boards at every point where the solver is stuck and
+    at least MIN_LARGE components reach parallel_min unknowns. Play goes
+    on by opening a random safe cell, so games do not end on a bad guess.
+    """
+    positions = []
+    for seed in range(games):
+        width, height, mines = SIZE
+        rng = RNG(seed)
+        board = Board(width, height, mines, rng)
+        board.open(width // 2, height // 2)
+        solver = Solver(board)
+        while board.game_state == GameState.PLAYING:
+            moves = solver.step_batch()
+            if moves:
+                solver.apply_moves(moves)
+                continue
+            solver.frontier.refresh()
+            sizes = [len(unknowns) for _, unknowns in solver.frontier.get_components()]
+            if sum(parallel_min <= size <= solver.k_max for size in sizes) >= MIN_LARGE:
+                positions.append(Snapshot.loads(Snapshot.dumps(board)))
+            safe = [(x, y) for y in range(height) for x in range(width)
+                    if board.get_state(x, y) == CellState.UNKNOWN and not board.is_mine(x, y)]
+            if not safe:
+                break
+            board.open(*rng.choice(safe))
+    return positions
+
+
+def timed(positions, **options):
+    """
+    Total wall time of compute_probabilities over all positions, each
+    with an empty cache so every component is enumerated.
+    """
+    start = time.perf_counter()
+    for board in positions:
+        solver = Solver(board, **options)
+        solver.compute_probabilities()
+        solver.close()
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    """
+    Time the same positions inline and with a pool of WORKERS processes.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    games = int(argv[0]) if argv else 5
+    workers = int(argv[1]) if len(argv) > 1 else os.cpu_count() or 1
+    parallel_min = int(argv[2]) if len(argv) > 2 else 16
+
+    positions = stuck_positions(games, parallel_min)
+    print(f"{len(positions)} positions from {games} games of {SIZE[0]}x{SIZE[1]}/{SIZE[2]},"
+          f" {os.cpu_count()} CPUs")
+
+    with ProcessPoolExecutor(workers) as pool:
+        start = time.perf_counter()
+        for _ in range(100):
+            pool.submit(enumerate_local, 1, ((1, 1),)).result()
+        print(f"dispatch round trip      {(time.perf_counter() - start) * 10:>8.3f}ms")
+
+        inline = timed(positions)
+        pooled = timed(positions, executor=pool, parallel_min=parallel_min)
+    print(f"inline                   {inline * 1000:>8.1f}ms")
+    print(f"{workers} workers, min {parallel_min:<3}     {pooled * 1000:>8.1f}ms  ({inline / pooled:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
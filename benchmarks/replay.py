@@ -0,0 +1,91 @@
+# replay a component corpus through the rules and every enumeration engine
+#--------------------------------------------------------------------------
+# python -m minemind corpus CORPUS [PRESET] --games N
+# python -m benchmarks.replay CORPUS [K_MAX]
+
+import sys
+import time
+from collections import defaultdict
+
+from core.board import Board
+from core.rng import RNG
+from core.rules import Rules
+from core.solver import Solver
+from minemind.bench import percentile
+from minemind.corpus import Corpus
+
+# upper ends of the size buckets; larger components share the last bucket
+EDGES = (4, 8, 12, 16, 20, 24, 28, 64, 128)
+BACKTRACK_MAX = 16
+
+
+def bucket(k: int) -> str:
+    """
+    Size bucket label of a component with k unknowns.
+    """
+    low = 1
+    for high in EDGES:
+        if k <= high:
+            return f"{low}-{high}"
+        low = high + 1
+    return f"{low}+"
+
+
+def runners(k_max: int):
+    """
+    (name, largest k, run(entry)) for the rules and each engine. Every
+    enumeration gets a fresh Solver, so nothing comes from the cache.
+    """
+    board = Board(1, 1, 0, RNG(0))
+
+    def engine(**options):
+        def run(entry):
+            solver = Solver(board, **options)
+            solver._enumerate_component(entry.constraints, entry.unknown_indices, None)
+            solver.close()
+        return run
+
+    return [
+        ("rules", None, lambda entry: Rules.find_certain_moves(entry.constraints, entry.mask_to_cells)),
+        ("bitset", k_max, engine()),
+        ("bitset sorted", k_max, engine(order="sorted", propagate=False)),
+        ("backtrack", min(k_max, BACKTRACK_MAX), engine(engine="backtrack")),
+        ("dp", None, engine(engine="dp")),
+    ]
+
+
+def main(argv=None):
+    """
+    Latency distribution per size bucket for each runner over the corpus.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: python -m benchmarks.replay CORPUS [K_MAX]")
+        return
+    entries = Corpus.load(argv[0])
+    k_max = int(argv[1]) if len(argv) > 1 else 28
+    print(f"{len(entries)} components from {argv[0]}")
+    print(f"{'runner':<14} {'k':>8} {'n':>6} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>9}")
+
+    for name, largest, run in runners(k_max):
+        times = defaultdict(list)
+        for entry in entries:
+            k = len(entry.unknowns)
+            if largest is not None and k > largest:
+                continue
+            start = time.perf_counter()
+            run(entry)
+            times[k].append(time.perf_counter() - start)
+
+        buckets = defaultdict(list)
+        for k in sorted(times):
+            buckets[bucket(k)].extend(times[k])
+        for label, values in buckets.items():
+            values.sort()
+            print(f"{name:<14} {label:>8} {len(values):>6} {sum(values) / len(values) * 1e3:>9.3f} "
+                  f"{percentile(values, 0.5) * 1e3:>8.3f} {percentile(values, 0.95) * 1e3:>8.3f} "
+                  f"{values[-1] * 1e3:>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# rule passes: one all-pairs pass vs fixpoint propagation
+#---------------------------------------------------------
+# python -m benchmarks.rules [SIZE ...]
+
+import sys
+import time
+
+from core.rules import Rules
+from benchmarks.components import build_frontier
+
+
+def single_pass(components, mask_to_cells):
+    """
+    The original find_certain_moves: singles plus all-pairs subset, once.
+    """
+    moves = []
+    for constraints, _ in components:
+        moves.extend(Rules.apply_singles(constraints, mask_to_cells))
+        moves.extend(Rules.apply_subset_rule(constraints, mask_to_cells))
+    return moves
+
+
+def fixpoint(components, mask_to_cells):
+    """
+    Propagation to a fixpoint, per component.
+    """
+    moves = []
+    for constraints, _ in components:
+        moves.extend(Rules.find_certain_moves(constraints, mask_to_cells))
+    return moves
+
+
+def decided(moves):
+    """
+    Number of distinct cells decided by a list of moves.
+    """
+    cells = set()
+    for move in moves:
+        cells.update(move.cells)
+    return len(cells)
+
+
+def main(argv=None):
+    """
+    Time both rule engines on the components of large boards.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(a) for a in argv] or [100, 200, 300]
+
+    print(f"{'board':<10} {'constraints':>11} {'largest':>8} {'one pass':>10} {'cells':>7}"
+          f" {'fixpoint':>10} {'cells':>7}")
+    for size in sizes:
+        frontier = build_frontier(size)
+        components = frontier.get_components()
+        largest = max(len(constraints) for constraints, _ in components)
+
+        start = time.perf_counter()
+        old = single_pass(components, frontier.mask_to_cells)
+        old_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        new = fixpoint(components, frontier.mask_to_cells)
+        new_time = time.perf_counter() - start
+
+        print(f"{size}x{size:<6} {len(frontier.constraints):>11} {largest:>8} {old_time:>9.3f}s"
+              f" {decided(old):>7} {new_time:>9.3f}s {decided(new):>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# sampling estimator vs flat density for components above k_max
+#----------------------------------------------------------------
+# python -m benchmarks.sampling [GAMES] [K_MAX] [SECONDS ...]
+
+import sys
+import time
+
+from core.board import Board, CellState, GameState
+from core.rng import RNG
+from core.sampling import SamplingBudget
+from core.snapshot import Snapshot
+from core.solver import Solver
+
+EXACT_K = 28
+
+
+def positions(games: int, k_max: int):
+    """
+    Seeded expert positions where the solver is stuck, some component is
+    above k_max and every component fits EXACT_K, with exact probabilities
+    for reference. Play goes on by opening a random safe cell.
+    """
+    found = []
+    for seed in range(games):
+        rng = RNG(seed)
+        board = Board(30, 16, 99, rng)
+        board.open(15, 8)
+        solver = Solver(board, k_max=EXACT_K)
+        while board.game_state == GameState.PLAYING:
+            moves = solver.step_batch()
+            if moves:
+                solver.apply_moves(moves)
+                continue
+            sizes = [len(unknowns) for _, unknowns in solver.frontier.get_components()]
+            if sizes and k_max < max(sizes) <= EXACT_K:
+                found.append((Snapshot.loads(Snapshot.dumps(board)), solver.compute_probabilities()))
+            safe = [(x, y) for y in range(board.height) for x in range(board.width)
+                    if board.get_state(x, y) == CellState.UNKNOWN and not board.is_mine(x, y)]
+            if not safe:
+                break
+            board.open(*rng.choice(safe))
+    return found
+
+
+def main(argv=None):
+    """
+    Mean and max error on the cells of components above k_max, for the
+    flat density and each sampling budget, with interval coverage.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    games = int(argv[0]) if argv else 20
+    k_max = int(argv[1]) if len(argv) > 1 else 12
+    budgets = [float(a) for a in argv[2:]] or [0.01, 0.05, 0.2]
+
+    found = positions(games, k_max)
+    print(f"{len(found)} positions from {games} expert games, k_max {k_max}")
+    print(f"{'estimator':<16} {'cells':>6} {'mean err':>9} {'max err':>8} {'covered':>8} {'width':>6} {'per call':>9}")
+
+    for seconds in [None] + budgets:
+        errors = []
+        covered = 0
+        width = 0.0
+        elapsed = 0.0
+        for board, exact in found:
+            sampling = SamplingBudget(seconds=seconds, sweeps=10 ** 9) if seconds else None
+            solver = Solver(board, k_max=k_max, sampling=sampling)
+            start = time.perf_counter()
+            estimate = solver.compute_probabilities()
+            elapsed += time.perf_counter() - start
+            solver.frontier.refresh()
+            for _, unknowns in solver.frontier.get_components():
+                if len(unknowns) <= k_max:
+                    continue
+                for idx in unknowns:
+                    cell = solver.frontier.unknowns[idx]
+                    errors.append(abs(estimate[cell] - exact[cell]))
+                    if cell in solver.intervals:
+                        low, high = solver.intervals[cell]
+                        covered += low <= exact[cell] <= high
+                        width += high - low
+            solver.close()
+
+        name = f"sampling {seconds * 1000:.0f} ms" if seconds else "flat density"
+        coverage = f"{covered / len(errors):>7.0%}" if seconds else f"{'':>7}"
+        mean_width = f"{width / len(errors):>6.2f}" if seconds else f"{'':>6}"
+        print(f"{name:<16} {len(errors):>6} {sum(errors) / len(errors):>9.3f} {max(errors):>8.3f}"
+              f" {coverage} {mean_width} {elapsed / len(found) * 1000:>7.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
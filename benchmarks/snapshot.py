@@ -0,0 +1,111 @@
+# snapshot size and load time: JSON vs packed binary
+#----------------------------------------------------
+# python -m benchmarks.snapshot [SIZE ...]
+
+import gc
+import os
+import sys
+import tempfile
+import time
+
+from core.flat_board import FlatBoard
+from core.generator import HAS_NUMPY
+from core.rng import RNG
+from core.snapshot import Snapshot
+from benchmarks.components import DENSITY
+
+JSON_LIMIT = 1000
+EAGER_LIMIT = 3000
+
+
+def played(size: int) -> FlatBoard:
+    """
+    A board with mines placed and a realistic mix of revealed cells and flags.
+    """
+    rng = RNG(0)
+    board = FlatBoard(size, size, int(size * size * DENSITY), rng, use_numpy=HAS_NUMPY)
+    board.open(size // 2, size // 2)
+    for _ in range(size * size // 100):
+        x, y = rng.randint(0, size - 1), rng.randint(0, size - 1)
+        if board.is_mine(x, y):
+            board.flag(x, y)
+        else:
+            board.open(x, y)
+    return board
+
+
+def resident() -> int:
+    """
+    Resident set size in bytes (Linux), 0 when unavailable.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return 0
+
+
+def measure(name: str, save, load, board, path: str):
+    """
+    Save once, then time the best of three loads. "resident" is the growth
+    of the process RSS across the first load, i.e. the pages it touched.
+    """
+    start = time.perf_counter()
+    save(board, path)
+    saved = time.perf_counter() - start
+
+    best = grown = None
+    for _ in range(3):
+        gc.collect()
+        before = resident()
+        start = time.perf_counter()
+        loaded = load(path)
+        elapsed = time.perf_counter() - start
+        if grown is None:
+            grown = resident() - before
+        best = elapsed if best is None else min(best, elapsed)
+        del loaded
+
+    size = os.path.getsize(path)
+    print(f"{'':<12} {name:<22} {size / 2 ** 20:>10.2f} {saved:>9.3f}s {best:>9.3f}s"
+          f" {max(grown, 0) / 2 ** 20:>10.1f}")
+
+
+def main(argv=None):
+    """
+    Compare formats and loaders on played boards.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(a) for a in argv] or [100, 300, 1000]
+
+    print(f"{'board':<12} {'format':<22} {'size MiB':>10} {'save':>10} {'load':>10} {'resident':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            board = played(size)
+            print(f"{size}x{size}")
+            path = os.path.join(tmp, "snap")
+            if size <= JSON_LIMIT:
+                measure("json", Snapshot.save, Snapshot.load, board, path)
+                measure("json -> FlatBoard", Snapshot.save,
+                        lambda p: Snapshot.load(p, compact=True), board, path)
+                measure("binary -> Board", lambda b, p: Snapshot.save_binary(b, p, compress=False),
+                        Snapshot.load, board, path)
+            if size <= EAGER_LIMIT:
+                measure("binary", lambda b, p: Snapshot.save_binary(b, p, compress=False),
+                        lambda p: Snapshot.load(p, compact=True), board, path)
+                measure("binary+zlib", Snapshot.save_binary,
+                        lambda p: Snapshot.load(p, compact=True), board, path)
+            if HAS_NUMPY:
+                measure("binary+zlib, numpy", Snapshot.save_binary,
+                        lambda p: Snapshot.load(p, compact=True, use_numpy=True), board, path)
+            measure("binary+zlib, lazy", Snapshot.save_binary,
+                    lambda p: Snapshot.load(p, lazy=True), board, path)
+            measure("raw, lazy", lambda b, p: Snapshot.save_binary(b, p, raw=True),
+                    lambda p: Snapshot.load(p, lazy=True), board, path)
+            measure("raw, mapped", lambda b, p: Snapshot.save_binary(b, p, raw=True),
+                    Snapshot.open_mapped, board, path)
+            del board
+
+
+if __name__ == '__main__':
+    main()
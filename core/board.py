@@ -1,8 +1,10 @@
 # grid state, open/flag/chord, flood fill
 
-from typing import Set, Tuple, Optional
-from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, List, Set, Tuple, Optional
 from .generator import Generator
+from .neighbors import neighbor_table
+from .region import Region, index_array
 from .rng import RNG
 
 
@@ -22,6 +24,46 @@ class GameState:
     WON = 1
     LOST = 2
 
+class Action:
+    """
+    Player actions reported to action listeners.
+    """
+    OPEN = 1
+    FLAG = 2
+    CHORD = 3
+
+class Delta:
+    """
+    Reversible record of one board call.
+
+    indices are the flat indices (y * width + x) of the changed cells,
+    before/after their states as bytes, and counters the
+    (revealed_count, flag_count, game_state) before and after. actions
+    lists the (Action, x, y) that produced it; it is empty for a delta
+    that only restores state (an undo), which cannot be replayed as
+    actions. Mines are never part of a delta: once placed they stay.
+    """
+    __slots__ = ('actions', 'indices', 'before', 'after', 'counters_before', 'counters_after')
+
+    def __init__(self, actions: List[Tuple[int, int, int]], indices, before: bytes, after: bytes,
+                 counters_before: Tuple[int, int, int], counters_after: Tuple[int, int, int]):
+        self.actions = actions
+        self.indices = indices
+        self.before = before
+        self.after = after
+        self.counters_before = counters_before
+        self.counters_after = counters_after
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def inverse(self) -> 'Delta':
+        """
+        The delta that undoes this one.
+        """
+        return Delta([], self.indices, self.after, self.before,
+                     self.counters_after, self.counters_before)
+
 class Board:
     """
     Minesweeper board with game mechanics.
@@ -33,16 +75,19 @@ class Board:
      Counts accurately reflect adjacent mines
     """
 
-    def __init__(self, width: int, height: int, num_mines: int, rng: RNG):
+    def __init__(self, width: int, height: int, num_mines: int, rng: RNG, use_numpy: bool = False):
         """
         Initialize board with dimensions and mine count.
+        use_numpy enables the vectorized mine count path when NumPy is installed.
         """
         self.width = width
         self.height = height
         self.num_mines = num_mines
         self.rng = rng
+        self.use_numpy = use_numpy
+        self.neighbors = neighbor_table(width, height)
 
-        self.state = [[CellState.UNKNOWN for _ in range(width)] for _ in range(height)]
+        self.state = self._empty_state()
         self.mines: Optional[Set[Tuple[int, int]]] = None   
         self.counts: Optional[dict] = None
 
@@ -51,13 +96,131 @@ class Board:
         self.revealed_count = 0
         self.flag_count = 0
 
+        self._listeners: List[Callable[[Iterable[Tuple[int, int]]], None]] = []
+        self._action_listeners: List[Callable[[Delta], None]] = []
+
+    def _empty_state(self) -> list:
+        """
+        All-UNKNOWN state grid, indexed state[y][x].
+        """
+        return [[CellState.UNKNOWN for _ in range(self.width)] for _ in range(self.height)]
+
+    def add_listener(self, callback: Callable[[Iterable[Tuple[int, int]]], None]) -> None:
+        """
+        Register callback(cells), called with the cells changed by open/flag/chord.
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Iterable[Tuple[int, int]]], None]) -> None:
+        """
+        Unregister a callback added with add_listener.
+        """
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, cells: Iterable[Tuple[int, int]]) -> None:
+        """
+        Tell listeners which cells changed state.
+        """
+        for callback in self._listeners:
+            callback(cells)
+
+    def add_action_listener(self, callback: Callable[[Delta], None]) -> None:
+        """
+        Register callback(delta), called with the Delta of each
+        open/flag/chord/apply_batch/apply_delta call that changed the board,
+        once the call has finished. apply_batch reports its flags and opens
+        as FLAG and OPEN actions that replay, in order, to the same state.
+        Deltas are only built while some action listener is registered.
+        """
+        self._action_listeners.append(callback)
+
+    def remove_action_listener(self, callback: Callable[[Delta], None]) -> None:
+        """
+        Unregister an action listener.
+        """
+        if callback in self._action_listeners:
+            self._action_listeners.remove(callback)
+
+    @contextmanager
+    def muted_actions(self) -> Iterator[None]:
+        """
+        Hide the registered action listeners (history, journal) for the
+        duration, for calls that will be rolled back before it ends.
+        Listeners added inside are dropped; cell listeners stay, so the
+        incremental frontier still follows every change.
+        """
+        saved = self._action_listeners
+        self._action_listeners = []
+        try:
+            yield
+        finally:
+            self._action_listeners = saved
+
+    def _counters(self) -> Tuple[int, int, int]:
+        """
+        The counters a Delta restores.
+        """
+        return self.revealed_count, self.flag_count, self.game_state
+
+    def _record(self, actions: List[Tuple[int, int, int]], changes, counters: Tuple[int, int, int]) -> None:
+        """
+        Build the Delta of a finished call and pass it to the action
+        listeners. changes lists (cells, previous state) groups; cells is a
+        Region or an iterable of (x, y).
+        """
+        if not self._action_listeners:
+            return
+        width = self.width
+        indices = index_array(width * self.height)
+        before = bytearray()
+        for cells, previous in changes:
+            start = len(indices)
+            if isinstance(cells, Region):
+                indices.extend(cells.indices)
+            else:
+                indices.extend(y * width + x for x, y in cells)
+            before += bytes([previous]) * (len(indices) - start)
+        after = bytes(self.get_state(idx % width, idx // width) for idx in indices)
+
+        delta = Delta(actions, indices, bytes(before), after, counters, self._counters())
+        for callback in self._action_listeners:
+            callback(delta)
+
+    def apply_delta(self, delta: Delta) -> None:
+        """
+        Write a delta's after-states and counters, in time proportional
+        to the delta, then notify both kinds of listeners. Apply
+        delta.inverse() to undo a call and the delta itself to redo it.
+        """
+        width = self.width
+        state = self.state
+        for idx, value in zip(delta.indices, delta.after):
+            state[idx // width][idx % width] = value
+        self.revealed_count, self.flag_count, self.game_state = delta.counters_after
+
+        if len(delta):
+            self._notify(Region(delta.indices, width))
+        for callback in self._action_listeners:
+            callback(delta)
+
     def open(self, x: int, y: int) -> Tuple[bool, Set[Tuple[int, int]]]:
         """ 
         Open cell at (x, y).
 
         Returns:
          (success, revealed_cells) where success is False if mine hit, and
-         revealed_cells is set of newly revealed positions
+         revealed_cells is the set (a Region) of newly revealed positions
+        """
+        counters = self._counters()
+        success, revealed = self._open(x, y)
+        if revealed:
+            self._record([(Action.OPEN, x, y)], [(revealed, CellState.UNKNOWN)], counters)
+        return success, revealed
+
+    def _open(self, x: int, y: int) -> Tuple[bool, Set[Tuple[int, int]]]:
+        """
+        open() without reporting the action (used by chord).
         """
         if not self._in_bounds(x, y):
             return False, set()
@@ -69,9 +232,10 @@ class Board:
             self._place_mines(x, y)
             self.first_click_done = True
 
-        if self.mines is not None and (x, y) in self.mines:
+        if self.is_mine(x, y):
             self.state[y][x] = CellState.REVEALED
             self.game_state = GameState.LOST
+            self._notify({(x, y)})
             return False, {(x, y)}
 
         revealed = self._flood_fill(x, y)
@@ -80,6 +244,7 @@ class Board:
         if self.revealed_count == self.width * self.height - self.num_mines:
             self.game_state = GameState.WON
 
+        self._notify(revealed)
         return True, revealed
 
     def flag(self, x: int, y: int) -> bool:
@@ -92,14 +257,19 @@ class Board:
         if self.state[y][x] == CellState.REVEALED:
             return False
 
+        counters = self._counters()
         if self.state[y][x] == CellState.UNKNOWN:
             self.state[y][x] = CellState.FLAGGED
             self.flag_count += 1
+            self._notify({(x, y)})
+            self._record([(Action.FLAG, x, y)], [([(x, y)], CellState.UNKNOWN)], counters)
             return True
         
         elif self.state[y][x] == CellState.FLAGGED:
             self.state[y][x] = CellState.UNKNOWN
             self.flag_count -= 1
+            self._notify({(x, y)})
+            self._record([(Action.FLAG, x, y)], [([(x, y)], CellState.FLAGGED)], counters)
             return True
         
         return False
@@ -118,57 +288,137 @@ class Board:
         
         if self.state[y][x] != CellState.REVEALED:
             return True, set()
-        if self.counts is None or self.counts[(x, y)] == 0:
+        count = self.get_count(x, y)
+        if count is None or count == 0:
             return True, set()
 
-        neighbors = Generator.get_neighbors(x, y, self.width, self.height)
+        neighbors = self.neighbors.cells(x, y)
         flagged = sum(1 for nx, ny in neighbors if self.state[ny][nx] == CellState.FLAGGED)
 
-        if self.counts is None or flagged != self.counts[(x, y)]:
+        if flagged != count:
             return True, set()
 
+        counters = self._counters()
         all_revealed = set()
+        success = True
         for nx, ny in neighbors:
             if self.state[ny][nx] == CellState.UNKNOWN:
-                success, revealed = self.open(nx, ny)
+                success, revealed = self._open(nx, ny)
                 all_revealed.update(revealed)
                 if not success:
-                    return False, all_revealed
+                    break
 
-        return True, all_revealed
+        if all_revealed:
+            self._record([(Action.CHORD, x, y)], [(all_revealed, CellState.UNKNOWN)], counters)
+        return success, all_revealed
     
+    def apply_batch(self, opens: Iterable[Tuple[int, int]],
+                    flags: Iterable[Tuple[int, int]] = ()) -> Tuple[bool, Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        """
+        Flag and open many cells with one shared flood fill.
+
+        Flags are placed on unknown cells (never removed). Opens of cells
+        that are not unknown are skipped; the first opened cell places the
+        mines on a fresh board. Opens are taken in order up to the first
+        mine, which is revealed and loses the game, as if opened one by one.
+        Listeners are notified once with the merged delta.
+
+        Returns:
+         (success, revealed_cells, flagged_cells) where success is False if
+         a mine was hit
+        """
+        counters = self._counters()
+        flagged = set()
+        for x, y in flags:
+            if self._in_bounds(x, y) and self.state[y][x] == CellState.UNKNOWN:
+                self.state[y][x] = CellState.FLAGGED
+                self.flag_count += 1
+                flagged.add((x, y))
+
+        starts = []
+        hit = None
+        for x, y in opens:
+            if not self._in_bounds(x, y) or self.state[y][x] != CellState.UNKNOWN:
+                continue
+            if not self.first_click_done:
+                self._place_mines(x, y)
+                self.first_click_done = True
+            if self.is_mine(x, y):
+                hit = (x, y)
+                break
+            starts.append((x, y))
+
+        revealed = self._flood_fill_from(starts)
+        self.revealed_count += len(revealed)
+
+        if hit is not None:
+            hx, hy = hit
+            self.state[hy][hx] = CellState.REVEALED
+            self.game_state = GameState.LOST
+            revealed.add(hit)
+        elif self.revealed_count == self.width * self.height - self.num_mines:
+            self.game_state = GameState.WON
+
+        if revealed or flagged:
+            self._notify(revealed | flagged)
+        if self._action_listeners and (revealed or flagged):
+            actions = [(Action.FLAG, x, y) for x, y in flagged]
+            actions.extend((Action.OPEN, x, y) for x, y in starts)
+            if hit is not None:
+                actions.append((Action.OPEN, hit[0], hit[1]))
+            self._record(actions, [(flagged, CellState.UNKNOWN), (revealed, CellState.UNKNOWN)], counters)
+        return hit is None, revealed, flagged
+
     def _place_mines(self, first_x: int, first_y: int):
         """
         Place mines avoiding first click and neighbors.
         """
-        generator = Generator(self.width, self.height, self.num_mines, self.rng)
+        generator = Generator(self.width, self.height, self.num_mines, self.rng, self.use_numpy)
         self.mines = generator.place_mines(first_x, first_y)
-        self.counts = Generator.compute_counts(self.mines, self.width, self.height)
+        self.counts = Generator.compute_counts(self.mines, self.width, self.height, self.use_numpy)
 
-    def _flood_fill(self, x: int, y: int) -> Set[Tuple[int, int]]:
+    def _flood_fill(self, x: int, y: int) -> Region:
         """
         Flood fill from (x, y) revealing zeros and their perimeter.
         Uses BFS
         Return: set of revealed cell positions
         """
+        return self._flood_fill_from([(x, y)])
 
-        revealed  = set()
-        queue = deque([(x, y)])
-        visited = {(x, y)}
-
-        while queue:
-            cx, cy = queue.popleft()
-            self.state[cy][cx] = CellState.REVEALED
-            revealed.add((cx, cy))
-
-            if self.counts is not None and self.counts[(cx, cy)] == 0:
-                neighbors = Generator.get_neighbors(cx, cy, self.width, self.height)
-                for nx, ny in neighbors:
-                    if (nx, ny) not in visited and self.state[ny][nx] == CellState.UNKNOWN:
-                        visited.add((nx, ny))
-                        queue.append((nx, ny))
+    def _flood_fill_from(self, starts: List[Tuple[int, int]]) -> Region:
+        """
+        One BFS over flat indices seeded with every start cell.
 
-        return revealed
+        Cells are marked REVEALED in board.state when queued, so the state
+        grid is the visited set, and the output array doubles as the queue
+        (a read cursor walks it), so no per-cell containers are built.
+        Return: Region of the revealed cells, in reveal order
+        """
+        width = self.width
+        state = self.state
+        get_count = self.get_count
+        neighbors = self.neighbors.neighbors
+        region = index_array(width * self.height)
+
+        for x, y in starts:
+            if state[y][x] == CellState.UNKNOWN:
+                state[y][x] = CellState.REVEALED
+                region.append(y * width + x)
+
+        head = 0
+        while head < len(region):
+            idx = region[head]
+            head += 1
+            cy, cx = divmod(idx, width)
+            if get_count(cx, cy) == 0:
+                for n in neighbors(idx):
+                    ny, nx = divmod(n, width)
+                    row = state[ny]
+                    if row[nx] == CellState.UNKNOWN:
+                        row[nx] = CellState.REVEALED
+                        region.append(n)
+
+        return Region(region, width)
 
     def _in_bounds(self, x: int, y: int) -> bool:
         """
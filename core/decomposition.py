@@ -0,0 +1,188 @@
+# exact counts by dynamic programming over a path decomposition
+
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from .enumeration import CHECK_EVERY, ComponentCounts, EnumerationTimeout, variable_order
+from .frontier import Constraint
+
+Poly = Dict[int, int]
+
+
+def _add_into(target: Poly, poly: Poly, shift: int = 0) -> None:
+    """
+    target += poly * x^shift (polynomials in the number of mines).
+    """
+    for m, n in poly.items():
+        target[m + shift] = target.get(m + shift, 0) + n
+
+
+def _multiply(a: Poly, b: Poly) -> Poly:
+    """
+    Product of two mine-count polynomials.
+    """
+    result: Poly = {}
+    for ma, na in a.items():
+        for mb, nb in b.items():
+            result[ma + mb] = result.get(ma + mb, 0) + na * nb
+    return result
+
+
+class PathEnumerator:
+    """
+    Exact solution counts by dynamic programming along a variable order.
+
+    Unknowns are ordered breadth-first from a pseudo-peripheral unknown
+    (Cuthill-McKee, variable_order "bfs"), which for the long thin
+    components of a frontier follows the revealed boundary. A constraint is open from its first to
+    its last unknown in that order. After assigning the first t unknowns
+    the only thing the rest of the search needs is how many mines each
+    open constraint already holds, so that tuple is the DP state:
+
+        forward[t][state]  = {m: partial assignments of unknowns < t}
+        backward[t][state] = {m: completions of unknowns >= t}
+
+    Solutions split by mines are backward[0][()], and the solutions with
+    unknown t a mine are sum over states of forward[t] * x * backward[t+1].
+    Cost is the number of layers times the states per layer (bounded by
+    the product of remaining+1 over the open constraints), instead of 2^k.
+
+    Invariants:
+     A transition keeps every constraint satisfiable: placed <= remaining
+     and placed + unknowns still to come >= remaining; a constraint is
+     checked for equality and dropped from the state at its last unknown
+    """
+
+    def __init__(self, constraints: List[Constraint], unknown_indices: Set[int]):
+        """
+        Order unknowns and precompute, for each layer, how states map
+        across it.
+        """
+        members: List[List[int]] = []
+        by_index: Dict[int, List[int]] = {}
+        for ci, c in enumerate(constraints):
+            scope = []
+            mask = c.scope_mask
+            while mask:
+                low = mask & -mask
+                idx = low.bit_length() - 1
+                scope.append(idx)
+                by_index.setdefault(idx, []).append(ci)
+                mask ^= low
+            members.append(scope)
+
+        self.variables = variable_order(constraints, unknown_indices, "bfs")
+        position = {idx: pos for pos, idx in enumerate(self.variables)}
+        self.remaining = [c.remaining for c in constraints]
+        first = [min(position[idx] for idx in scope) for scope in members]
+        last = [max(position[idx] for idx in scope) for scope in members]
+
+        k = len(self.variables)
+        self.layouts: List[Tuple[int, ...]] = []
+        self.steps: List[Tuple] = []
+        layout: Tuple[int, ...] = ()
+        for t, idx in enumerate(self.variables):
+            touched = by_index.get(idx, [])
+            slot = {ci: s for s, ci in enumerate(layout)}
+            after = tuple(sorted([ci for ci in layout if last[ci] > t] +
+                                 [ci for ci in touched if first[ci] == t and last[ci] > t]))
+            checks = []
+            for ci in touched:
+                rest = sum(1 for j in members[ci] if position[j] > t)
+                checks.append((slot.get(ci, -1), self.remaining[ci], rest))
+            sources = tuple(slot.get(ci, -1) for ci in after)
+            adds = tuple(ci in touched for ci in after)
+            self.layouts.append(layout)
+            self.steps.append((tuple(checks), sources, adds))
+            layout = after
+        self.width = max((len(layout) for layout in self.layouts), default=0)
+
+        self.solutions: Dict[int, int] = {}
+        self.mine_counts: Dict[int, List[int]] = {}
+        self.nodes = 0
+        self.pruned = 0
+        self._k = k
+
+    def _step(self, t: int, state: Tuple[int, ...], value: int) -> Optional[Tuple[int, ...]]:
+        """
+        State after giving unknown t the value 0 or 1, or None if some
+        constraint can no longer be met.
+        """
+        checks, sources, adds = self.steps[t]
+        for source, remaining, rest in checks:
+            placed = (state[source] if source >= 0 else 0) + value
+            if placed > remaining or placed + rest < remaining:
+                return None
+        return tuple((state[source] if source >= 0 else 0) + (value if add else 0)
+                     for source, add in zip(sources, adds))
+
+    def run(self, deadline: Optional[float] = None) -> "PathEnumerator":
+        """
+        Forward and backward passes; fills solutions and mine_counts.
+
+        With a deadline the clock is read every CHECK_EVERY states and
+        EnumerationTimeout is raised once it passes.
+        """
+        k = self._k
+        forward: List[Dict[Tuple[int, ...], Poly]] = [{(): {0: 1}}]
+        for t in range(k):
+            layer: Dict[Tuple[int, ...], Poly] = {}
+            for state, poly in forward[t].items():
+                self._tick(deadline)
+                for value in (0, 1):
+                    nxt = self._step(t, state, value)
+                    if nxt is None:
+                        self.pruned += 1
+                        continue
+                    _add_into(layer.setdefault(nxt, {}), poly, value)
+            forward.append(layer)
+
+        backward: Dict[Tuple[int, ...], Poly] = {(): {0: 1}} if () in forward[k] else {}
+        per_cell: List[Poly] = [{} for _ in range(k)]
+        for t in range(k - 1, -1, -1):
+            layer = {}
+            for state, poly in forward[t].items():
+                self._tick(deadline)
+                total: Poly = {}
+                for value in (0, 1):
+                    nxt = self._step(t, state, value)
+                    tail = backward.get(nxt) if nxt is not None else None
+                    if tail is None:
+                        continue
+                    _add_into(total, tail, value)
+                    if value:
+                        _add_into(per_cell[t], _multiply(poly, tail), 1)
+                if total:
+                    layer[state] = total
+            backward = layer
+
+        self.solutions = {m: n for m, n in sorted(backward.get((), {}).items()) if n}
+        self.mine_counts = {m: [per_cell[t].get(m, 0) for t in range(k)] for m in self.solutions}
+        return self
+
+    def _tick(self, deadline: Optional[float]) -> None:
+        """
+        Count one DP state and honour the deadline.
+        """
+        self.nodes += 1
+        if deadline is not None and not self.nodes & (CHECK_EVERY - 1) \
+                and time.perf_counter() > deadline:
+            raise EnumerationTimeout()
+
+    @property
+    def total(self) -> int:
+        """
+        Total number of solutions found by run().
+        """
+        return sum(self.solutions.values())
+
+    def result(self) -> ComponentCounts:
+        """
+        Counts found by run().
+        """
+        return ComponentCounts(self.variables, self.solutions, self.mine_counts)
+
+    def probabilities(self) -> Dict[int, float]:
+        """
+        Mine probability per frontier index (0.5 when no solution exists).
+        """
+        return self.result().probabilities()
@@ -0,0 +1,351 @@
+# bitset enumeration engine for frontier components
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+from .frontier import Constraint
+
+# nodes between deadline checks (a power of two, used as a mask); a node
+# with propagation on a large component costs a few microseconds, so this
+# keeps the overrun near a millisecond, and perf_counter() is cheap beside it
+CHECK_EVERY = 256
+
+# variable orders accepted by variable_order / BitsetEnumerator
+ORDERS = ("sorted", "bfs", "constrained")
+
+
+class EnumerationTimeout(Exception):
+    """
+    Raised inside a search when its deadline passes.
+    """
+
+
+@dataclass
+class ComponentCounts:
+    """
+    Solution counts of one component, split by number of mines.
+
+    variables: frontier indices of the component unknowns, in mine_counts position order
+    solutions: mines in component -> number of solutions
+    mine_counts: mines in component -> per-variable solutions with that variable a mine
+    """
+    variables: List[int]
+    solutions: Dict[int, int]
+    mine_counts: Dict[int, List[int]]
+
+    @property
+    def total(self) -> int:
+        """
+        Total number of solutions.
+        """
+        return sum(self.solutions.values())
+
+    def probabilities(self) -> Dict[int, float]:
+        """
+        Mine probability per frontier index, solutions counted uniformly
+        (0.5 when no solution exists).
+        """
+        total = self.total
+        if total == 0:
+            return {idx: 0.5 for idx in self.variables}
+        return {idx: sum(counts[pos] for counts in self.mine_counts.values()) / total
+                for pos, idx in enumerate(self.variables)}
+
+
+class BitsetEnumerator:
+    """
+    Exact enumeration of a component with the partial assignment kept as bitmasks.
+
+    Component unknowns are relabelled 0..k-1 in variable_order(order) and
+    assigned in that order. Each constraint keeps a local scope mask; after
+    assigning variable v only the constraints watching v are re-checked:
+        placed = popcount(scope & mine_mask)
+        free   = popcount(scope & ~assigned_mask)
+        prune if placed > remaining or placed + free < remaining
+
+    With propagate, a constraint left with placed == remaining forces its
+    free variables safe, and one with placed + free == remaining forces
+    them mines, without branching; forced variables are checked in turn.
+    The search then branches on the lowest unassigned variable.
+
+    Pending nodes are kept on an explicit stack rather than the call stack,
+    so components deeper than the recursion limit (budget mode enumerates
+    whatever size fits the deadline) search the same way.
+
+    Invariants:
+     Every constraint is checked after its last variable is assigned, so each
+     leaf satisfies all constraints exactly
+     mine_counts[m][v] = number of solutions with m mines and variable v a mine
+    """
+
+    def __init__(self, constraints: List[Constraint], unknown_indices: Set[int],
+                 order: str = "sorted", propagate: bool = False):
+        """
+        Relabel component unknowns and build local scopes and watch lists.
+        """
+        self.variables = variable_order(constraints, unknown_indices, order)
+        self.propagate = propagate
+        position = {idx: pos for pos, idx in enumerate(self.variables)}
+
+        self.scopes: List[int] = []
+        self.remaining: List[int] = []
+        self.watch: List[List[int]] = [[] for _ in self.variables]
+
+        for c in constraints:
+            local = 0
+            mask = c.scope_mask
+            while mask:
+                low = mask & -mask
+                pos = position[low.bit_length() - 1]
+                local |= 1 << pos
+                self.watch[pos].append(len(self.scopes))
+                mask ^= low
+            self.scopes.append(local)
+            self.remaining.append(c.remaining)
+
+        self.solutions: Dict[int, int] = {}
+        self.mine_counts: Dict[int, List[int]] = {}
+        self.nodes = 0
+
+    @property
+    def total(self) -> int:
+        """
+        Total number of solutions found by run().
+        """
+        return sum(self.solutions.values())
+
+    @property
+    def pruned(self) -> int:
+        """
+        Branches cut by a constraint check during run().
+
+        Every visited node except the root passed its check and every
+        non-leaf node tries two branches, so the count follows from nodes
+        and leaves without touching the search loop.
+        """
+        if self.nodes == 0:
+            return 0
+        return 2 * (self.nodes - self.total) - (self.nodes - 1)
+
+    def run(self, deadline: Optional[float] = None) -> "BitsetEnumerator":
+        """
+        Enumerate all satisfying assignments.
+
+        With a deadline (time.perf_counter() value), the clock is read every
+        CHECK_EVERY nodes and EnumerationTimeout is raised once it passes;
+        the partial counts are then meaningless.
+        """
+        if self.propagate:
+            return self._run_propagating(deadline)
+        k = len(self.variables)
+        scopes = self.scopes
+        remaining = self.remaining
+        watch = self.watch
+        solutions = self.solutions
+        mine_counts = self.mine_counts
+
+        stack = [(0, 0, 0)]
+        while stack:
+            var, assigned, mines = stack.pop()
+            self.nodes += 1
+            if deadline is not None and not self.nodes & (CHECK_EVERY - 1) \
+                    and time.perf_counter() > deadline:
+                raise EnumerationTimeout()
+            if var == k:
+                m = mines.bit_count()
+                counts = mine_counts.get(m)
+                if counts is None:
+                    counts = mine_counts[m] = [0] * k
+                    solutions[m] = 0
+                solutions[m] += 1
+                while mines:
+                    low = mines & -mines
+                    counts[low.bit_length() - 1] += 1
+                    mines ^= low
+                continue
+
+            bit = 1 << var
+            assigned |= bit
+            # the mine branch is pushed first so the safe one is searched first
+            for mine_mask in (mines | bit, mines):
+                for ci in watch[var]:
+                    scope = scopes[ci]
+                    placed = (scope & mine_mask).bit_count()
+                    if placed > remaining[ci] or \
+                       placed + (scope & ~assigned).bit_count() < remaining[ci]:
+                        break
+                else:
+                    stack.append((var + 1, assigned, mine_mask))
+        return self
+
+    def _run_propagating(self, deadline: Optional[float]) -> "BitsetEnumerator":
+        """
+        run() with forced-value propagation after every assignment.
+
+        Every leaf still has all constraints checked (each variable's
+        watchers are checked when it is assigned, forced or not), so the
+        pruned formula holds.
+        """
+        k = len(self.variables)
+        full = (1 << k) - 1
+        scopes = self.scopes
+        remaining = self.remaining
+        watch = self.watch
+
+        def propagate(stack: List[int], assigned: int, mines: int) -> Optional[Tuple[int, int]]:
+            while stack:
+                for ci in watch[stack.pop()]:
+                    scope = scopes[ci]
+                    free = scope & ~assigned
+                    slack = remaining[ci] - (scope & mines).bit_count()
+                    if slack < 0 or free.bit_count() < slack:
+                        return None
+                    if free and (slack == 0 or free.bit_count() == slack):
+                        assigned |= free
+                        if slack:
+                            mines |= free
+                        while free:
+                            low = free & -free
+                            stack.append(low.bit_length() - 1)
+                            free ^= low
+            return assigned, mines
+
+        state = propagate(list(range(k)), 0, 0)
+        stack = [state] if state is not None else []
+        while stack:
+            assigned, mines = stack.pop()
+            self.nodes += 1
+            if deadline is not None and not self.nodes & (CHECK_EVERY - 1) \
+                    and time.perf_counter() > deadline:
+                raise EnumerationTimeout()
+            if assigned == full:
+                self._tally(mines)
+                continue
+
+            var = (~assigned & (assigned + 1)).bit_length() - 1
+            bit = 1 << var
+            for mine_mask in (mines | bit, mines):
+                state = propagate([var], assigned | bit, mine_mask)
+                if state is not None:
+                    stack.append(state)
+        return self
+
+    def _tally(self, mines: int) -> None:
+        """
+        Add one solution.
+        """
+        m = mines.bit_count()
+        counts = self.mine_counts.get(m)
+        if counts is None:
+            counts = self.mine_counts[m] = [0] * len(self.variables)
+            self.solutions[m] = 0
+        self.solutions[m] += 1
+        while mines:
+            low = mines & -mines
+            counts[low.bit_length() - 1] += 1
+            mines ^= low
+
+    def result(self) -> ComponentCounts:
+        """
+        Counts found by run().
+        """
+        return ComponentCounts(self.variables, self.solutions, self.mine_counts)
+
+    def probabilities(self) -> Dict[int, float]:
+        """
+        Mine probability per frontier index (0.5 when no solution exists).
+        """
+        return self.result().probabilities()
+
+
+def enumerate_local(size: int, pairs: Tuple[Tuple[int, int], ...], order: str = "sorted",
+                    propagate: bool = False) -> Tuple[Dict[int, int], Dict[int, List[int]], int, int]:
+    """
+    Enumerate a component given in local labels, for a worker process.
+
+    pairs are (scope mask over labels 0..size-1, remaining), as in the
+    canonical signature, so the payload is a few small ints per constraint
+    and the counts come back in label order, ready for the cache.
+
+    Returns:
+     (solutions, mine_counts, nodes, pruned)
+    """
+    constraints = [Constraint(None, scope, remaining) for scope, remaining in pairs]
+    enumerator = BitsetEnumerator(constraints, set(range(size)), order, propagate).run()
+    mine_counts = enumerator.mine_counts
+    if order != "sorted":
+        position = {label: pos for pos, label in enumerate(enumerator.variables)}
+        mine_counts = {m: [per_cell[position[label]] for label in range(size)]
+                       for m, per_cell in mine_counts.items()}
+    return enumerator.solutions, mine_counts, enumerator.nodes, enumerator.pruned
+
+
+def variable_order(constraints: List[Constraint], unknown_indices: Set[int],
+                   order: str = "sorted") -> List[int]:
+    """
+    Frontier indices of a component in the order a search assigns them.
+
+    sorted: frontier index order, row-major along the frontier
+    bfs: breadth-first along shared constraints from a pseudo-peripheral
+         unknown (the far end of a first breadth-first search), so each
+         variable shares a constraint with a recent one
+    constrained: most-constrained first; the next variable is the one that
+         leaves a constraint with the fewest unassigned cells, ties going
+         to the variable in more constraints, so constraints close early
+    """
+    if order not in ORDERS:
+        raise ValueError(f"Unknown variable order: {order}")
+    variables = sorted(unknown_indices)
+    if order == "sorted":
+        return variables
+
+    members: List[List[int]] = []
+    by_index: Dict[int, List[int]] = {}
+    for ci, c in enumerate(constraints):
+        scope = []
+        mask = c.scope_mask
+        while mask:
+            low = mask & -mask
+            idx = low.bit_length() - 1
+            scope.append(idx)
+            by_index.setdefault(idx, []).append(ci)
+            mask ^= low
+        members.append(scope)
+
+    if order == "constrained":
+        left = [len(scope) for scope in members]
+        unplaced = set(variables)
+        result: List[int] = []
+        while unplaced:
+            var = min(unplaced, key=lambda idx: (min((left[ci] for ci in by_index.get(idx, ())), default=len(variables)),
+                                                 -len(by_index.get(idx, ())), idx))
+            unplaced.discard(var)
+            result.append(var)
+            for ci in by_index.get(var, ()):
+                left[ci] -= 1
+        return result
+
+    def bfs(start: int) -> List[int]:
+        seen = {start}
+        queue = deque([start])
+        visited = []
+        while queue:
+            idx = queue.popleft()
+            visited.append(idx)
+            for ci in by_index.get(idx, ()):
+                for other in members[ci]:
+                    if other not in seen:
+                        seen.add(other)
+                        queue.append(other)
+        return visited
+
+    result = []
+    placed: Set[int] = set()
+    for start in variables:
+        if start in placed:
+            continue
+        part = bfs(bfs(start)[-1])
+        result.extend(part)
+        placed.update(part)
+    return result
@@ -0,0 +1,248 @@
+# flat array-backed board for large grids
+
+import mmap
+from array import array
+from typing import Iterator, List, Optional, Tuple, Union
+from .board import Board, CellState
+from .generator import Generator
+from .neighbors import neighbor_table
+from .region import Region, index_array
+from .rng import RNG
+
+
+class FlatMines:
+    """
+    Read-only set-like view of a mine bitmap, so board.mines keeps working.
+    The bitmap may be a bytearray or an mmap; count is found on first use
+    when not given.
+    """
+
+    def __init__(self, bits: bytearray, width: int, height: int, count: Optional[int] = None):
+        self.bits = bits
+        self.width = width
+        self.height = height
+        self.count = count
+
+    def __contains__(self, cell) -> bool:
+        x, y = cell
+        return 0 <= x < self.width and 0 <= y < self.height \
+            and self.bits[y * self.width + x] == 1
+
+    def __len__(self) -> int:
+        if self.count is None:
+            self.count = len(FlatMines.indices(self.bits))
+        return self.count
+
+    @staticmethod
+    def indices(bits: bytearray) -> List[int]:
+        """
+        Flat indices of the set bytes in a mine bitmap.
+        """
+        indices = []
+        idx = bits.find(b"\x01")
+        while idx != -1:
+            indices.append(idx)
+            idx = bits.find(b"\x01", idx + 1)
+        return indices
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        width = self.width
+        idx = self.bits.find(b"\x01")
+        while idx != -1:
+            yield (idx % width, idx // width)
+            idx = self.bits.find(b"\x01", idx + 1)
+
+    def __eq__(self, other) -> bool:
+        return set(self) == set(other)
+
+
+class FlatCounts:
+    """
+    Read-only mapping-like view of a flat counts buffer keyed by (x, y).
+    """
+
+    def __init__(self, buf: array, width: int, height: int):
+        self.buf = buf
+        self.width = width
+        self.height = height
+
+    def __getitem__(self, cell) -> int:
+        x, y = cell
+        return self.buf[y * self.width + x]
+
+    def get(self, cell, default=None):
+        x, y = cell
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return default
+        return self.buf[y * self.width + x]
+
+    def items(self) -> Iterator[Tuple[Tuple[int, int], int]]:
+        width = self.width
+        for idx, count in enumerate(self.buf):
+            yield (idx % width, idx // width), count
+
+    def __len__(self) -> int:
+        return len(self.buf)
+
+
+class LazyCounts:
+    """
+    Flat counts buffer filled on first access from the mine bitmap.
+
+    memo[idx] is 0 until cell idx is read, then count + 2 (a mine, stored
+    as -1 like compute_count_grid, becomes 1); filled counts the entries
+    written so far. The memo is an anonymous mmap, whose zero pages are
+    only materialized when written, so the cost of counts follows the
+    cells actually read instead of width * height.
+    """
+
+    def __init__(self, mine_bits: bytearray, width: int, height: int):
+        self.mine_bits = mine_bits
+        self.width = width
+        self.height = height
+        self.memo = mmap.mmap(-1, width * height) if width * height else bytearray()
+        self.neighbors = neighbor_table(width, height).neighbors
+        self.filled = 0
+
+    def __getitem__(self, idx: int) -> int:
+        cached = self.memo[idx]
+        if cached:
+            return cached - 2
+        mine_bits = self.mine_bits
+        if mine_bits[idx]:
+            count = -1
+        else:
+            count = 0
+            for n in self.neighbors(idx):
+                count += mine_bits[n]
+        self.memo[idx] = count + 2
+        self.filled += 1
+        return count
+
+    def __iter__(self) -> Iterator[int]:
+        for idx in range(len(self.memo)):
+            yield self[idx]
+
+    def __len__(self) -> int:
+        return len(self.memo)
+
+    def computed(self) -> int:
+        """
+        Number of cells whose count has been computed so far, counted as
+        they are filled rather than by scanning the memo.
+        """
+        return self.filled
+
+
+class FlatBoard(Board):
+    """
+    Board variant that packs state, mine bits and counts into contiguous
+    buffers indexed by y * width + x.
+
+    Memory is 3 bytes per cell (state, mine bit, count) instead of a list
+    slot, a tuple-keyed dict entry and a set entry per cell.
+    board.state is a list of memoryview rows over the state buffer, so
+    state[y][x] reads and writes the flat buffer directly.
+    With lazy_counts=True counts are not computed when mines are placed;
+    each cell's count is computed from the mine bitmap on first read
+    (LazyCounts).
+    """
+
+    def __init__(self, width: int, height: int, num_mines: int, rng: RNG, use_numpy: bool = False,
+                 lazy_counts: bool = False, cells: Optional[bytearray] = None):
+        """
+        Initialize board with dimensions and mine count.
+        cells is an existing state buffer to adopt (e.g. a mapped snapshot).
+        """
+        self.cells = cells if cells is not None else bytearray(width * height)
+        super().__init__(width, height, num_mines, rng, use_numpy)
+        self.lazy_counts = lazy_counts
+
+        self.mine_bits: Optional[bytearray] = None
+        self.count_buf: Optional[Union[array, LazyCounts]] = None
+
+    def _empty_state(self) -> list:
+        """
+        Rows are memoryviews over the flat state buffer.
+        """
+        view = memoryview(self.cells)
+        return [view[y * self.width:(y + 1) * self.width] for y in range(self.height)]
+
+    def _place_mines(self, first_x: int, first_y: int):
+        """
+        Place mines avoiding first click and neighbors.
+        """
+        generator = Generator(self.width, self.height, self.num_mines, self.rng, self.use_numpy)
+        indices = generator.place_mine_indices(first_x, first_y)
+
+        self.attach_mines(generator.mine_grid(indices), indices)
+
+    def attach_mines(self, mine_bits: bytearray, indices: Optional[List[int]] = None) -> None:
+        """
+        Install a mine bitmap (one byte per cell) and derive the counts
+        from it. indices lists the mine positions when already known.
+        """
+        self.mine_bits = mine_bits
+        if self.lazy_counts:
+            self.count_buf = LazyCounts(mine_bits, self.width, self.height)
+        else:
+            if indices is None:
+                indices = FlatMines.indices(mine_bits)
+            self.count_buf = Generator.compute_count_grid(indices, self.width, self.height, self.use_numpy)
+
+        count = len(indices) if indices is not None else None
+        self.mines = FlatMines(mine_bits, self.width, self.height, count)
+        self.counts = FlatCounts(self.count_buf, self.width, self.height)
+
+    def _flood_fill_from(self, starts: List[Tuple[int, int]]) -> Region:
+        """
+        Flood fill over the flat buffers from every start cell at once, with
+        the same marking and output-array queue as Board._flood_fill_from.
+        """
+        width = self.width
+        cells = self.cells
+        counts = self.count_buf
+        neighbors = self.neighbors.neighbors
+        region = index_array(len(cells))
+
+        for x, y in starts:
+            start = y * width + x
+            if cells[start] == CellState.UNKNOWN:
+                cells[start] = CellState.REVEALED
+                region.append(start)
+
+        head = 0
+        while head < len(region):
+            idx = region[head]
+            head += 1
+            if counts is not None and counts[idx] == 0:
+                for n in neighbors(idx):
+                    if cells[n] == CellState.UNKNOWN:
+                        cells[n] = CellState.REVEALED
+                        region.append(n)
+
+        return Region(region, width)
+
+    def get_state(self, x: int, y: int) -> int:
+        """
+        Get cell state (UNKNOWN, REVEALED, FLAGGED).
+        """
+        if not self._in_bounds(x, y):
+            return CellState.UNKNOWN
+        return self.cells[y * self.width + x]
+
+    def get_count(self, x: int, y: int) -> Optional[int]:
+        """
+        Get mine count for cell (None if mines not placed yet).
+        """
+        if self.count_buf is None or not self._in_bounds(x, y):
+            return None
+        return self.count_buf[y * self.width + x]
+
+    def is_mine(self, x: int, y: int) -> bool:
+        """
+        Check if cell is mine.
+        """
+        if self.mine_bits is None or not self._in_bounds(x, y):
+            return False
+        return self.mine_bits[y * self.width + x] == 1
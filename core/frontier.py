@@ -1,11 +1,24 @@
 # build frontier, local indexing, component extraction
 
+import weakref
 from typing import Set, Tuple, List, Dict
 from dataclasses import dataclass
 from .board import Board, CellState
-from .generator import Generator
 from .dsu import DSU
 
+
+def mask_indices(mask: int) -> List[int]:
+    """
+    Indices of the set bits of mask, ascending; cost follows the number of
+    set bits rather than the mask width.
+    """
+    indices = []
+    while mask:
+        low = mask & -mask
+        indices.append(low.bit_length() - 1)
+        mask ^= low
+    return indices
+
 @dataclass
 class Constraint:
     """
@@ -19,9 +32,21 @@ class Constraint:
 class Frontier:
     """
     Frontier of revealed cells adjacent to unknowns.
+
+    unknowns holds only the unknown cells inside some constraint scope;
+    unknown cells elsewhere are counted from the board counters
+    (unknown_count) and listed only on request (unconstrained_cells), so
+    nothing per board cell is kept.
+    scope_indices[i] lists the unknown indices of constraints[i].
+    With incremental=True the frontier subscribes to the board and, on
+    refresh(), only re-examines the 3x3 neighbourhoods of changed cells;
+    close() unsubscribes, as does garbage collection of the frontier.
+    Local indices are then reassigned over the whole frontier, so a refresh
+    costs O(changed + F log F) for F frontier unknowns and constraints:
+    proportional to the frontier, not to the change.
     """
 
-    def __init__(self, board: Board):
+    def __init__(self, board: Board, incremental: bool = False):
         """
         Extract frontier form current board state.
         """
@@ -29,98 +54,190 @@ class Frontier:
         self.unknowns: List[Tuple[int, int]] = []
         self.unknown_to_idx: Dict[Tuple[int, int], int] = {}
         self.constraints: List[Constraint] = []
+        self.scope_indices: List[List[int]] = []
+
+        self.frontier_cells: Dict[Tuple[int, int], Tuple[Tuple[Tuple[int, int], ...], int]] = {}
+        self._pending: Set[Tuple[int, int]] = set()
 
         self._extract_frontier()
 
+        self._unsubscribe = None
+        if incremental:
+            # the board holds only a weak reference, so a frontier that is
+            # dropped without close() stops being notified instead of leaking
+            on_change = weakref.WeakMethod(self._on_change)
+
+            def listener(cells) -> None:
+                method = on_change()
+                if method is not None:
+                    method(cells)
+
+            board.add_listener(listener)
+            self._unsubscribe = weakref.finalize(self, board.remove_listener, listener)
+
+    def close(self) -> None:
+        """
+        Stop following board changes; refresh() sees nothing after this.
+        """
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+        self._pending = set()
+
     def _extract_frontier(self):
         """
         Build frontier constraints with local indexing.
         """
-        unknowns_set = set()
-        frontier_cells = []
-
-        for y in range(self.board.height):
-            for x in range(self.board.width):
-                if self.board.get_state(x, y) == CellState.UNKNOWN:
-                    unknowns_set.add((x, y))
-                elif self.board.get_state(x, y) == CellState.REVEALED:
-                    count = self.board.get_count(x, y)
-                    
-                    if count is not None and count > 0:
-                        neighbors = Generator.get_neighbors(x, y, self.board.width, self.board.height)
-                        has_unknown = any(self.board.get_state(nx, ny) == CellState.UNKNOWN 
-                                        for nx, ny in neighbors) 
-                        if has_unknown:
-                            frontier_cells.append((x, y))
-        
-        self.unknowns = sorted(unknowns_set)
-        self.unknown_to_idx = {cell: idx for idx, cell in enumerate(self.unknowns)}
+        for y, row in enumerate(self.board.state):
+            for x, state in enumerate(row):
+                if state == CellState.REVEALED:
+                    self._update_cell(x, y)
+
+        self._build_constraints()
+
+    def _on_change(self, cells) -> None:
+        """
+        Board listener: remember changed cells until the next refresh.
+        """
+        self._pending.update(cells)
+
+    def refresh(self) -> bool:
+        """
+        Apply pending board changes to the frontier.
+        Returns True if anything changed.
+        """
+        if not self._pending:
+            return False
+        self.update(self._pending)
+        self._pending = set()
+        return True
+
+    def update(self, cells) -> None:
+        """
+        Re-examine the 3x3 neighbourhoods of changed cells and rebuild
+        constraints; the rebuild re-indexes the whole frontier.
+        """
+        touched = set()
+        for x, y in cells:
+            touched.add((x, y))
+            touched.update(self.board.neighbors.cells(x, y))
+
+        for x, y in touched:
+            self._update_cell(x, y)
 
-        for fx, fy in frontier_cells:
-            neighbors = Generator.get_neighbors(fx, fy, self.board.width, self.board.height)
+        self._build_constraints()
 
+    def _update_cell(self, x: int, y: int) -> None:
+        """
+        Recompute the frontier entry (unknown neighbours, remaining) for one cell.
+        """
+        self.frontier_cells.pop((x, y), None)
+        if self.board.get_state(x, y) != CellState.REVEALED:
+            return
+        count = self.board.get_count(x, y)
+        if count is None or count <= 0:
+            return
+
+        scope = []
+        flagged_count = 0
+        for nx, ny in self.board.neighbors.cells(x, y):
+            state = self.board.get_state(nx, ny)
+            if state == CellState.UNKNOWN:
+                scope.append((nx, ny))
+            elif state == CellState.FLAGGED:
+                flagged_count += 1
+
+        if scope:
+            self.frontier_cells[(x, y)] = (tuple(scope), count - flagged_count)
+
+    def _build_constraints(self) -> None:
+        """
+        Assign local indices to scope unknowns and build constraint masks.
+        Unknowns and constraints are re-sorted on every call, so indices are
+        not stable across refreshes and the cost is O(F log F) in the
+        frontier size F (independent of the board area).
+        """
+        scope_cells = set()
+        for scope, _ in self.frontier_cells.values():
+            scope_cells.update(scope)
+
+        self.unknowns = sorted(scope_cells)
+        self.unknown_to_idx = {cell: idx for idx, cell in enumerate(self.unknowns)}
+        self.constraints = []
+        self.scope_indices = []
+
+        for fx, fy in sorted(self.frontier_cells, key=lambda c: (c[1], c[0])):
+            scope, remaining = self.frontier_cells[(fx, fy)]
+            indices = [self.unknown_to_idx[cell] for cell in scope]
             scope_mask = 0
-            flagged_count = 0
-
-            for nx, ny in neighbors:
-                state = self.board.get_state(nx, ny)
-                if state == CellState.UNKNOWN:
-                    idx = self.unknown_to_idx[(nx, ny)]
-                    scope_mask |= (1 << idx)
-                elif state == CellState.FLAGGED:
-                    flagged_count += 1
-                
-            if scope_mask > 0:
-                count = self.board.get_count(fx, fy)
-                if count is not None:
-                    remaining = count - flagged_count
-                    constraint = Constraint((fx, fy), scope_mask, remaining)
-                    self.constraints.append(constraint)
+            for idx in indices:
+                scope_mask |= (1 << idx)
+            self.constraints.append(Constraint((fx, fy), scope_mask, remaining))
+            self.scope_indices.append(indices)
 
     def get_components(self) -> List[Tuple[List[Constraint], Set[int]]]:
         """
         Decompose frontier into independent components using DSU
 
+        Constraints are united through the unknowns they share: the first
+        constraint seen on an unknown owns it and every later one is united
+        with the owner, so the cost is proportional to the total scope size
+        (at most 8 per constraint) instead of all constraint pairs. Scope
+        indices come from _build_constraints, so no mask is decoded.
+        Components are ordered by their first constraint.
+
         Return: list of (constraints, unknown_indices) for each component
         """
 
-        if not self.constraints:
+        constraints = self.constraints
+        if not constraints:
             return []
-        constraint_indices = set(range(len(self.constraints)))
-        dsu = DSU(constraint_indices)
-
-        for i in range(len(self.constraints)):
-            for j in range(i + 1, len(self.constraints)):
-                if self.constraints[i].scope_mask & self.constraints[j].scope_mask:
-                    dsu.union(i, j)
-        components_map = dsu.get_components()
-        components = []
+        dsu = DSU(set(range(len(constraints))))
+        owner: Dict[int, int] = {}
+        scopes = self.scope_indices
 
-        for constraint_set in components_map.values():
-            comp_constraints = [self.constraints[i] for i in sorted(constraint_set)]
+        for i, scope in enumerate(scopes):
+            for idx in scope:
+                first = owner.setdefault(idx, i)
+                if first != i:
+                    dsu.union(first, i)
 
-            unknowns_mask = 0
-            for c in comp_constraints:
-                unknowns_mask |= c.scope_mask
+        groups: Dict[int, List[int]] = {}
+        for i in range(len(constraints)):
+            groups.setdefault(dsu.find(i), []).append(i)
 
+        components = []
+        for members in groups.values():
             unknown_indices = set()
-            for idx in range(len(self.unknowns)):
-                if unknowns_mask & (1 << idx):
-                    unknown_indices.add(idx)
-
-            components.append((comp_constraints, unknown_indices))
+            for i in members:
+                unknown_indices.update(scopes[i])
+            components.append(([constraints[i] for i in members], unknown_indices))
 
         return components
 
+    def unknown_count(self) -> int:
+        """
+        Unknown cells on the board (neither revealed nor flagged), from the
+        board counters.
+        """
+        board = self.board
+        return board.width * board.height - board.revealed_count - board.flag_count
+
+    def unconstrained_cells(self) -> List[Tuple[int, int]]:
+        """
+        Unknown cells outside every constraint scope, found by one scan of
+        the board state; O(W x H), so callers ask only when they need them.
+        """
+        indexed = self.unknown_to_idx
+        return [(x, y) for y, row in enumerate(self.board.state)
+                for x, state in enumerate(row)
+                if state == CellState.UNKNOWN and (x, y) not in indexed]
+
     def mask_to_cells(self, mask: int) -> Set[Tuple[int, int]]:
         """
         Convert bitmask to set of cell coordinates.
         """
-        cells = set()
-        for idx in range(len(self.unknowns)):
-            if mask & (1 << idx):
-                cells.add(self.unknowns[idx])
-        return cells
+        unknowns = self.unknowns
+        return {unknowns[idx] for idx in mask_indices(mask)}
 
     def cells_to_mask(self, cells: Set[Tuple[int, int]]) -> int:
         """
@@ -1,8 +1,17 @@
 # first-click-safe mine placement, neighbor counts
 #--------------------------------------------------
 
-from typing import Set, Tuple
+from array import array
+from typing import Iterable, List, Set, Tuple
 from .rng import RNG
+from .neighbors import neighbor_table
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; pure-Python fallback below
+    np = None
+
+HAS_NUMPY = np is not None
 
 class Generator:
     """
@@ -14,14 +23,16 @@ class Generator:
      Exactly the requested number of mines are placed 
      """
 
-    def __init__(self, width: int, height: int, num_mines: int, rng: RNG):
+    def __init__(self, width: int, height: int, num_mines: int, rng: RNG, use_numpy: bool = False):
         """
         Initialize generator with board dimensions and mine count.
+        use_numpy selects the vectorized count path when NumPy is installed.
         """
         self.width = width
         self.height = height
         self.num_mines = num_mines
         self.rng = rng
+        self.use_numpy = use_numpy and HAS_NUMPY
 
     def place_mines(self, first_x: int, first_y: int) -> Set[Tuple[int, int]]:
         """
@@ -33,20 +44,49 @@ class Generator:
         Returns:
          Set of (x, y) tuples representing mine positions
         """
+        return {(idx % self.width, idx // self.width)
+                for idx in self.place_mine_indices(first_x, first_y)}
 
-        forbidden = self._get_neighbors_with_center(first_x, first_y)
+    def place_mine_indices(self, first_x: int, first_y: int) -> List[int]:
+        """
+        Place mines as flat indices (y * width + x).
 
-        available_cells = []
-        for y in range(self.height):
-            for x in range(self.width):
-                if (x, y) not in forbidden:
-                    available_cells.append((x, y))
+        Samples positions in the row-major list of available cells without
+        building that list: random.sample picks the same positions for a
+        range as for a list of the same length, so seeds give identical boards.
+        """
+        forbidden = sorted(y * self.width + x
+                           for x, y in self._get_neighbors_with_center(first_x, first_y))
+        num_available = self.width * self.height - len(forbidden)
+
+        max_mines = min(self.num_mines, num_available)
+        picks = self.rng.sample(range(num_available), max_mines)
+
+        indices = []
+        for pos in picks:
+            idx = pos
+            for f in forbidden:
+                if f <= idx:
+                    idx += 1
+                else:
+                    break
+            indices.append(idx)
 
+        return indices
 
-        max_mines = min(self.num_mines, len(available_cells))
-        mine_positions = set(self.rng.sample(available_cells, max_mines))
+    def mine_grid(self, indices: Iterable[int]) -> bytearray:
+        """
+        Mine bitmap of size width * height, one byte per cell.
+        """
+        if self.use_numpy:
+            grid = np.zeros(self.width * self.height, dtype=bool)
+            grid[np.fromiter(indices, dtype=np.intp)] = True
+            return bytearray(grid.tobytes())
 
-        return mine_positions
+        grid = bytearray(self.width * self.height)
+        for idx in indices:
+            grid[idx] = 1
+        return grid
 
     def _get_neighbors_with_center(self, x: int, y: int) -> Set[Tuple[int, int]]:
         """
@@ -67,20 +107,44 @@ class Generator:
     def get_neighbors(x: int, y: int, width: int, height: int) -> Set[Tuple[int, int]]:
         """
         Get 8 neighbors of cell, excluding center.
+        Hot paths use neighbor_table(width, height) directly to avoid the set.
         """
-        neighbors = set()
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < width and 0 <= ny < height:
-                    neighbors.add((nx, ny))
-                
-        return neighbors
+        return set(neighbor_table(width, height).cells(x, y))
 
     @staticmethod
-    def compute_counts(mines: Set[Tuple[int, int]], width: int, height: int) -> dict:
+    def compute_count_grid(mine_indices: Iterable[int], width: int, height: int,
+                           use_numpy: bool = False) -> array:
+        """
+        Compute neighbor mine counts as a flat array('b'), mines stored as -1.
+
+        NumPy path: padded 3x3 shifted sums over a mine grid.
+        Fallback: scatter +1 to the neighbors of each mine, O(mines).
+        """
+        if use_numpy and HAS_NUMPY:
+            grid = np.zeros(width * height, dtype=np.int8)
+            grid[np.fromiter(mine_indices, dtype=np.intp)] = 1
+            grid = grid.reshape(height, width)
+            padded = np.pad(grid, 1)
+            counts = (padded[:-2, :-2] + padded[:-2, 1:-1] + padded[:-2, 2:] +
+                      padded[1:-1, :-2] + padded[1:-1, 2:] +
+                      padded[2:, :-2] + padded[2:, 1:-1] + padded[2:, 2:])
+            counts[grid == 1] = -1
+            return array('b', counts.astype(np.int8).tobytes())
+
+        table = neighbor_table(width, height)
+        counts = array('b', bytes(width * height))
+        mine_list = list(mine_indices)
+        for idx in mine_list:
+            for n in table.neighbors(idx):
+                counts[n] += 1
+        for idx in mine_list:
+            counts[idx] = -1
+
+        return counts
+
+    @staticmethod
+    def compute_counts(mines: Set[Tuple[int, int]], width: int, height: int,
+                       use_numpy: bool = False) -> dict:
         """
         Compute neighbor mine counts for all cells.
 
@@ -88,21 +152,13 @@ class Generator:
             Dict mapping (x, y) -> count of adjacent mines
 
             """
+        grid = Generator.compute_count_grid((y * width + x for x, y in mines),
+                                            width, height, use_numpy)
         counts = {}
+        idx = 0
         for y in range(height):
             for x in range(width):
-                if (x, y) in mines:
-                    counts[(x, y)] = -1
-                else:
-                    neighbors = Generator.get_neighbors(x, y, width, height)
-                    count = sum(1 for n in neighbors if n in mines)
-                    counts[(x, y)] = count
-                    
-        return counts
-
-
-    
-        
-    
-
+                counts[(x, y)] = grid[idx]
+                idx += 1
 
+        return counts
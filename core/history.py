@@ -0,0 +1,90 @@
+# undo/redo stacks of reversible board deltas
+
+from typing import List, Optional
+from .board import Board, Delta
+
+
+class History:
+    """
+    Undo/redo for one board, built from the Delta of every board call.
+
+    The history is an action listener: each call that changes the board
+    pushes its delta and clears the redo stack. undo() applies the inverse
+    delta and redo() the delta itself, both through Board.apply_delta, so
+    the cost is proportional to the cells the call changed and board
+    listeners (the incremental frontier) see the change as usual.
+
+    Invariants:
+     undo_stack[-1] is the most recent call still applied
+     redo_stack[-1] is the most recently undone call
+    """
+
+    def __init__(self, board: Board, limit: Optional[int] = None):
+        """
+        Start recording board calls; limit caps the undo depth.
+        """
+        self.board = board
+        self.limit = limit
+        self.undo_stack: List[Delta] = []
+        self.redo_stack: List[Delta] = []
+        self._applying = False
+        board.add_action_listener(self._on_delta)
+
+    def _on_delta(self, delta: Delta) -> None:
+        """
+        Action listener: remember a new call, unless it is our own undo/redo.
+        """
+        if self._applying or not delta.actions:
+            return
+        self.undo_stack.append(delta)
+        if self.limit is not None and len(self.undo_stack) > self.limit:
+            del self.undo_stack[0]
+        self.redo_stack.clear()
+
+    def undo(self) -> Optional[Delta]:
+        """
+        Revert the most recent call; returns its delta, or None if nothing to undo.
+        """
+        if not self.undo_stack:
+            return None
+        delta = self.undo_stack.pop()
+        self._apply(delta.inverse())
+        self.redo_stack.append(delta)
+        return delta
+
+    def redo(self) -> Optional[Delta]:
+        """
+        Re-apply the most recently undone call; returns its delta, or None.
+        """
+        if not self.redo_stack:
+            return None
+        delta = self.redo_stack.pop()
+        self._apply(delta)
+        self.undo_stack.append(delta)
+        return delta
+
+    def rewind(self, depth: int = 0) -> int:
+        """
+        Undo until only depth calls remain applied; returns how many were undone.
+        """
+        undone = 0
+        while len(self.undo_stack) > depth:
+            self.undo()
+            undone += 1
+        return undone
+
+    def _apply(self, delta: Delta) -> None:
+        """
+        Apply a delta without recording it as a new call.
+        """
+        self._applying = True
+        try:
+            self.board.apply_delta(delta)
+        finally:
+            self._applying = False
+
+    def close(self) -> None:
+        """
+        Stop recording.
+        """
+        self.board.remove_action_listener(self._on_delta)
@@ -0,0 +1,181 @@
+# append-only action journal with snapshot checkpoints
+
+import struct
+from array import array
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+from .board import Action, Board, Delta
+from .snapshot import Snapshot
+
+MAGIC = b"MMJR"
+VERSION = 1
+CHECKPOINT = 0
+
+# kind, x, y; a CHECKPOINT record carries its payload length in x (low)
+# and y (high 32 bits) and is followed by a packed snapshot
+RECORD = struct.Struct('<BII')
+
+
+class Journal:
+    """
+    Append-only log of the actions applied to one board.
+
+    The journal listens to the board's actions; each one appends a fixed
+    9-byte record, so recording is O(1) per move. Checkpoints are only
+    taken between board calls, never inside a batch. A full snapshot
+    (Snapshot.dumps) is written at the start, right after mines are placed
+    and every checkpoint_every actions after that, so replay never has
+    to go back further than one interval. A delta without actions (an
+    undo) cannot be replayed, so it is journaled as a checkpoint.
+
+    Invariants:
+     A checkpoint taken after n actions holds the board state after them
+     Every record is flushed before the action returns
+    """
+
+    def __init__(self, board: Board, filepath: str, checkpoint_every: int = 1000):
+        """
+        Start a new journal at filepath for board, replacing any old file.
+        """
+        self.board = board
+        self.filepath = filepath
+        self.checkpoint_every = checkpoint_every
+        self.actions = 0
+        self.since_checkpoint = 0
+        self._mines_checkpointed = board.mines is not None
+
+        self.file = open(filepath, 'wb')
+        self.file.write(MAGIC + struct.pack('<H', VERSION))
+        self.checkpoint()
+        board.add_action_listener(self.record)
+
+    def record(self, delta: Delta) -> None:
+        """
+        Append the actions of one board call; checkpoint when due.
+        """
+        actions = delta.actions
+        if not actions:
+            self.checkpoint()
+            return
+        self.file.write(b"".join(RECORD.pack(action, x, y) for action, x, y in actions))
+        self.actions += len(actions)
+        self.since_checkpoint += len(actions)
+
+        if not self._mines_checkpointed and self.board.mines is not None:
+            self._mines_checkpointed = True
+            self.checkpoint()
+        elif self.since_checkpoint >= self.checkpoint_every:
+            self.checkpoint()
+        else:
+            self.file.flush()
+
+    def checkpoint(self) -> None:
+        """
+        Append a full snapshot of the board as it is now.
+        """
+        payload = Snapshot.dumps(self.board)
+        self.file.write(RECORD.pack(CHECKPOINT, len(payload) & 0xFFFFFFFF, len(payload) >> 32))
+        self.file.write(payload)
+        self.file.flush()
+        self.since_checkpoint = 0
+
+    def close(self) -> None:
+        """
+        Stop listening and close the file.
+        """
+        self.board.remove_action_listener(self.record)
+        self.file.close()
+
+
+class JournalReader:
+    """
+    Index of a journal file for replay.
+
+    Opening scans record headers only (checkpoint payloads are skipped),
+    keeping the actions in flat arrays and the file offset of each
+    checkpoint. A torn record at the end, left by an interrupted write, is
+    ignored.
+    """
+
+    def __init__(self, filepath: str):
+        """
+        Scan filepath and build the index.
+        """
+        self.filepath = filepath
+        self.kinds = array('B')
+        self.xs = array('I')
+        self.ys = array('I')
+        self.checkpoints: List[Tuple[int, int, int]] = []
+
+        with open(filepath, 'rb') as f:
+            head = f.read(len(MAGIC) + 2)
+            if len(head) < len(MAGIC) + 2 or head[:len(MAGIC)] != MAGIC:
+                raise ValueError("Not a journal file")
+            version, = struct.unpack('<H', head[len(MAGIC):])
+            if version > VERSION:
+                raise ValueError(f"Unsupported journal version {version}")
+
+            end = f.seek(0, 2)
+            offset = f.seek(len(head))
+            while offset + RECORD.size <= end:
+                kind, x, y = RECORD.unpack(f.read(RECORD.size))
+                offset += RECORD.size
+                if kind == CHECKPOINT:
+                    length = x | y << 32
+                    if offset + length > end:
+                        break
+                    self.checkpoints.append((len(self.kinds), offset, length))
+                    offset = f.seek(offset + length)
+                else:
+                    self.kinds.append(kind)
+                    self.xs.append(x)
+                    self.ys.append(y)
+
+        if not self.checkpoints:
+            raise ValueError("Journal has no checkpoint")
+        self._checkpoint_actions = [n for n, _, _ in self.checkpoints]
+
+    def __len__(self) -> int:
+        """
+        Number of recorded actions.
+        """
+        return len(self.kinds)
+
+    def action(self, index: int) -> Tuple[int, int, int]:
+        """
+        The index-th action as (kind, x, y).
+        """
+        return self.kinds[index], self.xs[index], self.ys[index]
+
+    def board_at(self, n: Optional[int] = None, compact: bool = False, lazy: bool = False) -> Board:
+        """
+        Board after the first n actions (all when None): load the nearest
+        checkpoint at or before n and apply the actions after it.
+        """
+        n = len(self) if n is None else n
+        if not 0 <= n <= len(self):
+            raise ValueError(f"Journal has {len(self)} actions, cannot seek to {n}")
+
+        i = bisect_right(self._checkpoint_actions, n) - 1
+        start, offset, length = self.checkpoints[i]
+        with open(self.filepath, 'rb') as f:
+            f.seek(offset)
+            board = Snapshot.loads(f.read(length), compact=compact, lazy=lazy)
+
+        for index in range(start, n):
+            JournalReader.apply(board, *self.action(index))
+        return board
+
+    @staticmethod
+    def apply(board: Board, kind: int, x: int, y: int) -> None:
+        """
+        Apply one recorded action to board.
+        """
+        if kind == Action.OPEN:
+            board.open(x, y)
+        elif kind == Action.FLAG:
+            board.flag(x, y)
+        elif kind == Action.CHORD:
+            board.chord(x, y)
+        else:
+            raise ValueError(f"Unknown journal record {kind}")
@@ -17,6 +17,8 @@ class LRUCache:
             raise ValueError("Capacity must be positive")
         self.capacity = capacity
         self.cache: OrderedDict[Any, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
 
     def get(self, key: Any) -> Optional[Any]:
         """
@@ -25,7 +27,9 @@ class LRUCache:
         """
 
         if key not in self.cache:
+            self.misses += 1
             return None
+        self.hits += 1
         self.cache.move_to_end(key)
         return self.cache[key]
 
@@ -52,6 +56,20 @@ class LRUCache:
         """
         self.cache.clear()
 
+    def hit_rate(self) -> float:
+        """
+        Fraction of get() calls that found their key.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def reset_stats(self) -> None:
+        """
+        Reset hit/miss counters.
+        """
+        self.hits = 0
+        self.misses = 0
+
     def __len__(self) -> int:
         """
         Return current cache size.
@@ -0,0 +1,126 @@
+# opt-in solver metrics: phase timers, counters, component sizes
+
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Tuple
+
+NO_METRICS = nullcontext()
+
+
+class SolverMetrics:
+    """
+    Counters and timers filled in by a Solver created with metrics=...
+
+    phase_time / phase_calls: wall time and entries per solver phase
+    counters: search and cache counters (see COUNTERS)
+    component_sizes: unknowns per enumerated component -> occurrences
+    """
+
+    PHASES = ("frontier", "components", "rules", "enumeration", "weighting", "sampling")
+    COUNTERS = ("components", "enumerated", "too_large", "nodes", "pruned",
+                "cache_hits", "cache_misses", "store_hits", "store_misses", "dispatched",
+                "sampled", "sweeps", "timed_out")
+
+    def __init__(self):
+        """
+        Start with all timers and counters at zero.
+        """
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Clear all timers, counters and the size histogram.
+        """
+        self.phase_time: Dict[str, float] = dict.fromkeys(SolverMetrics.PHASES, 0.0)
+        self.phase_calls: Dict[str, int] = dict.fromkeys(SolverMetrics.PHASES, 0)
+        self.counters: Dict[str, int] = dict.fromkeys(SolverMetrics.COUNTERS, 0)
+        self.component_sizes: Dict[int, int] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Time the enclosed block and add it to phase `name`.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_time[name] += time.perf_counter() - start
+            self.phase_calls[name] += 1
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """
+        Add `amount` to counter `name`.
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe_component(self, size: int) -> None:
+        """
+        Record the number of unknowns of an enumerated component.
+        """
+        self.component_sizes[size] = self.component_sizes.get(size, 0) + 1
+
+    def size_histogram(self, bucket: int = 4) -> List[Tuple[int, int, int]]:
+        """
+        Component sizes grouped into buckets: (low, high, occurrences).
+        """
+        buckets: Dict[int, int] = {}
+        for size, occurrences in self.component_sizes.items():
+            low = (size // bucket) * bucket
+            buckets[low] = buckets.get(low, 0) + occurrences
+        return [(low, low + bucket - 1, buckets[low]) for low in sorted(buckets)]
+
+    def cache_hit_rate(self) -> float:
+        """
+        Share of component lookups answered by the in-memory cache.
+        """
+        lookups = self.counters["cache_hits"] + self.counters["cache_misses"]
+        return self.counters["cache_hits"] / lookups if lookups else 0.0
+
+    def merge(self, other: "SolverMetrics") -> None:
+        """
+        Add another metrics object's totals into this one.
+        """
+        for name, seconds in other.phase_time.items():
+            self.phase_time[name] = self.phase_time.get(name, 0.0) + seconds
+        for name, calls in other.phase_calls.items():
+            self.phase_calls[name] = self.phase_calls.get(name, 0) + calls
+        for name, amount in other.counters.items():
+            self.count(name, amount)
+        for size, occurrences in other.component_sizes.items():
+            self.component_sizes[size] = self.component_sizes.get(size, 0) + occurrences
+
+    def as_dict(self) -> Dict:
+        """
+        Plain-dict view for JSON output.
+        """
+        return {
+            "phase_time": dict(self.phase_time),
+            "phase_calls": dict(self.phase_calls),
+            "counters": dict(self.counters),
+            "component_sizes": {str(size): self.component_sizes[size]
+                                for size in sorted(self.component_sizes)},
+        }
+
+    def format(self) -> str:
+        """
+        Human-readable summary for the CLI.
+        """
+        lines = ["Phase          calls     time (ms)"]
+        for name in SolverMetrics.PHASES:
+            lines.append(f" {name:<12} {self.phase_calls[name]:>6} {self.phase_time[name] * 1000:>12.2f}")
+        c = self.counters
+        lines.append(f"Components: {c['components']} seen, {c['enumerated']} enumerated,"
+                     f" {c['too_large']} above k_max, {c['dispatched']} sent to workers,"
+                     f" {c['timed_out']} out of time")
+        lines.append(f"Search: {c['nodes']} nodes, {c['pruned']} pruned branches")
+        if c['sampled']:
+            lines.append(f"Sampling: {c['sampled']} components, {c['sweeps']} sweeps")
+        lines.append(f"Cache: {c['cache_hits']} hits, {c['cache_misses']} misses"
+                     f" ({self.cache_hit_rate():.0%}); store: {c['store_hits']} hits,"
+                     f" {c['store_misses']} misses")
+        if self.component_sizes:
+            lines.append("Component sizes:")
+            for low, high, occurrences in self.size_histogram():
+                lines.append(f" {low:>3}-{high:<3} {occurrences}")
+        return "\n".join(lines)
@@ -0,0 +1,97 @@
+# precomputed neighbour tables per board size
+
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+
+class NeighborTable:
+    """
+    Neighbour lookup for one (width, height), built once and shared.
+
+    Flat indices are y * width + x. Boards up to TABLE_LIMIT cells get a
+    full table of neighbour tuples (flat and (x, y)) so lookups allocate
+    nothing. Larger boards precompute only the border cells and derive
+    interior neighbours from the 8 fixed offsets.
+
+    Invariants:
+     Neighbours are in row-major order and exclude the centre cell
+     (x, y) tuples are shared objects, one per cell, for tabled boards
+    """
+    TABLE_LIMIT = 1 << 16
+
+    def __init__(self, width: int, height: int):
+        """
+        Build the table for a width x height board.
+        """
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.offsets = (-width - 1, -width, -width + 1, -1, 1, width - 1, width, width + 1)
+
+        self.flat: Optional[List[Tuple[int, ...]]] = None
+        self.coords: Optional[List[Tuple[Tuple[int, int], ...]]] = None
+        self._border_flat: Dict[int, Tuple[int, ...]] = {}
+        self._border_coords: Dict[int, Tuple[Tuple[int, int], ...]] = {}
+
+        if self.size <= NeighborTable.TABLE_LIMIT:
+            cells = [(idx % width, idx // width) for idx in range(self.size)]
+            self.flat = [self._compute(idx) for idx in range(self.size)]
+            self.coords = [tuple(cells[n] for n in nbrs) for nbrs in self.flat]
+        else:
+            for idx in self._border_indices():
+                nbrs = self._compute(idx)
+                self._border_flat[idx] = nbrs
+                self._border_coords[idx] = tuple((n % width, n // width) for n in nbrs)
+
+    def _compute(self, idx: int) -> Tuple[int, ...]:
+        """
+        Neighbours of idx with bounds checks.
+        """
+        x, y = idx % self.width, idx // self.width
+        return tuple(ny * self.width + nx
+                     for ny in range(max(y - 1, 0), min(y + 2, self.height))
+                     for nx in range(max(x - 1, 0), min(x + 2, self.width))
+                     if nx != x or ny != y)
+
+    def _border_indices(self) -> List[int]:
+        """
+        Flat indices of cells on the board edge.
+        """
+        w, h = self.width, self.height
+        border = set(range(w)) | set(range((h - 1) * w, h * w))
+        border.update(y * w for y in range(h))
+        border.update(y * w + w - 1 for y in range(h))
+        return sorted(border)
+
+    def neighbors(self, idx: int) -> Tuple[int, ...]:
+        """
+        Flat indices of the neighbours of idx.
+        """
+        if self.flat is not None:
+            return self.flat[idx]
+        nbrs = self._border_flat.get(idx)
+        if nbrs is not None:
+            return nbrs
+        return (idx - self.width - 1, idx - self.width, idx - self.width + 1, idx - 1,
+                idx + 1, idx + self.width - 1, idx + self.width, idx + self.width + 1)
+
+    def cells(self, x: int, y: int) -> Tuple[Tuple[int, int], ...]:
+        """
+        (x, y) neighbours of (x, y).
+        """
+        idx = y * self.width + x
+        if self.coords is not None:
+            return self.coords[idx]
+        nbrs = self._border_coords.get(idx)
+        if nbrs is not None:
+            return nbrs
+        return ((x - 1, y - 1), (x, y - 1), (x + 1, y - 1), (x - 1, y),
+                (x + 1, y), (x - 1, y + 1), (x, y + 1), (x + 1, y + 1))
+
+
+@lru_cache(maxsize=8)
+def neighbor_table(width: int, height: int) -> NeighborTable:
+    """
+    Shared NeighborTable for a board size.
+    """
+    return NeighborTable(width, height)
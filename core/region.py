@@ -0,0 +1,66 @@
+# compact revealed region: flat indices in an array
+
+from array import array
+from collections.abc import Set as AbstractSet
+from typing import Iterable, Iterator, Optional, Tuple
+
+
+def index_array(size: int) -> array:
+    """
+    Empty flat-index array with the smallest typecode that holds size cells.
+    """
+    return array('i' if size < (1 << 31) else 'q')
+
+
+class Region(AbstractSet):
+    """
+    Set-like view of revealed cells stored as flat indices (y * width + x)
+    in one array, in reveal order.
+
+    Iteration yields (x, y) tuples, so it stands in for the set of tuples
+    Board.open used to return; `indices` is the compact form. Set
+    operators (|, &, -) return plain sets. Membership builds an index
+    set on first use.
+    """
+
+    def __init__(self, indices: array, width: int):
+        """
+        Wrap an index array; the region takes ownership of it.
+        """
+        self.indices = indices
+        self.width = width
+        self._members: Optional[set] = None
+
+    @classmethod
+    def _from_iterable(cls, it: Iterable) -> set:
+        """
+        Results of set operators are plain sets of (x, y).
+        """
+        return set(it)
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        width = self.width
+        for idx in self.indices:
+            yield (idx % width, idx // width)
+
+    def __contains__(self, cell) -> bool:
+        if self._members is None:
+            self._members = set(self.indices)
+        x, y = cell
+        return 0 <= x < self.width and y * self.width + x in self._members
+
+    def add(self, cell: Tuple[int, int]) -> None:
+        """
+        Append one cell (used for the mine that ends a batch).
+        """
+        if cell not in self:
+            x, y = cell
+            idx = y * self.width + x
+            self.indices.append(idx)
+            self._members.add(idx)
+
+    def __repr__(self) -> str:
+        return f"Region({len(self.indices)} cells)"
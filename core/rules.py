@@ -1,8 +1,9 @@
 # singles, subset, scope merges
 
+from collections import deque
 from typing import List, Set, Tuple, Optional
 from dataclasses import dataclass
-from .frontier import Constraint
+from .frontier import Constraint, mask_indices
 
 @dataclass
 class Move:
@@ -95,22 +96,174 @@ class Rules:
     @staticmethod
     def find_certain_moves(constraints: List[Constraint], mask_to_cells) -> List[Move]:
         """
-        Apply all deterministic rules to find certain moves.
+        Apply all deterministic rules to a fixpoint and return every certain move.
+
+        Moves are disjoint and in deduction order; later moves may depend on
+        earlier ones (see Propagator).
         """
+        return Propagator(constraints, mask_to_cells).run().moves
 
-        moves = []
 
-        moves.extend(Rules.apply_singles(constraints, mask_to_cells))
-        moves.extend(Rules.apply_subset_rule(constraints, mask_to_cells))
+class Propagator:
+    """
+    Singles and subset rules propagated to a fixpoint over a private copy
+    of a constraint system.
+
+    Unknowns are relabelled 0..k-1 in sorted order. When a move decides
+    cells they are removed from every scope that watches them (and mines
+    decrement remaining), and only those constraints are re-queued.
+    Singles run until the queue is empty; then the subset rule checks the
+    constraints changed since its last pass, against partners found through
+    the cell -> constraint watch lists rather than all pairs. A subset
+    deduction returns to the singles queue. The loop stops when a subset
+    pass deduces nothing.
+
+    Invariants:
+     scopes[i] holds exactly the undecided unknowns of constraints[i] and
+     remaining[i] the mines still to place among them
+     safe & mines == 0; every decided cell appears in exactly one move
+    """
+
+    def __init__(self, constraints: List[Constraint], mask_to_cells):
+        """
+        Copy the constraints into local masks and build watch lists.
+        """
+        self.constraints = constraints
+        self.mask_to_cells = mask_to_cells
+
+        scope_indices = [mask_indices(c.scope_mask) for c in constraints]
+        variables = set()
+        for indices in scope_indices:
+            variables.update(indices)
+        self.variables = sorted(variables)
+        position = {idx: pos for pos, idx in enumerate(self.variables)}
+
+        self.scopes: List[int] = []
+        self.remaining: List[int] = [c.remaining for c in constraints]
+        self.watch: List[List[int]] = [[] for _ in self.variables]
+        for ci, indices in enumerate(scope_indices):
+            local = 0
+            for idx in indices:
+                pos = position[idx]
+                local |= 1 << pos
+                self.watch[pos].append(ci)
+            self.scopes.append(local)
+
+        self.safe = 0
+        self.mines = 0
+        self.moves: List[Move] = []
+        self._queue = deque(range(len(constraints)))
+        self._queued = [True] * len(constraints)
+        self._dirty = set(range(len(constraints)))
+
+    def run(self) -> "Propagator":
+        """
+        Propagate until no rule deduces anything new.
+        """
+        while True:
+            while self._queue:
+                ci = self._queue.popleft()
+                self._queued[ci] = False
+                self._single(ci)
+
+            pending = sorted(self._dirty)
+            pending_set = set(pending)
+            self._dirty.clear()
+            for n, ci in enumerate(pending):
+                if self._subset(ci, pending_set):
+                    self._dirty.update(pending[n:])
+                    break
+            else:
+                return self
+
+    def _single(self, ci: int) -> None:
+        """
+        Singles rule on one constraint.
+        """
+        scope = self.scopes[ci]
+        if not scope:
+            return
+        c = self.constraints[ci]
+        remaining = self.remaining[ci]
+        if remaining == 0:
+            explanation = f"SINGLE at {c.cell}: remaining = 0 -> all neighbors safe"
+            self._decide(scope, False, "SINGLE", explanation)
+        elif remaining == scope.bit_count():
+            explanation = f"SINGLE at {c.cell}: remaining={remaining} = |scope| -> all neighbors mines"
+            self._decide(scope, True, "SINGLE", explanation)
+
+    def _subset(self, ci: int, pending: Set[int]) -> bool:
+        """
+        Subset rule between constraint ci and every constraint sharing a
+        cell with it; pairs of two pending constraints are checked once,
+        from the lower index. Returns True when a move was made.
+        """
+        scope_i = self.scopes[ci]
+        if not scope_i:
+            return False
+
+        candidates = set()
+        mask = scope_i
+        while mask:
+            low = mask & -mask
+            candidates.update(self.watch[low.bit_length() - 1])
+            mask ^= low
+
+        for cj in sorted(candidates):
+            if cj == ci or (cj < ci and cj in pending):
+                continue
+            scope_j = self.scopes[cj]
+            common = scope_i & scope_j
+            if common == scope_i:
+                sub, sup = ci, cj
+            elif common == scope_j and scope_j:
+                sub, sup = cj, ci
+            else:
+                continue
+
+            diff_mask = self.scopes[sup] & ~self.scopes[sub]
+            if diff_mask == 0:
+                continue
+            subset_cell = self.constraints[sub].cell
+            superset_cell = self.constraints[sup].cell
+            subset_remaining = self.remaining[sub]
+            superset_remaining = self.remaining[sup]
 
-        seen_cells = set()
-        unique_moves = []
-        for move in moves:
-            move_key = (frozenset(move.cells), move.is_mine)
-            if move_key not in seen_cells:
-                seen_cells.add(move_key)
-                unique_moves.append(move)
-            
-        
-        return unique_moves
+            if subset_remaining == superset_remaining:
+                explanation = (f"SUBSET: N{subset_cell} ⊆ N{superset_cell} and"
+                               f"remaining equal -> B\\A safe")
+                self._decide(diff_mask, False, "SUBSET", explanation)
+                return True
+            if superset_remaining - subset_remaining == diff_mask.bit_count():
+                explanation = (f"SUBSET: N{subset_cell} ⊆ N{superset_cell} and"
+                               f"b-a={superset_remaining - subset_remaining} = |B\\A| -> B\\A mines")
+                self._decide(diff_mask, True, "SUBSET", explanation)
+                return True
+        return False
+
+    def _decide(self, local_mask: int, is_mine: bool, rule: str, explanation: str) -> None:
+        """
+        Record a move and remove its cells from every watching constraint.
+        """
+        global_mask = 0
+        mask = local_mask
+        while mask:
+            low = mask & -mask
+            pos = low.bit_length() - 1
+            global_mask |= 1 << self.variables[pos]
+            for ci in self.watch[pos]:
+                if self.scopes[ci] & low:
+                    self.scopes[ci] ^= low
+                    if is_mine:
+                        self.remaining[ci] -= 1
+                    self._dirty.add(ci)
+                    if not self._queued[ci]:
+                        self._queued[ci] = True
+                        self._queue.append(ci)
+            mask ^= low
 
+        if is_mine:
+            self.mines |= local_mask
+        else:
+            self.safe |= local_mask
+        self.moves.append(Move(self.mask_to_cells(global_mask), is_mine, rule, explanation))
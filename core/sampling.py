@@ -0,0 +1,305 @@
+# sampled solution counts for components too large to enumerate
+
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+from .enumeration import ComponentCounts
+from .frontier import Constraint
+
+# two-sided 95% Student t quantiles by degrees of freedom (1..9); 1.96 beyond
+T95 = (12.71, 4.30, 3.18, 2.78, 2.57, 2.45, 2.36, 2.31, 2.26)
+
+
+@dataclass
+class SamplingBudget:
+    """
+    How much sampling a Solver may spend on each component above k_max.
+
+    seconds / sweeps: a component stops at whichever limit comes first
+    burn_in: sweeps discarded after the first solution is found
+    batches: number of consecutive sweep batches for confidence intervals
+    block_size: most unknowns resampled together in one Gibbs update
+    seed: seed for every component's sampler (None for a random seed)
+    """
+    seconds: float = 0.05
+    sweeps: int = 2000
+    burn_in: int = 10
+    batches: int = 10
+    block_size: int = 16
+    seed: Optional[int] = 0
+
+
+class ComponentSampler:
+    """
+    Uniform samples of the satisfying assignments of one component, by
+    block Gibbs sampling.
+
+    Unknowns are relabelled 0..k-1 in breadth-first order along shared
+    constraints, so a randomized depth-first search finds a first solution
+    with early pruning. Each update then takes the scope of a random
+    constraint, grows it by the scopes of random overlapping constraints up
+    to block_size unknowns, lists every assignment of the block that
+    satisfies the constraints given the rest, and picks one uniformly.
+    Whole scopes let a mine move anywhere within a constraint, or across
+    two, in a single update. A sweep is k / block_size updates and adds one
+    sample.
+
+    Samples are tallied like an enumeration (solutions[m], mine_counts[m])
+    so the result is a ComponentCounts that MineCountWeighting accepts:
+    the weighting only uses ratios within a component, and sample counts
+    estimate those ratios.
+
+    Invariants:
+     mines always satisfies every constraint once initial() succeeded
+     batch_counts[b] holds the samples of the b-th chunk of consecutive sweeps
+    """
+
+    def __init__(self, constraints: List[Constraint], unknown_indices: Set[int],
+                 rng: random.Random, block_size: int = 16):
+        """
+        Relabel unknowns in breadth-first order and build local scopes and
+        watch lists.
+        """
+        by_index: Dict[int, List[int]] = {}
+        for ci, c in enumerate(constraints):
+            mask = c.scope_mask
+            while mask:
+                low = mask & -mask
+                by_index.setdefault(low.bit_length() - 1, []).append(ci)
+                mask ^= low
+
+        order: List[int] = []
+        seen = set()
+        for start in sorted(unknown_indices):
+            if start in seen:
+                continue
+            seen.add(start)
+            queue = deque([start])
+            while queue:
+                idx = queue.popleft()
+                order.append(idx)
+                for ci in by_index.get(idx, ()):
+                    mask = constraints[ci].scope_mask
+                    while mask:
+                        low = mask & -mask
+                        other = low.bit_length() - 1
+                        mask ^= low
+                        if other not in seen and other in unknown_indices:
+                            seen.add(other)
+                            queue.append(other)
+
+        self.variables = order
+        position = {idx: pos for pos, idx in enumerate(order)}
+        self.scopes: List[int] = []
+        self.remaining: List[int] = []
+        self.watch: List[List[int]] = [[] for _ in order]
+        for c in constraints:
+            local = 0
+            mask = c.scope_mask
+            while mask:
+                low = mask & -mask
+                pos = position[low.bit_length() - 1]
+                local |= 1 << pos
+                self.watch[pos].append(len(self.scopes))
+                mask ^= low
+            self.scopes.append(local)
+            self.remaining.append(c.remaining)
+
+        self.rng = rng
+        self.block_size = block_size
+        self.mines = 0
+        self.sweeps = 0
+        self.batch_counts: List[ComponentCounts] = []
+
+    def _fits(self, var: int, mines: int, assigned: int) -> bool:
+        """
+        Whether the constraints watching var can still be met.
+        """
+        for ci in self.watch[var]:
+            scope = self.scopes[ci]
+            placed = (scope & mines).bit_count()
+            if placed > self.remaining[ci] or \
+               placed + (scope & ~assigned).bit_count() < self.remaining[ci]:
+                return False
+        return True
+
+    def initial(self, node_limit: int = 200000) -> bool:
+        """
+        Find a first solution by randomized depth-first search; False if
+        there is none or node_limit nodes were not enough.
+        """
+        k = len(self.variables)
+        first = [self.rng.getrandbits(1) for _ in range(k)]
+        tried = [0] * k
+        mines = 0
+        var = 0
+        nodes = 0
+        while var < k:
+            if tried[var] == 2:
+                tried[var] = 0
+                mines &= ~(1 << var)
+                var -= 1
+                if var < 0:
+                    return False
+                continue
+            nodes += 1
+            if nodes > node_limit:
+                return False
+            value = first[var] ^ tried[var]
+            tried[var] += 1
+            mines = (mines & ~(1 << var)) | (value << var)
+            if self._fits(var, mines, (2 << var) - 1):
+                var += 1
+        self.mines = mines
+        return True
+
+    def _block(self) -> List[int]:
+        """
+        Unknowns of a random constraint, grown by the scopes of random
+        overlapping constraints while the block stays within block_size.
+        """
+        scopes = self.scopes
+        rng = self.rng
+        block = scopes[rng.randrange(len(scopes))]
+        while True:
+            near = [ci for var in _bits(block) for ci in self.watch[var]
+                    if scopes[ci] & ~block and (scopes[ci] | block).bit_count() <= self.block_size]
+            if not near:
+                break
+            block |= scopes[rng.choice(near)]
+        return _bits(block)
+
+    def update(self) -> None:
+        """
+        Resample one block uniformly among the assignments that keep every
+        constraint satisfied.
+        """
+        block = self._block()
+        block_mask = 0
+        for var in block:
+            block_mask |= 1 << var
+        outside = ~block_mask
+        fixed = self.mines & outside
+        choices: List[int] = []
+
+        def extend(pos: int, mines: int, assigned: int) -> None:
+            if pos == len(block):
+                choices.append(mines)
+                return
+            var = block[pos]
+            bit = 1 << var
+            assigned |= bit
+            for mine_mask in (mines, mines | bit):
+                if self._fits(var, mine_mask, assigned):
+                    extend(pos + 1, mine_mask, assigned)
+
+        extend(0, fixed, outside)
+        self.mines = self.rng.choice(choices)
+
+    def run(self, budget: SamplingBudget) -> "ComponentSampler":
+        """
+        Sample until the budget's time or sweep limit, after burn_in
+        sweeps. Does nothing if no first solution is found.
+
+        Sweeps are tallied in chunks of consecutive sweeps. Chunks start at
+        one sweep and neighbours are merged pairwise (doubling the chunk)
+        whenever there are more than 8 per batch, so batches() can regroup
+        them evenly whichever limit ends the run.
+        """
+        if not self.initial():
+            return self
+        updates = max(1, -(-len(self.variables) // self.block_size))
+        most = budget.batches * 8
+        chunk = 1
+        deadline = time.perf_counter() + budget.seconds
+
+        for _ in range(budget.burn_in):
+            for _ in range(updates):
+                self.update()
+        while self.sweeps < budget.sweeps and time.perf_counter() < deadline:
+            for _ in range(updates):
+                self.update()
+            if self.sweeps % chunk == 0:
+                if len(self.batch_counts) == most:
+                    self.batch_counts = [ComponentSampler.merge(self.variables, self.batch_counts[i:i + 2])
+                                         for i in range(0, most, 2)]
+                    chunk *= 2
+                self.batch_counts.append(ComponentCounts(self.variables, {}, {}))
+            self._tally(self.batch_counts[-1])
+            self.sweeps += 1
+        return self
+
+    def _tally(self, counts: ComponentCounts) -> None:
+        """
+        Add the current assignment as one sample.
+        """
+        mines = self.mines
+        m = mines.bit_count()
+        per_cell = counts.mine_counts.get(m)
+        if per_cell is None:
+            per_cell = counts.mine_counts[m] = [0] * len(self.variables)
+            counts.solutions[m] = 0
+        counts.solutions[m] += 1
+        while mines:
+            low = mines & -mines
+            per_cell[low.bit_length() - 1] += 1
+            mines ^= low
+
+    def result(self) -> ComponentCounts:
+        """
+        All samples as one ComponentCounts (total 0 if none were taken).
+        """
+        return ComponentSampler.merge(self.variables, self.batch_counts)
+
+    def batches(self, count: int) -> List[ComponentCounts]:
+        """
+        Samples regrouped into at most count runs of consecutive batches,
+        for batch-means confidence intervals.
+        """
+        groups: List[List[ComponentCounts]] = [[] for _ in range(min(count, len(self.batch_counts)))]
+        for b, counts in enumerate(self.batch_counts):
+            groups[b * len(groups) // len(self.batch_counts)].append(counts)
+        return [ComponentSampler.merge(self.variables, group) for group in groups]
+
+    @staticmethod
+    def half_width(values: List[float]) -> float:
+        """
+        Half-width of the 95% confidence interval for the mean of batch
+        estimates (1.0, the whole range, with fewer than two batches).
+        """
+        n = len(values)
+        if n < 2:
+            return 1.0
+        mean = sum(values) / n
+        variance = sum((v - mean) ** 2 for v in values) / (n - 1)
+        t = T95[n - 2] if n - 2 < len(T95) else 1.96
+        return t * (variance / n) ** 0.5
+
+    @staticmethod
+    def merge(variables: List[int], parts: List[ComponentCounts]) -> ComponentCounts:
+        """
+        Sum sample tallies over the same variables.
+        """
+        solutions: Dict[int, int] = {}
+        mine_counts: Dict[int, List[int]] = {}
+        for part in parts:
+            for m, n in part.solutions.items():
+                solutions[m] = solutions.get(m, 0) + n
+                total = mine_counts.setdefault(m, [0] * len(variables))
+                for pos, c in enumerate(part.mine_counts[m]):
+                    total[pos] += c
+        return ComponentCounts(variables, solutions, mine_counts)
+
+
+def _bits(mask: int) -> List[int]:
+    """
+    Positions of the set bits of mask, ascending.
+    """
+    positions = []
+    while mask:
+        low = mask & -mask
+        positions.append(low.bit_length() - 1)
+        mask ^= low
+    return positions
@@ -1,8 +1,20 @@
 # canonical component signature
 
-from typing import List, Tuple
+from typing import List, Optional, Set, Tuple
 from .frontier import Constraint
 
+# the 8 symmetries of the square grid as (x, y) -> (x', y')
+SYMMETRIES = (
+    lambda x, y: (x, y),
+    lambda x, y: (-x, y),
+    lambda x, y: (x, -y),
+    lambda x, y: (-x, -y),
+    lambda x, y: (y, x),
+    lambda x, y: (-y, x),
+    lambda x, y: (y, -x),
+    lambda x, y: (-y, -x),
+)
+
 def compute_signature(constraints: List[Constraint]) -> Tuple:
     """
     Compute canonical signature for a component.
@@ -17,4 +29,56 @@ def compute_signature(constraints: List[Constraint]) -> Tuple:
     masks = tuple(p[0] for p in pairs)
     remaining = tuple(p[1] for p in pairs)
 
-    return (masks, remaining)
\ No newline at end of file
+    return (masks, remaining)
+
+def canonical_signature(constraints: List[Constraint], unknown_indices: Set[int],
+                        cells: Optional[List[Tuple[int, int]]] = None) -> Tuple[Tuple, List[int]]:
+    """
+    Compute a signature that does not depend on frontier-global indices.
+
+    With cells (frontier.unknowns), component unknowns are mapped through each
+    of the 8 grid symmetries, translated to the origin and labelled in
+    row-major order; the smallest (coordinates, constraints) encoding wins, so
+    the signature is invariant under translation, rotation and reflection.
+    Without cells, unknowns are labelled in sorted index order.
+
+    Returns:
+     (signature, order) where order[label] is the frontier index with that label
+    """
+    variables = sorted(unknown_indices)
+
+    if cells is None:
+        return _encode(constraints, variables, None), variables
+
+    best = None
+    for transform in SYMMETRIES:
+        points = {idx: transform(*cells[idx]) for idx in variables}
+        min_x = min(p[0] for p in points.values())
+        min_y = min(p[1] for p in points.values())
+        points = {idx: (p[0] - min_x, p[1] - min_y) for idx, p in points.items()}
+
+        order = sorted(variables, key=lambda idx: (points[idx][1], points[idx][0]))
+        coords = tuple(points[idx] for idx in order)
+        signature = _encode(constraints, order, coords)
+
+        if best is None or signature < best[0]:
+            best = (signature, order)
+
+    return best
+
+def _encode(constraints: List[Constraint], order: List[int], coords: Optional[Tuple]) -> Tuple:
+    """
+    Encode constraints with scopes relabelled so order[label] -> bit label.
+    """
+    label = {idx: pos for pos, idx in enumerate(order)}
+    pairs = []
+    for c in constraints:
+        local = 0
+        mask = c.scope_mask
+        while mask:
+            low = mask & -mask
+            local |= 1 << label[low.bit_length() - 1]
+            mask ^= low
+        pairs.append((local, c.remaining))
+    pairs.sort()
+    return (coords, tuple(pairs))
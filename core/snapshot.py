@@ -1,13 +1,65 @@
-# save/load JSON snapshot
+# save/load snapshots: JSON and packed binary
 
+import io
 import json
-from typing import Any, Dict
+import mmap
+import os
+import struct
+import zlib
+from typing import Any, Dict, Optional, Tuple
 from .board import Board, CellState, GameState
+from .flat_board import FlatBoard, FlatMines
+from .generator import Generator
 from .rng import RNG
 
+MAGIC = b"MMSN"
+VERSION = 2
+FLAG_ZLIB = 1
+FLAG_RAW = 2
+PAGE = mmap.ALLOCATIONGRANULARITY
+
+# magic, version, flags, width, height, num_mines, seed, seeded,
+# first_click_done, game_state, mines_placed, revealed_count, flag_count
+HEADER = struct.Struct('<4sHHIIIqBBBBQQ')
+
+
+def pack_cells(cells: bytes, bits: int) -> bytes:
+    """
+    Pack one small value per byte into `bits` bits per cell, first cell in
+    the low bits. Each stride of cells becomes one big int, shifted into place.
+    """
+    per = 8 // bits
+    padded = bytes(cells) + bytes(-len(cells) % per)
+    packed = 0
+    for k in range(per):
+        packed |= int.from_bytes(padded[k::per], 'little') << (bits * k)
+    return packed.to_bytes(len(padded) // per, 'little')
+
+
+def unpack_cells(packed: bytes, bits: int, size: int) -> bytearray:
+    """
+    Inverse of pack_cells: one byte per cell, truncated to size cells.
+    """
+    per = 8 // bits
+    mask = (1 << bits) - 1
+    cells = bytearray(len(packed) * per)
+    for k in range(per):
+        table = bytes((v >> (bits * k)) & mask for v in range(256))
+        cells[k::per] = packed.translate(table)
+    del cells[size:]
+    return cells
+
+
 class Snapshot:
     """
-    Save and load game state to/from JSON file.
+    Save and load game state to/from JSON or binary files.
+
+    Binary layout: a fixed HEADER, then cell states at 2 bits per cell,
+    then the mine bitmap at 1 bit per cell (only once mines are placed).
+    With FLAG_ZLIB everything after the header is one zlib stream.
+    With FLAG_RAW (version 2) states and mines are one byte per cell, each
+    section starting on a PAGE boundary, so open_mapped can map them as
+    FlatBoard buffers. Counts are not stored; loaders recompute them.
     """
     @staticmethod
     def save(board: Board, filepath: str) -> None:
@@ -35,30 +87,251 @@ class Snapshot:
             json.dump(data, f, indent=2)
 
     @staticmethod
-    def load(filepath: str) -> Board:
+    def save_binary(board: Board, filepath: str, compress: bool = True, raw: bool = False) -> None:
+        """
+        Save board state to a binary snapshot, zlib-compressed by default.
+        raw writes the unpacked, page-aligned layout used by open_mapped.
+        """
+        with open(filepath, 'wb') as f:
+            Snapshot._write_binary(board, f, compress, raw)
+
+    @staticmethod
+    def dumps(board: Board, compress: bool = True) -> bytes:
+        """
+        Packed binary snapshot as bytes (e.g. a journal checkpoint).
+        """
+        f = io.BytesIO()
+        Snapshot._write_binary(board, f, compress, False)
+        return f.getvalue()
+
+    @staticmethod
+    def loads(data: bytes, compact: bool = False, lazy: bool = False,
+              use_numpy: bool = False) -> Board:
         """
-        Load board state from JSON file.
+        Rebuild a board from bytes written by dumps.
+        """
+        return Snapshot._read_binary(io.BytesIO(data), compact, lazy, use_numpy)
+
+    @staticmethod
+    def _write_binary(board: Board, f, compress: bool, raw: bool) -> None:
+        """
+        Write header and payload to a binary file object.
+        """
+        seed = board.rng.seed
+        if seed is not None and not -2 ** 63 <= seed < 2 ** 63:
+            raise ValueError("Binary snapshots need a seed that fits in 64 bits")
+
+        mines_placed = board.mines is not None
+        flags = FLAG_RAW if raw else FLAG_ZLIB if compress else 0
+        header = HEADER.pack(MAGIC, VERSION, flags,
+                             board.width, board.height, board.num_mines,
+                             seed or 0, seed is not None,
+                             board.first_click_done, board.game_state, mines_placed,
+                             board.revealed_count, board.flag_count)
+
+        f.write(header)
+        if raw:
+            state_offset, mine_offset = Snapshot._raw_offsets(board.width * board.height)
+            f.seek(state_offset)
+            f.write(Snapshot._state_bytes(board))
+            if mines_placed:
+                f.seek(mine_offset)
+                f.write(Snapshot._mine_bytes(board))
+            return
+
+        payload = pack_cells(Snapshot._state_bytes(board), 2)
+        if mines_placed:
+            payload += pack_cells(Snapshot._mine_bytes(board), 1)
+        if compress:
+            payload = zlib.compress(payload)
+        f.write(payload)
+
+    @staticmethod
+    def load(filepath: str, compact: bool = False, lazy: bool = False,
+             use_numpy: bool = False) -> Board:
+        """
+        Load board state from a binary or JSON snapshot (detected by magic).
+        compact loads into a FlatBoard, lazy also defers its counts;
+        use_numpy recomputes counts on the vectorized path.
+        """
+        with open(filepath, 'rb') as f:
+            magic = f.read(len(MAGIC))
+        options = (compact, lazy, use_numpy)
+        if magic == MAGIC:
+            with open(filepath, 'rb') as f:
+                return Snapshot._read_binary(f, *options)
+        return Snapshot._load_json(filepath, *options)
+
+    @staticmethod
+    def open_mapped(filepath: str, use_numpy: bool = False) -> FlatBoard:
+        """
+        Open a raw snapshot as a FlatBoard whose state and mine buffers are
+        copy-on-write memory maps of the file. Nothing is read up front:
+        pages load as cells are touched, writes stay private to the board,
+        and counts are lazy.
+        """
+        with open(filepath, 'rb') as f:
+            flags, mines_placed, fields = Snapshot._read_header(f)
+            if not flags & FLAG_RAW:
+                raise ValueError("Only raw snapshots can be memory-mapped (save_binary(raw=True))")
+            size = fields["width"] * fields["height"]
+            state_offset, mine_offset = Snapshot._raw_offsets(size)
+            end = mine_offset + size if mines_placed else state_offset + size
+            if os.fstat(f.fileno()).st_size < end:
+                raise ValueError("Snapshot payload does not match its header")
+
+            cells = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_COPY, offset=state_offset)
+            mine_bits = None
+            if mines_placed:
+                mine_bits = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_COPY, offset=mine_offset)
+
+        board = FlatBoard(fields["width"], fields["height"], fields["num_mines"], RNG(fields["seed"]),
+                          use_numpy, lazy_counts=True, cells=cells)
+        if mine_bits is not None:
+            board.attach_mines(mine_bits)
+        Snapshot._restore_counters(board, fields)
+        return board
+
+    @staticmethod
+    def _read_header(f) -> Tuple[int, bool, Dict[str, Any]]:
+        """
+        Parse and check the header: (flags, mines_placed, board fields).
+        """
+        raw = f.read(HEADER.size)
+        if len(raw) < HEADER.size:
+            raise ValueError("Truncated snapshot header")
+        (magic, version, flags, width, height, num_mines, seed, seeded,
+         first_click_done, game_state, mines_placed,
+         revealed_count, flag_count) = HEADER.unpack(raw)
+        if magic != MAGIC:
+            raise ValueError("Not a binary snapshot")
+        if version > VERSION or (flags & FLAG_RAW and version < 2):
+            raise ValueError(f"Unsupported snapshot version {version}")
+
+        fields = {
+            "width": width,
+            "height": height,
+            "num_mines": num_mines,
+            "seed": seed if seeded else None,
+            "first_click_done": bool(first_click_done),
+            "game_state": game_state,
+            "revealed_count": revealed_count,
+            "flag_count": flag_count,
+        }
+        return flags, bool(mines_placed), fields
+
+    @staticmethod
+    def _raw_offsets(size: int) -> Tuple[int, int]:
+        """
+        File offsets of the state and mine sections in the raw layout.
+        """
+        state_offset = PAGE
+        mine_offset = state_offset + -(-size // PAGE) * PAGE
+        return state_offset, mine_offset
+
+    @staticmethod
+    def _read_binary(f, compact: bool, lazy: bool, use_numpy: bool) -> Board:
+        """
+        Read a binary snapshot: header, then the packed or raw payload.
+        """
+        flags, mines_placed, fields = Snapshot._read_header(f)
+        size = fields["width"] * fields["height"]
+        if flags & FLAG_RAW:
+            state_offset, mine_offset = Snapshot._raw_offsets(size)
+            f.seek(state_offset)
+            cells = bytearray(f.read(size))
+            mine_bits = None
+            if mines_placed:
+                f.seek(mine_offset)
+                mine_bits = bytearray(f.read(size))
+            if len(cells) != size or (mine_bits is not None and len(mine_bits) != size):
+                raise ValueError("Snapshot payload does not match its header")
+            return Snapshot._build(fields, cells, mine_bits, compact, lazy, use_numpy)
+        payload = f.read()
+
+        if flags & FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+
+        state_len = (size + 3) // 4
+        mine_len = (size + 7) // 8 if mines_placed else 0
+        if len(payload) != state_len + mine_len:
+            raise ValueError("Snapshot payload does not match its header")
+
+        cells = unpack_cells(payload[:state_len], 2, size)
+        mine_bits = unpack_cells(payload[state_len:], 1, size) if mines_placed else None
+        return Snapshot._build(fields, cells, mine_bits, compact, lazy, use_numpy)
+
+    @staticmethod
+    def _load_json(filepath: str, compact: bool, lazy: bool, use_numpy: bool) -> Board:
+        """
+        Read a JSON snapshot. Stored counts are ignored and recomputed.
         """
         with open(filepath, 'r') as f:
             data = json.load(f)
 
-        rng = RNG(data["seed"])
-        board = Board(data["width"], data["height"], data["num_mines"], rng)
+        width, height = data["width"], data["height"]
+        cells = bytearray(width * height)
+        for y, row in enumerate(data["state"]):
+            cells[y * width:(y + 1) * width] = bytes(row)
 
-        board.first_click_done = data["first_click_done"]
-        board.game_state = data["game_state"]
-        board.revealed_count = data["revealed_count"]
-        board.flag_count = data["flag_count"]
-
-        board.state = [[data["state"][y][x] for x in range(board.width)]
-                        for y in range(board.height)] 
-        
+        mine_bits = None
         if data["mines"] is not None:
-            board.mines = set(tuple(m) for m in data["mines"])
-        if data["counts"] is not None:
-            board.counts = {}
-            for key, count in data["counts"].items():
-                x, y = map(int, key.split(','))
-                board.counts[(x, y)] = count
-        
-        return board
\ No newline at end of file
+            mine_bits = bytearray(width * height)
+            for x, y in data["mines"]:
+                mine_bits[y * width + x] = 1
+
+        return Snapshot._build(data, cells, mine_bits, compact, lazy, use_numpy)
+
+    @staticmethod
+    def _build(fields: Dict[str, Any], cells: bytearray, mine_bits: Optional[bytearray],
+               compact: bool, lazy: bool, use_numpy: bool) -> Board:
+        """
+        Create a Board or FlatBoard from header fields and flat buffers.
+        """
+        width, height = fields["width"], fields["height"]
+        rng = RNG(fields["seed"])
+        if compact or lazy:
+            board = FlatBoard(width, height, fields["num_mines"], rng, use_numpy, lazy_counts=lazy)
+            board.cells[:] = cells
+            if mine_bits is not None:
+                board.attach_mines(mine_bits)
+        else:
+            board = Board(width, height, fields["num_mines"], rng, use_numpy)
+            board.state = [list(cells[y * width:(y + 1) * width]) for y in range(height)]
+            if mine_bits is not None:
+                board.mines = {(idx % width, idx // width) for idx in FlatMines.indices(mine_bits)}
+                board.counts = Generator.compute_counts(board.mines, width, height, use_numpy)
+
+        Snapshot._restore_counters(board, fields)
+        return board
+
+    @staticmethod
+    def _restore_counters(board: Board, fields: Dict[str, Any]) -> None:
+        """
+        Copy game progress fields onto a rebuilt board.
+        """
+        board.first_click_done = fields["first_click_done"]
+        board.game_state = fields["game_state"]
+        board.revealed_count = fields["revealed_count"]
+        board.flag_count = fields["flag_count"]
+
+    @staticmethod
+    def _state_bytes(board: Board) -> bytes:
+        """
+        Cell states as one byte per cell, row-major.
+        """
+        if isinstance(board, FlatBoard):
+            return bytes(board.cells)
+        return b"".join(bytes(row) for row in board.state)
+
+    @staticmethod
+    def _mine_bytes(board: Board) -> bytes:
+        """
+        Mine bitmap as one byte per cell, row-major.
+        """
+        if isinstance(board, FlatBoard):
+            return bytes(board.mine_bits)
+        bits = bytearray(board.width * board.height)
+        for x, y in board.mines:
+            bits[y * board.width + x] = 1
+        return bytes(bits)
@@ -1,55 +1,206 @@
 # exact enumeration, probabilities, auto/step/hint
 
-from typing import List, Set, Tuple, Dict, Optional
+import random
+import time
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Iterator, List, Set, Tuple, Dict, Optional
 from .board import Board, CellState
 from .frontier import Frontier, Constraint
+from .history import History
 from .rules import Rules, Move
 from .lru import LRUCache
-from .signatures import compute_signature
+from .store import EnumerationStore
+from .signatures import canonical_signature
 from .priority_queue import PriorityQueue
+from .decomposition import PathEnumerator
+from .enumeration import BitsetEnumerator, ComponentCounts, EnumerationTimeout, CHECK_EVERY, ORDERS, \
+    enumerate_local, variable_order
+from .weighting import MineCountWeighting
+from .metrics import SolverMetrics, NO_METRICS
+from .sampling import ComponentSampler, SamplingBudget
+
+@dataclass
+class ComponentStatus:
+    """
+    How the last get_hint / compute_probabilities call handled one component.
+
+    cells: the component's unknown cells
+    method: EXACT (enumerated or cached), INCONSISTENT (enumerated, no
+    assignment fits, e.g. after a wrong flag), SAMPLED, FLAT (density
+    only), RULES (get_hint took a rule move) or SKIPPED (get_hint ran out
+    of time)
+    """
+    EXACT = "exact"
+    INCONSISTENT = "inconsistent"
+    SAMPLED = "sampled"
+    FLAT = "flat"
+    RULES = "rules"
+    SKIPPED = "skipped"
+
+    cells: List[Tuple[int, int]]
+    method: str
+
 
 class Solver:
     """
     Minesweeper solver using deterministic rules and exact enumeration.
     """
 
-    def __init__(self, board: Board, k_max: int = 20, cache_size: int = 100):
+    ENGINES = ("bitset", "backtrack", "dp")
+
+    def __init__(self, board: Board, k_max: int = 28, cache_size: int = 100, engine: str = "bitset",
+                 cache: Optional[LRUCache] = None, store: Optional[EnumerationStore] = None,
+                 metrics: Optional[SolverMetrics] = None, executor: Optional[Executor] = None,
+                 parallel_min: int = 16, sampling: Optional[SamplingBudget] = None,
+                 order: str = "bfs", propagate: bool = True):
         """
         Initialize solver with board and parameters.
+        engine: "bitset" (default), "backtrack" (original per-constraint loops)
+        or "dp" (PathEnumerator, polynomial in the component length; pair it
+        with a large k_max).
+        cache: enumeration cache to share across solvers/games (keys are canonical
+        signatures, so results carry over between boards).
+        store: persistent on-disk store consulted after a cache miss.
+        metrics: SolverMetrics to fill in (phase timers, search and cache
+        counters, component sizes); None disables all bookkeeping.
+        executor: concurrent.futures executor (normally a ProcessPoolExecutor,
+        owned by the caller) for enumerating components in parallel with the
+        bitset engine; components with fewer than parallel_min unknowns are
+        still enumerated inline, where dispatch would cost more than the search.
+        sampling: budget for estimating components above k_max by sampling
+        (ComponentSampler) in compute_probabilities; None leaves their cells
+        unconstrained.
+        order: variable order for the bitset and backtrack engines, one of
+        enumeration.ORDERS ("sorted" is the original frontier index order).
+        propagate: forced-value propagation in the bitset engine.
         """
+        if engine not in Solver.ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        if order not in ORDERS:
+            raise ValueError(f"Unknown variable order: {order}")
         self.board = board
         self.k_max = k_max
-        self.cache = LRUCache(cache_size)
+        self.engine = engine
+        self.cache = cache if cache is not None else LRUCache(cache_size)
+        self.store = store
+        self.metrics = metrics
+        self.executor = executor
+        self.parallel_min = parallel_min
+        self.sampling = sampling
+        self.order = order
+        self.propagate = propagate
+        self.intervals: Dict[Tuple[int, int], Tuple[float, float]] = {}
+        self.status: List[ComponentStatus] = []
+        self.frontier = Frontier(board, incremental=True)
+
+    def close(self) -> None:
+        """
+        Unsubscribe the frontier from the board; call when the solver is
+        replaced while the board lives on.
+        """
+        self.frontier.close()
+
+    def _phase(self, name: str):
+        """
+        Timer context for a solver phase, or a no-op when metrics are off.
+        """
+        if self.metrics is None:
+            return NO_METRICS
+        return self.metrics.phase(name)
 
-    def get_hint(self) -> Optional[Move]:
+    def get_hint(self, budget: Optional[float] = None) -> Optional[Move]:
         """
         Get one certain safe/mine move with explanation.
+
+        With a budget (seconds) the rules run on every component first,
+        then components are enumerated smallest-first regardless of k_max
+        until the budget runs out; after that only cached counts are used.
+        self.status then lists the components examined.
         """
-        frontier = Frontier(self.board)
+        frontier = self.frontier
+        self.status = []
+        deadline = None if budget is None else time.perf_counter() + budget
+        with self._phase("frontier"):
+            frontier.refresh()
         if not frontier.constraints:
             return None
-        
-        components = frontier.get_components()
+        with self._phase("components"):
+            components = frontier.get_components()
+        if self.metrics is not None:
+            self.metrics.count("components", len(components))
+        if deadline is not None:
+            return self._hint_within(components, deadline)
 
         for constraints, unknown_indices in components:
-            rule_moves = Rules.find_certain_moves(constraints, frontier.mask_to_cells)
+            with self._phase("rules"):
+                rule_moves = Rules.find_certain_moves(constraints, frontier.mask_to_cells)
             if rule_moves:
                 return rule_moves[0]
 
-            if len(unknown_indices) <= self.k_max:
+            if len(unknown_indices) > self.k_max:
+                if self.metrics is not None:
+                    self.metrics.count("too_large")
+                continue
+
+            with self._phase("enumeration"):
                 probs = self._enumerate_component(constraints, unknown_indices, frontier)
-                for idx in unknown_indices:
-                    cell = frontier.unknowns[idx]
-                    prob = probs.get(idx, 0.5)
-                    if prob < 0.001:
-                        explanation = f"EXACT at {cell}: probability =0 from enumeration -> safe"
-                        return Move({cell}, False, "EXACT", explanation)
-                    elif prob > 0.999:
-                        explanation = f"EXACT at {cell}: probability=1 from enumeration -> mine"
-                        return Move({cell}, True, "EXACT", explanation)
+            exact = self._exact_moves(unknown_indices, probs, frontier)
+            if exact:
+                return exact[0]
         
         return None
 
+    def _hint_within(self, components: List[Tuple[List[Constraint], Set[int]]],
+                     deadline: float) -> Optional[Move]:
+        """
+        get_hint with a deadline: rules on every component, then exact
+        moves from components enumerated smallest-first.
+        """
+        frontier = self.frontier
+        for constraints, unknown_indices in components:
+            with self._phase("rules"):
+                rule_moves = Rules.find_certain_moves(constraints, frontier.mask_to_cells)
+            if rule_moves:
+                self.status.append(ComponentStatus(self._cells(unknown_indices), ComponentStatus.RULES))
+                return rule_moves[0]
+
+        for constraints, unknown_indices in sorted(components, key=lambda c: len(c[1])):
+            with self._phase("enumeration"):
+                counts = self._count_within(constraints, unknown_indices, deadline)
+            if counts is None:
+                self.status.append(ComponentStatus(self._cells(unknown_indices), ComponentStatus.SKIPPED))
+                continue
+            self.status.append(ComponentStatus(self._cells(unknown_indices), ComponentStatus.EXACT))
+            exact = self._exact_moves(unknown_indices, counts.probabilities(), frontier)
+            if exact:
+                return exact[0]
+        return None
+
+    def _count_within(self, constraints: List[Constraint], unknown_indices: Set[int],
+                      deadline: float) -> Optional[ComponentCounts]:
+        """
+        Counts of a component if they are cached or can be enumerated
+        before the deadline; None otherwise. After the deadline only the
+        cache and store are consulted.
+        """
+        if time.perf_counter() < deadline:
+            try:
+                return self._count_component(constraints, unknown_indices, self.frontier, deadline)
+            except EnumerationTimeout:
+                if self.metrics is not None:
+                    self.metrics.count("timed_out")
+                return None
+        _, order, cached = self._lookup(constraints, unknown_indices, self.frontier)
+        return ComponentCounts(order, *cached) if cached is not None else None
+
+    def _cells(self, unknown_indices) -> List[Tuple[int, int]]:
+        """
+        Board cells of frontier indices, in index order.
+        """
+        return [self.frontier.unknowns[idx] for idx in sorted(unknown_indices)]
+
     def step(self) -> Optional[Tuple[Move, Set[Tuple[int, int]]]]:
         """
         Apply one deterministic solver step.
@@ -59,85 +210,273 @@ class Solver:
             return None
         return move, move.cells
 
-    def compute_probabilities(self) -> Dict[Tuple[int, int], float]:
+    def step_batch(self) -> List[Move]:
+        """
+        Every move that is certain on the current board, from one frontier
+        rebuild.
+
+        Each component is propagated to a fixpoint by the rules; components
+        where the rules find nothing and that fit k_max are enumerated and
+        every cell with probability 0 or 1 becomes an EXACT move. Moves are
+        disjoint.
+        """
+        frontier = self.frontier
+        with self._phase("frontier"):
+            frontier.refresh()
+        if not frontier.constraints:
+            return []
+        with self._phase("components"):
+            components = frontier.get_components()
+        if self.metrics is not None:
+            self.metrics.count("components", len(components))
+
+        found: List[List[Move]] = []
+        enumerate_at: List[int] = []
+        to_count = []
+        for constraints, unknown_indices in components:
+            with self._phase("rules"):
+                rule_moves = Rules.find_certain_moves(constraints, frontier.mask_to_cells)
+            found.append(rule_moves)
+            if rule_moves:
+                continue
+
+            if len(unknown_indices) > self.k_max:
+                if self.metrics is not None:
+                    self.metrics.count("too_large")
+                continue
+
+            enumerate_at.append(len(found) - 1)
+            to_count.append((constraints, unknown_indices))
+
+        with self._phase("enumeration"):
+            counted = self._count_components(to_count, frontier)
+        for at, (_, unknown_indices), counts in zip(enumerate_at, to_count, counted):
+            found[at] = self._exact_moves(unknown_indices, counts.probabilities(), frontier)
+
+        return [move for component_moves in found for move in component_moves]
+
+    def _exact_moves(self, unknown_indices: Set[int], probs: Dict[int, float],
+                     frontier: Frontier) -> List[Move]:
+        """
+        EXACT moves for the cells of an enumerated component whose
+        probability is 0 or 1, in frontier index order.
+        """
+        moves = []
+        for idx in sorted(unknown_indices):
+            cell = frontier.unknowns[idx]
+            prob = probs.get(idx, 0.5)
+            if prob < 0.001:
+                explanation = f"EXACT at {cell}: probability =0 from enumeration -> safe"
+                moves.append(Move({cell}, False, "EXACT", explanation))
+            elif prob > 0.999:
+                explanation = f"EXACT at {cell}: probability=1 from enumeration -> mine"
+                moves.append(Move({cell}, True, "EXACT", explanation))
+        return moves
+
+    def compute_probabilities(self, budget: Optional[float] = None) -> Dict[Tuple[int, int], float]:
         """
         Compute mine probabilities for all unknown cells.
+
+        Components up to k_max are enumerated exactly and weighted by the
+        number of ways to place the remaining mines on the other unknown
+        cells (MineCountWeighting). Larger components are sampled when a
+        SamplingBudget is set, and their sample counts go through the same
+        weighting; self.intervals then holds a 95% confidence interval for
+        each of their cells. Otherwise their cells are treated as
+        unconstrained.
+
+        With a budget (seconds), k_max is not applied: components are
+        enumerated smallest-first until the budget runs out, an enumeration
+        still running at the deadline is abandoned, later components are
+        used only if cached, and the rest are sampled in the time left (when
+        sampling is on) or treated as unconstrained. Enumeration is then
+        inline, without the executor. self.status says which components
+        were exact and which estimated.
+
+        A component with no solution (a wrong flag) is reported as
+        INCONSISTENT and its cells get 0.5, as in
+        ComponentCounts.probabilities; it is left out of the weighting and
+        its cells are not counted as unconstrained.
         """
-        frontier = Frontier(self.board)
+        frontier = self.frontier
+        with self._phase("frontier"):
+            frontier.refresh()
         probabilities = {}
+        self.intervals = {}
+        self.status = []
+        deadline = None if budget is None else time.perf_counter() + budget
 
-        if not frontier.unknowns:
+        if not frontier.unknown_count():
             return probabilities
 
-        components = frontier.get_components()
+        with self._phase("components"):
+            components = frontier.get_components()
+        if self.metrics is not None:
+            self.metrics.count("components", len(components))
+
+        if deadline is None:
+            leftover = []
+            to_count = []
+            for constraints, unknown_indices in components:
+                if len(unknown_indices) > self.k_max:
+                    if self.metrics is not None:
+                        self.metrics.count("too_large")
+                    leftover.append((constraints, unknown_indices))
+                else:
+                    to_count.append((constraints, unknown_indices))
+            with self._phase("enumeration"):
+                counted = self._count_components(to_count, frontier)
+        else:
+            leftover, counted = self._count_smallest_first(components, deadline)
+        for counts in counted:
+            method = ComponentStatus.EXACT if counts.total else ComponentStatus.INCONSISTENT
+            self.status.append(ComponentStatus(self._cells(counts.variables), method))
+        inconsistent = [counts for counts in counted if not counts.total]
+        counted = [counts for counts in counted if counts.total]
+
+        sampled: List[ComponentSampler] = []
+        for constraints, unknown_indices in leftover:
+            method = ComponentStatus.FLAT
+            if self.sampling is not None and (deadline is None or time.perf_counter() < deadline):
+                with self._phase("sampling"):
+                    sampler = self._sample_component(constraints, unknown_indices, deadline)
+                if sampler.sweeps:
+                    sampled.append(sampler)
+                    method = ComponentStatus.SAMPLED
+            self.status.append(ComponentStatus(self._cells(unknown_indices), method))
+        counted.extend(sampler.result() for sampler in sampled)
+
+        counted_cells = set()
+        for counts in counted + inconsistent:
+            counted_cells.update(frontier.unknowns[idx] for idx in counts.variables)
+        off_cells = [cell for cell in frontier.unknowns if cell not in counted_cells]
+        off_cells += frontier.unconstrained_cells()
+        remaining_mines = self.board.num_mines - self.board.flag_count
+
+        with self._phase("weighting"):
+            weighted = MineCountWeighting.combine(counted, len(off_cells), remaining_mines)
+        if weighted is None:
+            probabilities = self._independent_probabilities(counted, off_cells)
+        else:
+            component_probs, off_prob = weighted
+            for probs in component_probs:
+                for idx, prob in probs.items():
+                    probabilities[frontier.unknowns[idx]] = prob
+            for cell in off_cells:
+                probabilities[cell] = off_prob
+        for counts in inconsistent:
+            for idx, prob in counts.probabilities().items():
+                probabilities[frontier.unknowns[idx]] = prob
+
+        if sampled:
+            with self._phase("sampling"):
+                self._sample_intervals(counted, sampled, len(off_cells), remaining_mines, probabilities)
+        return probabilities
 
-        all_component_indices = set()
-        for _, unknown_indices in components:
-            all_component_indices.update(unknown_indices)
+    def _count_smallest_first(self, components: List[Tuple[List[Constraint], Set[int]]],
+                              deadline: float) -> Tuple[List, List[ComponentCounts]]:
+        """
+        Enumerate components smallest-first until the deadline.
 
-        for constraints, unknown_indices in components:
-            if len(unknown_indices) <= self.k_max:
-                probs = self._enumerate_component(constraints, unknown_indices, frontier)
-                for idx, prob in probs.items():
-                    cell = frontier.unknowns[idx]
-                    probabilities[cell] = prob
+        Returns:
+         (components left without counts, counts of the others)
+        """
+        leftover = []
+        counted = []
+        for constraints, unknown_indices in sorted(components, key=lambda c: len(c[1])):
+            with self._phase("enumeration"):
+                counts = self._count_within(constraints, unknown_indices, deadline)
+            if counts is None:
+                leftover.append((constraints, unknown_indices))
             else:
-                base_prob = self.board.num_mines / (self.board.width * self.board.height)
-                for idx in unknown_indices:
-                    cell = frontier.unknowns[idx]
-                    probabilities[cell] = base_prob
-        
-        not_frontier_unknowns = set()
-        for idx, cell in enumerate(frontier.unknowns):
-            if idx not in all_component_indices:
-                not_frontier_unknowns.add(cell)
-            
-        if not_frontier_unknowns:
-            revealed_count = sum(1 for y in range(self.board.height) 
-                              for x in range(self.board.width) 
-                              if self.board.get_state(x, y) == CellState.REVEALED)
-            flagged_count = self.board.flag_count
-            remaining_mines = self.board.num_mines - flagged_count
-            remaining_cells = self.board.width * self.board.height - revealed_count - flagged_count
-
-            if remaining_cells > 0:
-                base_prob = remaining_mines / remaining_cells
-                for cell in not_frontier_unknowns:
-                    probabilities[cell] = base_prob
+                counted.append(counts)
+        return leftover, counted
+
+    def _sample_component(self, constraints: List[Constraint], unknown_indices: Set[int],
+                          deadline: Optional[float] = None) -> ComponentSampler:
+        """
+        Sample a component within the sampling budget, cut short at the
+        deadline if there is one.
+        """
+        budget = self.sampling
+        if deadline is not None:
+            budget = replace(budget, seconds=min(budget.seconds, max(0.0, deadline - time.perf_counter())))
+        sampler = ComponentSampler(constraints, unknown_indices, random.Random(budget.seed),
+                                   budget.block_size).run(budget)
+        if self.metrics is not None:
+            self.metrics.count("sampled")
+            self.metrics.count("sweeps", sampler.sweeps)
+        return sampler
+
+    def _sample_intervals(self, counted: List[ComponentCounts], sampled: List[ComponentSampler],
+                          off_cells: int, remaining_mines: int,
+                          probabilities: Dict[Tuple[int, int], float]) -> None:
+        """
+        Batch-means confidence intervals for the cells of sampled components.
+
+        Each batch of consecutive sweeps replaces its component's counts in
+        turn and the weighting is rerun, so the spread between batches
+        covers the weighted probability that is reported.
+        """
+        first = len(counted) - len(sampled)
+        for j, sampler in enumerate(sampled):
+            series: Dict[int, List[float]] = {idx: [] for idx in sampler.variables}
+            for batch in sampler.batches(self.sampling.batches):
+                trial = counted[:first + j] + [batch] + counted[first + j + 1:]
+                weighted = MineCountWeighting.combine(trial, off_cells, remaining_mines)
+                probs = weighted[0][first + j] if weighted is not None else batch.probabilities()
+                for idx, prob in probs.items():
+                    series[idx].append(prob)
+            for idx, values in series.items():
+                cell = self.frontier.unknowns[idx]
+                half = ComponentSampler.half_width(values)
+                prob = probabilities[cell]
+                self.intervals[cell] = (min(prob, max(0.0, prob - half)), max(prob, min(1.0, prob + half)))
+
+    def _independent_probabilities(self, counted: List[ComponentCounts],
+                                   off_cells: List[Tuple[int, int]]) -> Dict[Tuple[int, int], float]:
+        """
+        Per-component uniform probabilities and flat density elsewhere, used
+        when flags make the global mine count inconsistent.
+        """
+        probabilities = {}
+        for counts in counted:
+            for idx, prob in counts.probabilities().items():
+                probabilities[self.frontier.unknowns[idx]] = prob
+
+        remaining_mines = self.board.num_mines - self.board.flag_count
+        remaining_cells = self.frontier.unknown_count()
+        if remaining_cells > 0:
+            base_prob = min(max(remaining_mines / remaining_cells, 0.0), 1.0)
+            for cell in off_cells:
+                probabilities[cell] = base_prob
 
         return probabilities
 
     def auto_solve(self, allow_guess: bool = False, limit: int = 1000) -> Tuple[int, List[str]]:
         """
         Auto_solve with optional guessing.
+
+        Each step applies a whole wave of certain moves (step_batch) with
+        one Board.apply_batch, or makes one guess when there are none.
         """
         steps = 0
         log = []
 
         while steps < limit and self.board.game_state == 0:
-            move = self.get_hint()
-
-            if move:
-                for cell in move.cells:
-                    x, y = cell
-                    if move.is_mine:
-                        if self.board.get_state(x, y) != CellState.FLAGGED:
-                            self.board.flag(x, y)
-                            log.append(f"Step {steps + 1}: Flagged {cell} ({move.rule})")
-                    else:
-                        if self.board.get_state(x, y) == CellState.UNKNOWN:
-                            success, _ = self.board.open(x, y)
-                            if not success:
-                                log.append(f"Step {steps + 1}: Hint mine at {cell}!")
-                                return steps + 1, log
-                            log.append(f"Step {steps + 1}: Opened {cell} ({move.rule})")
+            moves = self.step_batch()
+
+            if moves:
+                success = self.apply_moves(moves, log, steps + 1)
+                if not success:
+                    return steps + 1, log
                 steps += 1
             else:
                 if allow_guess:
-                    guess_cell = self._select_best_guess()
+                    probs = self.compute_probabilities()
+                    guess_cell = self._select_best_guess(probs)
                     if guess_cell:
                         x, y = guess_cell
-                        probs = self.compute_probabilities()
                         prob = probs.get(guess_cell, 0.5)
                         success, _ = self.board.open(x, y)
                         if not success:
@@ -164,11 +503,57 @@ class Solver:
         return steps, log
 
     
-    def _select_best_guess(self) -> Optional[Tuple[int, int]]:
+    def apply_moves(self, moves: List[Move], log: Optional[List[str]] = None,
+                    step: int = 1) -> bool:
+        """
+        Apply a batch of moves with one Board.apply_batch, optionally logging
+        each cell. Returns False if an opened cell was a mine.
+        """
+        opens = []
+        flags = []
+        for move in moves:
+            for cell in sorted(move.cells):
+                x, y = cell
+                if move.is_mine:
+                    if self.board.get_state(x, y) != CellState.FLAGGED:
+                        flags.append(cell)
+                        if log is not None:
+                            log.append(f"Step {step}: Flagged {cell} ({move.rule})")
+                elif self.board.get_state(x, y) == CellState.UNKNOWN:
+                    opens.append(cell)
+                    if log is not None:
+                        log.append(f"Step {step}: Opened {cell} ({move.rule})")
+
+        success, revealed, _ = self.board.apply_batch(opens, flags)
+        if not success and log is not None:
+            hit = next(cell for cell in opens if cell in revealed and self.board.is_mine(*cell))
+            log.append(f"Step {step}: Hint mine at {hit}!")
+        return success
+
+    @contextmanager
+    def speculate(self, moves: List[Move]) -> Iterator[bool]:
+        """
+        Apply moves, yield whether they hit no mine, then roll the board
+        back. Rollback applies the inverse deltas, so it costs the cells
+        the moves changed rather than a copy of the grid; the frontier
+        follows both ways through the board listeners. Other action
+        listeners (an outer History, a Journal) are muted throughout, so
+        neither the moves nor the rollback reach them.
+        """
+        with self.board.muted_actions():
+            history = History(self.board)
+            try:
+                yield self.apply_moves(moves)
+            finally:
+                history.rewind()
+                history.close()
+
+    def _select_best_guess(self, probabilities: Optional[Dict[Tuple[int, int], float]] = None) -> Optional[Tuple[int, int]]:
         """
         Select cell with lowest mine probability for guessing.
         """
-        probabilities = self.compute_probabilities()
+        if probabilities is None:
+            probabilities = self.compute_probabilities()
         if not probabilities:
             for y in range(self.board.height):
                 for x in range(self.board.width):
@@ -177,64 +562,196 @@ class Solver:
             
             return None
 
-            pq = PriorityQueue()
-            for cell, prob in probabilities.items():
-                x, y = cell
-                centrality = -((x - self.board.width / 2) ** 2 + (y - self.board.height / 2) ** 2)
-                pq.push((prob, -centrality, x, y), cell)
-            
-            if not pq.is_empty():
-                _, best_cell = pq.pop()
-                return best_cell
+        pq = PriorityQueue()
+        for cell, prob in probabilities.items():
+            x, y = cell
+            centrality = -((x - self.board.width / 2) ** 2 + (y - self.board.height / 2) ** 2)
+            pq.push((prob, -centrality, x, y), cell)
+        
+        if not pq.is_empty():
+            _, best_cell = pq.pop()
+            return best_cell
 
-            return None
+        return None
 
     def _enumerate_component(self, constraints: List[Constraint], unknown_indices: Set[int], frontier: Frontier) -> Dict[int, float]:
         """
         Enumerate all satisfying assignment for a component.
         """
+        return self._count_component(constraints, unknown_indices, frontier).probabilities()
 
-        signature = compute_signature(constraints)
-        cached = self.cache.get(signature)
+    def _count_component(self, constraints: List[Constraint], unknown_indices: Set[int],
+                         frontier: Optional[Frontier] = None,
+                         deadline: Optional[float] = None) -> ComponentCounts:
+        """
+        Count solutions of a component by number of mines, with caching.
+
+        The cache is keyed by canonical signature and stores counts in
+        canonical label order; results are mapped back through the labelling.
+        A search that passes the deadline raises EnumerationTimeout and
+        caches nothing.
+        """
+        signature, order, cached = self._lookup(constraints, unknown_indices, frontier)
         if cached is not None:
-            return  cached
+            return ComponentCounts(order, *cached)
 
-        unknowns_list = sorted(unknown_indices)
-        mine_counts = {idx: 0 for idx in unknowns_list}
-        total_solutions = 0
+        counts = self._run_engine(constraints, unknown_indices, deadline)
+        if self.metrics is not None:
+            self.metrics.count("enumerated")
+            self.metrics.observe_component(len(unknown_indices))
 
-        assignment = [0] * len(unknowns_list)
-        idx_to_pos = {idx: pos for pos, idx in enumerate(unknowns_list)}
+        position = {idx: pos for pos, idx in enumerate(counts.variables)}
+        permuted = {m: [per_cell[position[idx]] for idx in order]
+                    for m, per_cell in counts.mine_counts.items()}
+        self._remember(signature, len(order), (counts.solutions, permuted))
+        return ComponentCounts(order, counts.solutions, permuted)
+
+    def _count_components(self, components: List[Tuple[List[Constraint], Set[int]]],
+                          frontier: Frontier) -> List[ComponentCounts]:
+        """
+        Count every component, in order, sending cache misses of at least
+        parallel_min unknowns to the executor.
 
+        Components are independent, so workers only need the canonical
+        signature: scopes in local labels and remaining counts. Small
+        components are counted inline while the workers run; identical
+        signatures within one call are dispatched once.
+        """
+        executor = self.executor
+        if executor is None or self.engine != "bitset":
+            return [self._count_component(constraints, unknown_indices, frontier)
+                    for constraints, unknown_indices in components]
+
+        metrics = self.metrics
+        entries: List = []
+        futures: Dict[Tuple, Future] = {}
+        sizes: Dict[Tuple, int] = {}
+        for constraints, unknown_indices in components:
+            if len(unknown_indices) < self.parallel_min:
+                entries.append(self._count_component(constraints, unknown_indices, frontier))
+                continue
+            signature, order, cached = self._lookup(constraints, unknown_indices, frontier)
+            if cached is not None:
+                entries.append(ComponentCounts(order, *cached))
+                continue
+            if signature not in futures:
+                futures[signature] = executor.submit(enumerate_local, len(order), signature[1],
+                                                     self.order, self.propagate)
+                sizes[signature] = len(order)
+                if metrics is not None:
+                    metrics.count("dispatched")
+                    metrics.count("enumerated")
+                    metrics.observe_component(len(order))
+            entries.append((signature, order))
+
+        done = {}
+        for signature, future in futures.items():
+            solutions, mine_counts, nodes, pruned = future.result()
+            done[signature] = (solutions, mine_counts)
+            self._remember(signature, sizes[signature], done[signature])
+            if metrics is not None:
+                metrics.count("nodes", nodes)
+                metrics.count("pruned", pruned)
+        return [entry if isinstance(entry, ComponentCounts) else ComponentCounts(entry[1], *done[entry[0]])
+                for entry in entries]
+
+    def _lookup(self, constraints: List[Constraint], unknown_indices: Set[int],
+                frontier: Optional[Frontier]) -> Tuple[Tuple, List[int], Optional[Tuple]]:
+        """
+        Canonical signature and labelling of a component, with its counts
+        from the cache or the store (None on a miss).
+        """
+        cells = frontier.unknowns if frontier is not None else None
+        signature, order = canonical_signature(constraints, unknown_indices, cells)
+        metrics = self.metrics
+        cached = self.cache.get(signature)
+        if metrics is not None:
+            metrics.count("cache_misses" if cached is None else "cache_hits")
+        if cached is None and self._use_store(len(order)):
+            cached = self.store.get(signature)
+            if metrics is not None:
+                metrics.count("store_misses" if cached is None else "store_hits")
+            if cached is not None:
+                self.cache.put(signature, cached)
+        return signature, order, cached
+
+    def _use_store(self, size: int) -> bool:
+        """
+        Whether components of this many unknowns go to the persistent store.
+        """
+        return self.store is not None and size >= self.store.min_unknowns
 
-        def backtrack(pos: int) -> None:
-            nonlocal total_solutions
+    def _remember(self, signature: Tuple, size: int, counts: Tuple) -> None:
+        """
+        Put counts in canonical label order into the cache and, for large
+        enough components, the store.
+        """
+        self.cache.put(signature, counts)
+        if self._use_store(size):
+            self.store.put(signature, counts)
 
+    def _run_engine(self, constraints: List[Constraint], unknown_indices: Set[int],
+                    deadline: Optional[float] = None) -> ComponentCounts:
+        """
+        Count solutions of a component with the configured engine, raising
+        EnumerationTimeout if the deadline passes.
+        """
+        if self.engine in ("bitset", "dp"):
+            if self.engine == "bitset":
+                enumerator = BitsetEnumerator(constraints, unknown_indices, self.order, self.propagate)
+            else:
+                enumerator = PathEnumerator(constraints, unknown_indices)
+            enumerator.run(deadline)
+            if self.metrics is not None:
+                self.metrics.count("nodes", enumerator.nodes)
+                self.metrics.count("pruned", enumerator.pruned)
+            return enumerator.result()
+
+        unknowns_list = variable_order(constraints, unknown_indices, self.order)
+        solutions: Dict[int, int] = {}
+        mine_counts: Dict[int, List[int]] = {}
+
+        assignment = [0] * len(unknowns_list)
+        idx_to_pos = {idx: pos for pos, idx in enumerate(unknowns_list)}
+        search = {"nodes": 0, "pruned": 0}
+
+
+        # (position to visit, value of the position before it); an explicit
+        # stack, so components deeper than the recursion limit still search
+        stack = [(0, -1)]
+        while stack:
+            pos, value = stack.pop()
+            if value >= 0:
+                assignment[pos - 1] = value
+            search["nodes"] += 1
+            if deadline is not None and not search["nodes"] & (CHECK_EVERY - 1) \
+                    and time.perf_counter() > deadline:
+                raise EnumerationTimeout()
             if pos == len(unknowns_list):
                 if self._is_valid_assignment(assignment, constraints, unknowns_list, idx_to_pos):
-                    total_solutions += 1
+                    m = sum(assignment)
+                    if m not in solutions:
+                        solutions[m] = 0
+                        mine_counts[m] = [0] * len(unknowns_list)
+                    solutions[m] += 1
                     for i, val in enumerate(assignment):
                         if val == 1:
-                            mine_counts[unknowns_list[i]] += 1
-
-                return 
+                            mine_counts[m][i] += 1
+                continue
+            children = []
             for val in [0, 1]:
                 assignment[pos] = val
                 if self._can_continue(assignment, pos, constraints, unknowns_list, idx_to_pos):
-                    backtrack(pos + 1)
-
-        backtrack(0)
+                    children.append((pos + 1, val))
+                else:
+                    search["pruned"] += 1
+            stack.extend(reversed(children))
 
-        probabilities = {}
-        if total_solutions > 0:
-            for idx in unknowns_list:
-                probabilities[idx] = mine_counts[idx] / total_solutions
-        else:
-            for idx in unknowns_list:
-                probabilities[idx] = 0.5
+        if self.metrics is not None:
+            self.metrics.count("nodes", search["nodes"])
+            self.metrics.count("pruned", search["pruned"])
 
-        self.cache.put(signature, probabilities)
-        return probabilities
+        return ComponentCounts(unknowns_list, solutions, mine_counts)
 
     def _is_valid_assignment(self, assignment: List[int], constraints: List[Constraint],
                             unknowns_list: List[int], idx_to_pos: Dict[int, int]) -> bool:
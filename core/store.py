@@ -0,0 +1,170 @@
+# persistent enumeration store shared across processes
+
+import json
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class EnumerationStore:
+    """
+    On-disk cache of component counts keyed by canonical signature.
+
+    Backed by SQLite in WAL mode, so many solver processes can read the same
+    file concurrently while others append. The store is size-bounded: once
+    it holds more than max_entries rows, the least recently used rows are
+    evicted. A meta table records FORMAT_VERSION; opening a store written
+    with another version clears it instead of returning stale results.
+
+    Values are (solutions, mine_counts) as cached by Solver._count_component.
+
+    A hit does not write: its last_used stamp is kept in memory and written
+    in one transaction by the next put, evict or close, or once TOUCH_BATCH
+    keys are waiting, so read-mostly workers rarely take the write lock.
+    """
+    FORMAT_VERSION = 1
+    EVICT_INTERVAL = 64
+    TOUCH_BATCH = 256
+
+    def __init__(self, path: str, max_entries: int = 100_000, min_unknowns: int = 8):
+        """
+        Open (or create) the store at path.
+        min_unknowns: smaller components are cheaper to enumerate than to look up.
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.path = path
+        self.max_entries = max_entries
+        self.min_unknowns = min_unknowns
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._touched: Dict[str, float] = {}
+
+        self.conn = sqlite3.connect(path, timeout=30.0, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS results ("
+                          "signature TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        self._check_version()
+
+    def _check_version(self) -> None:
+        """
+        Clear the store if it was written with a different format version.
+        """
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is not None and row[0] == str(EnumerationStore.FORMAT_VERSION):
+            return
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute("DELETE FROM results")
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                              (str(EnumerationStore.FORMAT_VERSION),))
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _key(signature: Tuple) -> str:
+        """
+        Serialize a canonical signature (nested tuples of ints) to a text key.
+        """
+        return repr(signature)
+
+    @staticmethod
+    def _encode(value: Tuple[Dict[int, int], Dict[int, List[int]]]) -> str:
+        """
+        Serialize (solutions, mine_counts) to JSON.
+        """
+        solutions, mine_counts = value
+        return json.dumps([[m, count, mine_counts[m]] for m, count in solutions.items()])
+
+    @staticmethod
+    def _decode(text: str) -> Tuple[Dict[int, int], Dict[int, List[int]]]:
+        """
+        Parse JSON written by _encode.
+        """
+        solutions = {}
+        mine_counts = {}
+        for m, count, per_cell in json.loads(text):
+            solutions[m] = count
+            mine_counts[m] = per_cell
+        return solutions, mine_counts
+
+    def get(self, signature: Tuple) -> Optional[Any]:
+        """
+        Get stored counts for signature, marking them as recently used
+        (written by the next flush). Return None if not found.
+        """
+        key = EnumerationStore._key(signature)
+        row = self.conn.execute("SELECT value FROM results WHERE signature = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touched[key] = time.time()
+        if len(self._touched) >= EnumerationStore.TOUCH_BATCH:
+            self.flush()
+        return EnumerationStore._decode(row[0])
+
+    def flush(self) -> None:
+        """
+        Write the last_used stamps of hits since the previous flush.
+        """
+        if not self._touched:
+            return
+        touched = [(stamp, key) for key, stamp in self._touched.items()]
+        self._touched = {}
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.executemany("UPDATE results SET last_used = ? WHERE signature = ?", touched)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def put(self, signature: Tuple, value: Tuple[Dict[int, int], Dict[int, List[int]]]) -> None:
+        """
+        Store counts for signature, evicting least recently used rows when over capacity.
+        """
+        self.flush()
+        self.conn.execute("INSERT OR REPLACE INTO results (signature, value, last_used) VALUES (?, ?, ?)",
+                          (EnumerationStore._key(signature), EnumerationStore._encode(value), time.time()))
+        self._puts += 1
+        if self._puts % EnumerationStore.EVICT_INTERVAL == 0 or self.max_entries < EnumerationStore.EVICT_INTERVAL:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Trim the store to max_entries rows. Returns number of rows removed.
+        """
+        self.flush()
+        excess = len(self) - self.max_entries
+        if excess <= 0:
+            return 0
+        self.conn.execute("DELETE FROM results WHERE signature IN ("
+                          "SELECT signature FROM results ORDER BY last_used LIMIT ?)", (excess,))
+        return excess
+
+    def clear(self) -> None:
+        """
+        Remove all stored results.
+        """
+        self._touched = {}
+        self.conn.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        """
+        Write pending last_used stamps and close the database connection.
+        """
+        self.flush()
+        self.conn.close()
+
+    def __len__(self) -> int:
+        """
+        Return number of stored results.
+        """
+        return self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
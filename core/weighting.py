@@ -0,0 +1,89 @@
+# global mine-count weighting across components
+
+import math
+from typing import Dict, List, Optional, Tuple
+from .enumeration import ComponentCounts
+
+
+class MineCountWeighting:
+    """
+    Exact probabilities under the global mine count.
+
+    A full-board solution picks one solution per component (m_i mines each)
+    and places the remaining R - Σ m_i mines among the N unconstrained cells,
+    so it has weight C(N, R - Σ m_i). Component mine-count distributions are
+    convolved with exact integers; weights are combined in log space so huge
+    boards do not overflow.
+    """
+
+    @staticmethod
+    def log_comb(n: int, r: int) -> float:
+        """
+        log C(n, r), -inf when r is out of range.
+        """
+        if r < 0 or r > n:
+            return -math.inf
+        return math.lgamma(n + 1) - math.lgamma(r + 1) - math.lgamma(n - r + 1)
+
+    @staticmethod
+    def convolve(a: Dict[int, int], b: Dict[int, int]) -> Dict[int, int]:
+        """
+        Distribution of total mines for two independent mine-count distributions.
+        """
+        result: Dict[int, int] = {}
+        for ma, wa in a.items():
+            for mb, wb in b.items():
+                result[ma + mb] = result.get(ma + mb, 0) + wa * wb
+        return result
+
+    @staticmethod
+    def combine(components: List[ComponentCounts], off_cells: int,
+                remaining_mines: int) -> Optional[Tuple[List[Dict[int, float]], float]]:
+        """
+        Weight component solutions by the ways to place the rest of the mines.
+
+        Returns:
+         (per-component {frontier index: probability}, probability for each
+         unconstrained cell), or None if no solution fits the mine count.
+        """
+        n = len(components)
+        prefix = [{0: 1}]
+        for comp in components:
+            prefix.append(MineCountWeighting.convolve(prefix[-1], comp.solutions))
+        suffix = [{0: 1}]
+        for comp in reversed(components):
+            suffix.append(MineCountWeighting.convolve(suffix[-1], comp.solutions))
+        suffix.reverse()
+
+        def log_weight(t: int) -> float:
+            return MineCountWeighting.log_comb(off_cells, remaining_mines - t)
+
+        totals = prefix[n]
+        logs = {t: math.log(w) + log_weight(t) for t, w in totals.items()}
+        shift = max(logs.values(), default=-math.inf)
+        if shift == -math.inf:
+            return None
+
+        terms = {t: math.exp(v - shift) for t, v in logs.items()}
+        z = sum(terms.values())
+
+        component_probs = []
+        for i, comp in enumerate(components):
+            others = MineCountWeighting.convolve(prefix[i], suffix[i + 1])
+            weighted = [0.0] * len(comp.variables)
+            for m, counts in comp.mine_counts.items():
+                w_m = sum(math.exp(math.log(w) + log_weight(t + m) - shift)
+                          for t, w in others.items())
+                if w_m == 0.0:
+                    continue
+                for pos, c in enumerate(counts):
+                    weighted[pos] += w_m * c
+            component_probs.append({idx: weighted[pos] / z
+                                    for pos, idx in enumerate(comp.variables)})
+
+        off_prob = 0.0
+        if off_cells > 0:
+            expected = sum(term * (remaining_mines - t) for t, term in terms.items()) / z
+            off_prob = expected / off_cells
+
+        return component_probs, off_prob
@@ -0,0 +1,167 @@
+# self-play benchmark: python -m minemind bench
+#-----------------------------------------------
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Tuple
+
+from core.rng import RNG
+from core.board import Board, GameState
+from core.solver import Solver
+from core.metrics import SolverMetrics
+
+PRESETS: Dict[str, Tuple[int, int, int]] = {
+    "beginner": (9, 9, 10),
+    "intermediate": (16, 16, 40),
+    "expert": (30, 16, 99),
+}
+
+MOVE_LIMIT = 10_000
+
+
+def play_game(task: Tuple[int, int, int, int, int]) -> Dict:
+    """
+    Play one seeded game with guessing enabled and time every move.
+
+    task: (width, height, mines, seed, k_max). A move is one
+    auto_solve step: a wave of certain moves or a guess.
+    """
+    width, height, mines, seed, k_max = task
+    board = Board(width, height, mines, RNG(seed))
+    metrics = SolverMetrics()
+    solver = Solver(board, k_max=k_max, metrics=metrics)
+
+    latencies: List[float] = []
+    start = time.perf_counter()
+    while board.game_state == GameState.PLAYING and len(latencies) < MOVE_LIMIT:
+        t0 = time.perf_counter()
+        steps, _ = solver.auto_solve(allow_guess=True, limit=1)
+        latencies.append(time.perf_counter() - t0)
+        if steps == 0:
+            break
+
+    return {
+        "seed": seed,
+        "state": board.game_state,
+        "elapsed": time.perf_counter() - start,
+        "latencies": latencies,
+        "metrics": metrics,
+    }
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(results: List[Dict], wall_time: float) -> Dict:
+    """
+    Aggregate per-game results into the report dict.
+    """
+    games = len(results)
+    wins = sum(1 for r in results if r["state"] == GameState.WON)
+    losses = sum(1 for r in results if r["state"] == GameState.LOST)
+    latencies = sorted(t for r in results for t in r["latencies"])
+
+    totals = SolverMetrics()
+    for r in results:
+        totals.merge(r["metrics"])
+    phases = totals.phase_time
+    phase_total = sum(phases.values())
+
+    return {
+        "games": games,
+        "wins": wins,
+        "losses": losses,
+        "unfinished": games - wins - losses,
+        "win_rate": wins / games if games else 0.0,
+        "wall_time_s": wall_time,
+        "games_per_sec": games / wall_time if wall_time > 0 else 0.0,
+        "moves": len(latencies),
+        "move_latency_ms": {
+            "median": percentile(latencies, 0.5) * 1000,
+            "p99": percentile(latencies, 0.99) * 1000,
+            "max": (latencies[-1] if latencies else 0.0) * 1000,
+        },
+        "phase_time_s": phases,
+        "phase_share": {name: (seconds / phase_total if phase_total > 0 else 0.0)
+                        for name, seconds in phases.items()},
+        "counters": totals.counters,
+        "cache_hit_rate": totals.cache_hit_rate(),
+    }
+
+
+def run_bench(width: int, height: int, mines: int, games: int, seed: int = 0,
+              workers: int = 1, k_max: int = 28) -> Dict:
+    """
+    Play `games` games with seeds seed..seed+games-1 and summarize.
+
+    workers > 1 spreads games over a process pool; results do not depend
+    on the worker count since every game has its own seed.
+    """
+    tasks = [(width, height, mines, seed + i, k_max) for i in range(games)]
+    start = time.perf_counter()
+    if workers > 1:
+        with Pool(workers) as pool:
+            results = pool.map(play_game, tasks, chunksize=max(1, games // (workers * 4)))
+    else:
+        results = [play_game(task) for task in tasks]
+    wall_time = time.perf_counter() - start
+    return summarize(results, wall_time)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Parse bench arguments, run the games and print the JSON report.
+    """
+    parser = argparse.ArgumentParser(prog="minemind bench", description="Self-play solver benchmark")
+    parser.add_argument('preset', nargs='?', default='beginner',
+                        choices=sorted(PRESETS) + ['custom'], help='Board preset')
+    parser.add_argument('--games', type=int, default=100, help='Number of games')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the first game')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    parser.add_argument('--k-max', type=int, default=28, help='Solver k_max')
+    parser.add_argument('--w', type=int, default=None, help='Board width (custom)')
+    parser.add_argument('--h', type=int, default=None, help='Board height (custom)')
+    parser.add_argument('--mines', type=int, default=None, help='Number of mines (custom)')
+    parser.add_argument('--out', default=None, help='Also write the JSON report to this file')
+    args = parser.parse_args(argv)
+
+    if args.preset == 'custom':
+        if args.w is None or args.h is None or args.mines is None:
+            parser.error("custom preset needs --w, --h and --mines")
+        width, height, mines = args.w, args.h, args.mines
+    else:
+        width, height, mines = PRESETS[args.preset]
+
+    report = {
+        "preset": args.preset,
+        "width": width,
+        "height": height,
+        "mines": mines,
+        "seed": args.seed,
+        "workers": args.workers,
+        "k_max": args.k_max,
+    }
+    report.update(run_bench(width, height, mines, args.games, args.seed, args.workers, args.k_max))
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text + "\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
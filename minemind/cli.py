@@ -5,11 +5,19 @@ import sys
 from typing import Optional
 
 from core.rng import RNG
-from core.board import Board, GameState
+from core.board import Action, Board, GameState
+from core.flat_board import FlatBoard
 from core.solver import Solver
+from core.metrics import SolverMetrics
+from core.sampling import SamplingBudget
 from core.snapshot import Snapshot
+from core.journal import Journal, JournalReader
+from core.history import History
 from .render import Renderer
 
+# largest board (in cells) printed automatically after load/replay
+SHOW_CELLS = 40_000
+
 class CommandHandlers:
     """
     Handles user commands and game interaction.
@@ -20,8 +28,21 @@ class CommandHandlers:
         """
         self.board: Optional[Board] = None
         self.solver: Optional[Solver]= None
+        self.metrics: Optional[SolverMetrics] = None
+        self.sampling: Optional[SamplingBudget] = None
+        self.journal: Optional[Journal] = None
+        self.history: Optional[History] = None
         self.running = True
 
+    def _solver(self) -> Optional[Solver]:
+        """
+        Solver for the current board, built on the first solver command:
+        its frontier scans the whole board, which a mapped load avoids.
+        """
+        if self.board is not None and self.solver is None:
+            self.solver = Solver(self.board, metrics=self.metrics, sampling=self.sampling)
+        return self.solver
+
     def run(self, args=None):
         """
         Start REPL, optionally with initial new command.
@@ -55,6 +76,7 @@ class CommandHandlers:
         cmd = parts[0].lower()
 
         if cmd in ['quit', 'exit']:
+            self._close_journal()
             self.running = False
             print("Goodbye!")
         
@@ -96,8 +118,14 @@ class CommandHandlers:
             except ValueError:
                 print("Invalid Input")
 
+        elif cmd == 'undo':
+            self._cmd_undo()
+
+        elif cmd == 'redo':
+            self._cmd_redo()
+
         elif cmd == 'hint':
-            self._cmd_hint()
+            self._cmd_hint(self._budget(parts))
         
         elif cmd == 'step':
             self._cmd_step()
@@ -114,22 +142,52 @@ class CommandHandlers:
             self._cmd_auto(allow_guess, limit)
         
         elif cmd == 'prob':
-            self._cmd_prob()
+            self._cmd_prob(self._budget(parts))
 
         elif cmd == 'frontier':
             self._cmd_frontier()
 
+        elif cmd == 'stats':
+            self._cmd_stats(parts[1].lower() if len(parts) > 1 else None)
+
+        elif cmd == 'sample':
+            self._cmd_sample(parts[1].lower() if len(parts) > 1 else None)
+
         elif cmd == 'save':
             if len(parts) < 2:
                 print("Usage: save PATH")
                 return
-            self._cmd_save(parts[1])
+            self._cmd_save(parts[1], '--raw' in parts[2:])
 
         elif cmd == 'load':
             if len(parts) < 2:
                 print("Usage load PATH")
                 return
-            self._cmd_load(parts[1])
+            self._cmd_load(parts[1], '--compact' in parts[2:], '--mapped' in parts[2:])
+
+        elif cmd == 'journal':
+            if len(parts) < 2:
+                print("Usage: journal PATH [--every N] | journal off")
+                return
+            every = 1000
+            for i, p in enumerate(parts):
+                if p == '--every' and i + 1 < len(parts):
+                    try:
+                        every = int(parts[i + 1])
+                    except ValueError:
+                        pass
+            self._cmd_journal(parts[1], every)
+
+        elif cmd == 'replay':
+            if len(parts) < 2:
+                print("Usage: replay PATH [N]")
+                return
+            try:
+                upto = int(parts[2]) if len(parts) > 2 else None
+            except ValueError:
+                print("Invalid Input")
+                return
+            self._cmd_replay(parts[1], upto)
 
         else:
             print(f"Unknown command: {cmd}. type 'help' for commands.")
@@ -142,25 +200,39 @@ class CommandHandlers:
         print("""
 Commands:
     help                                             - List commands
-    new --w W --h H --mines M [--seed S]             - Start a new game
+    new --w W --h H --mines M [--seed S] [--compact] [--lazy]
+                                                     - Start a new game; --compact uses
+    flat buffers for large boards, --lazy also computes counts on first read
     show [--reveal]                                  - Print board; --reveal shows mines
     (debug/after loss)
     open X Y                                         - Reveal cell at (X,Y)
     flag X Y                                         - Toggle flag at (X, Y)
     chord X Y                                        - On a revealed number: if flags match,
     reveal remaining neighbors
-    hint                                             - Print one certain safe/mine move with
-    explanation
-    step                                             - Apply one deterministic solver step; or
-    exact small-component ste
+    undo | redo                                      - Undo/redo the last open, flag, chord,
+    step wave or auto step
+    hint [--budget MS]                               - Print one certain safe/mine move with
+    explanation; --budget enumerates smallest-first for MS milliseconds, past k_max
+    step                                             - Apply every currently certain move (rules
+    to a fixpoint, exact small components) in one wave
     auto [--guess] [--limit N]                       - Run solver up to N steps; --guess
     allows lowest-risk guesse
-    prob                                             - Print coarse ASCII probability heatmap
-    for unknown cell
+    prob [--budget MS]                               - Print coarse ASCII probability heatmap
+    for unknown cell; --budget as for hint, then reports exact vs estimated components
     frontier                                         - Summary: #components, sizes, unknowns
     per componen
-    save path.json                                   - Snapshot game state to JSON
-    load path.json                                   - Restore snapshot from JSON 
+    stats [on|off|reset]                             - Solver metrics: phase times, search
+    nodes, cache hits, component sizes
+    sample [MS|off]                                  - Estimate components above k_max in
+    prob/auto by sampling, MS milliseconds each (default 50)
+    save PATH [--raw]                                - Snapshot game state; JSON for *.json,
+    otherwise compressed binary; --raw writes the mappable layout
+    load PATH [--compact|--mapped]                   - Restore a JSON or binary snapshot;
+    --compact loads into a FlatBoard, --mapped maps a raw snapshot
+    journal PATH [--every N] | journal off           - Autosave: append every action to a
+    journal, with a full checkpoint every N actions
+    replay PATH [N]                                  - Rebuild the journaled game after N
+    actions (default: all)
     quit | exit                                      - Exit program
         
         """)
@@ -169,6 +241,8 @@ Commands:
         Parse new command arguments.
         """
         width, height, mines, seed = 9, 9, 10, None
+        compact = False
+        lazy = False
         i = 0
         while i < len(args):
             if args[i] == '--w' and i + 1 < len(args):
@@ -183,17 +257,31 @@ Commands:
             elif args[i] == '--seed'  and i + 1 < len(args):
                 seed = int(args[i + 1])
                 i += 2
+            elif args[i] == '--compact':
+                compact = True
+                i += 1
+            elif args[i] == '--lazy':
+                lazy = True
+                i += 1
             else:
                 i += 1
-        self._cmd_new(width, height, mines, seed)
+        self._cmd_new(width, height, mines, seed, compact, lazy)
     
-    def _cmd_new(self, width: int, height: int, mines: int, seed: Optional[int]):
+    def _cmd_new(self, width: int, height: int, mines: int, seed: Optional[int], compact: bool = False,
+                 lazy: bool = False):
         """
-        Create new game
+        Create new game; lazy implies compact.
         """
+        self._close_journal()
         rng = RNG(seed)
-        self.board = Board(width, height, mines, rng)
-        self.solver = Solver(self.board)
+        if lazy:
+            self.board = FlatBoard(width, height, mines, rng, lazy_counts=True)
+        elif compact:
+            self.board = FlatBoard(width, height, mines, rng)
+        else:
+            self.board = Board(width, height, mines, rng)
+        self._drop_solver()
+        self.history = History(self.board)
         print(f"New game: {width}X{height}, {mines} mines" + 
         (f", seed={seed}" if seed is not None else ""))
 
@@ -212,6 +300,16 @@ Commands:
         elif self.board.game_state == GameState.LOST:
             print("\n💥 GAME OVER 💥")
 
+    def _show_if_small(self):
+        """
+        Show the board after a load unless it has more than SHOW_CELLS
+        cells, whose rendering would read every cell.
+        """
+        if self.board.width * self.board.height <= SHOW_CELLS:
+            self._cmd_show()
+        else:
+            print(f"Board is {self.board.width}x{self.board.height}; use 'show' to print it")
+
     def _cmd_open(self, x: int, y: int):
         """
         open cell
@@ -257,43 +355,104 @@ Commands:
         else:
             print("Chord conditions not met or invalid cell")
 
-    def _cmd_hint(self):
+    def _cmd_undo(self):
+        """
+        Undo the last board call (open, flag, chord or solver wave).
+        """
+        if not self.history:
+            print("No active game.")
+            return
+        delta = self.history.undo()
+        if delta is None:
+            print("Nothing to undo.")
+            return
+        print(f"Undid {self._describe(delta)}")
+        self._cmd_show()
+
+    def _cmd_redo(self):
+        """
+        Redo the last undone board call.
+        """
+        if not self.history:
+            print("No active game.")
+            return
+        delta = self.history.redo()
+        if delta is None:
+            print("Nothing to redo.")
+            return
+        print(f"Redid {self._describe(delta)}")
+        self._cmd_show()
+
+    @staticmethod
+    def _describe(delta) -> str:
+        """
+        Short text for the call behind a delta.
+        """
+        names = {Action.OPEN: "open", Action.FLAG: "flag", Action.CHORD: "chord"}
+        if len(delta.actions) == 1:
+            action, x, y = delta.actions[0]
+            text = f"{names[action]} ({x}, {y})"
+        else:
+            text = f"{len(delta.actions)} moves"
+        return f"{text}, {len(delta)} cells"
+
+    @staticmethod
+    def _budget(parts) -> Optional[float]:
+        """
+        Seconds from a '--budget MS' option, or None.
+        """
+        for i, p in enumerate(parts):
+            if p == '--budget' and i + 1 < len(parts):
+                try:
+                    return float(parts[i + 1]) / 1000
+                except ValueError:
+                    pass
+        return None
+
+    def _print_status(self):
+        """
+        One line counting components by how the solver handled them.
+        """
+        methods = {}
+        for status in self.solver.status:
+            methods[status.method] = methods.get(status.method, 0) + 1
+        if methods:
+            print("Components: " + ", ".join(f"{n} {method}" for method, n in methods.items()))
+
+    def _cmd_hint(self, budget: Optional[float] = None):
         """
         Get hint from solver.
         """
-        if not self.board or not self.solver:
+        if not self.board or not self._solver():
             print("No active game.")
             return
 
-        move = self.solver.get_hint()
+        move = self.solver.get_hint(budget)
         if move:
             action = "MINE" if move.is_mine else "SAFE"
             cells_str = ", ".join(str(c) for c in sorted(move.cells))
             print(f"{action}: {cells_str} - {move.explanation}")
         else:
             print("No certain moves found")
+        if budget is not None:
+            self._print_status()
 
     def _cmd_step(self):
         """
-        Apply one solver step.
+        Apply one wave of certain solver moves.
         """
-        if not self.board or not self.solver:
+        if not self.board or not self._solver():
             print("No active game.")
             return
 
-        result = self.solver.step()
-        if result:
-            move, cells = result
-            action = "Flagged" if move.is_mine else "Opened"
-            cells_str = ", ".join(str(c) for c in sorted(cells))
-            print(f"Applied {move.rule}: {action} {cells_str}")
-
-            for cell in cells:
-                x, y = cell
-                if move.is_mine:
-                    self.board.flag(x, y)
-                else:
-                    self.board.open(x, y)
+        moves = self.solver.step_batch()
+        if moves:
+            for move in moves:
+                action = "Flagged" if move.is_mine else "Opened"
+                cells_str = ", ".join(str(c) for c in sorted(move.cells))
+                print(f"Applied {move.rule}: {action} {cells_str}")
+
+            self.solver.apply_moves(moves)
             self._cmd_show()
         else:
             print("No certain moves available.")
@@ -302,7 +461,7 @@ Commands:
         """
         Auto solve
         """
-        if not self.board or not self.solver:
+        if not self.board or not self._solver():
             print("No Active game.")
             return
             
@@ -314,55 +473,168 @@ Commands:
         
         self._cmd_show()
 
-    def _cmd_prob(self):
+    def _cmd_prob(self, budget: Optional[float] = None):
         """
         Show probability heatmap.
         """
-        if not self.board or not self.solver:
+        if not self.board or not self._solver():
             print("No active game.")
             return
 
-        probs = self.solver.compute_probabilities()
+        probs = self.solver.compute_probabilities(budget)
         print(Renderer.render_probabilities(self.board, probs))
+        intervals = self.solver.intervals
+        if intervals:
+            widest = max(high - low for low, high in intervals.values())
+            print(f"Sampled: {len(intervals)} cells, widest 95% interval {widest:.2f}")
+        if budget is not None:
+            self._print_status()
         
     def _cmd_frontier(self):
         """
         Show frontier component summary.
         """
-        if not self.board or not self.solver:
+        if not self.board or not self._solver():
             print("No active game.")
             return
 
-        from core.frontier import Frontier
-        frontier = Frontier(self.board)
+        frontier = self.solver.frontier
+        frontier.refresh()
         components = frontier.get_components()
 
-        print(f"Frontier: {len(components)} components, {len(frontier.unknowns)} unknown")
+        print(f"Frontier: {len(components)} components, {len(frontier.unknowns)} unknown"
+              f" ({frontier.unknown_count()} unknown on board)")
         for i,(constraints, unknowns) in enumerate(components):
             print(f" Component {i + 1}: {len(constraints)} constraints, {len(unknowns)} unknown")
     
-    def _cmd_save(self, filepath: str):
+    def _cmd_stats(self, action: Optional[str] = None):
+        """
+        Show solver metrics, or turn collection on/off/reset.
+        """
+        if action == 'on':
+            if self.metrics is None:
+                self.metrics = SolverMetrics()
+            if self.solver:
+                self.solver.metrics = self.metrics
+            print("Metrics enabled")
+        elif action == 'off':
+            self.metrics = None
+            if self.solver:
+                self.solver.metrics = None
+            print("Metrics disabled")
+        elif action == 'reset':
+            if self.metrics is not None:
+                self.metrics.reset()
+            print("Metrics reset")
+        elif action is not None:
+            print("Usage: stats [on|off|reset]")
+        elif self.metrics is None:
+            print("Metrics are off; use 'stats on'")
+        else:
+            print(self.metrics.format())
+
+    def _cmd_sample(self, action: Optional[str] = None):
+        """
+        Turn sampling of components above k_max on (with a per-component
+        budget in milliseconds) or off.
+        """
+        if action == 'off':
+            self.sampling = None
+            print("Sampling disabled")
+        else:
+            try:
+                ms = 50.0 if action is None else float(action)
+            except ValueError:
+                print("Usage: sample [MS|off]")
+                return
+            self.sampling = SamplingBudget(seconds=ms / 1000)
+            print(f"Sampling components above k_max, {ms:g} ms each")
+        if self.solver:
+            self.solver.sampling = self.sampling
+
+    def _cmd_save(self, filepath: str, raw: bool = False):
         """
         Save game to file.
         """
         if not self.board:
             print("No Active game.")
             return
-        Snapshot.save(self.board, filepath)
+        if filepath.endswith('.json') and not raw:
+            Snapshot.save(self.board, filepath)
+        else:
+            Snapshot.save_binary(self.board, filepath, raw=raw)
         print(f"Saved to {filepath}")
 
-    def _cmd_load(self, filepath: str):
+    def _cmd_load(self, filepath: str, compact: bool = False, mapped: bool = False):
         """
         Load game from file.
         """
+        self._close_journal()
         try:
-            self.board = Snapshot.load(filepath)
-            self.solver = Solver(self.board)
+            if mapped:
+                self.board = Snapshot.open_mapped(filepath)
+            else:
+                self.board = Snapshot.load(filepath, compact=compact)
+            self._drop_solver()
+            self.history = History(self.board)
             print(f"Loaded from {filepath}")
-            self._cmd_show()
+            self._show_if_small()
         except Exception as e:
             print(f"Failed to load: {e}")
 
+    def _cmd_journal(self, filepath: str, every: int = 1000):
+        """
+        Start journaling every action of the current game to filepath
+        (autosave), or stop with 'off'.
+        """
+        if filepath.lower() == 'off':
+            if self._close_journal():
+                print("Journal closed")
+            else:
+                print("No journal open")
+            return
+        if not self.board:
+            print("No active game.")
+            return
+        self._close_journal()
+        self.journal = Journal(self.board, filepath, every)
+        print(f"Journaling to {filepath} (checkpoint every {every} actions)")
+
+    def _cmd_replay(self, filepath: str, upto: Optional[int] = None):
+        """
+        Load the game recorded in a journal, after the first upto actions.
+        """
+        self._close_journal()
+        try:
+            reader = JournalReader(filepath)
+            self.board = reader.board_at(upto)
+            self._drop_solver()
+            self.history = History(self.board)
+            shown = len(reader) if upto is None else upto
+            print(f"Replayed {shown} of {len(reader)} actions from {filepath}")
+            self._show_if_small()
+        except Exception as e:
+            print(f"Failed to replay: {e}")
+
+    def _drop_solver(self) -> None:
+        """
+        Close the solver of the previous board; the next solver command
+        builds one for the current board.
+        """
+        if self.solver is not None:
+            self.solver.close()
+            self.solver = None
+
+    def _close_journal(self) -> bool:
+        """
+        Close the open journal, if any; True when one was closed.
+        """
+        if self.journal is None:
+            return False
+        self.journal.close()
+        self.journal = None
+        return True
+
 
 def main():
     """
@@ -370,6 +642,13 @@ def main():
     """
     import argparse
 
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        from .bench import main as bench_main
+        sys.exit(bench_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == 'corpus':
+        from .corpus import main as corpus_main
+        sys.exit(corpus_main(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(description="MineMind - CLI Minesweeper with Solver")
     parser.add_argument('command', nargs='?', default=None, help='Command to execute')
     parser.add_argument('--w', type=int, default=9, help='Board width')
@@ -0,0 +1,222 @@
+# frontier component corpus: python -m minemind corpus
+#-----------------------------------------------------
+
+import argparse
+import struct
+import sys
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from core.board import Board, CellState, GameState
+from core.frontier import Constraint, Frontier
+from core.rng import RNG
+from core.solver import Solver
+from .bench import PRESETS
+
+MAGIC = b"MMCP"
+VERSION = 1
+
+# magic, version, number of components
+HEADER = struct.Struct('<4sHI')
+# seed, unknowns, constraints
+ENTRY = struct.Struct('<IHH')
+
+OFFSETS = tuple((dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dx or dy)
+
+
+@dataclass
+class CorpusEntry:
+    """
+    One frontier component, detached from its board.
+
+    seed: seed of the game it came from
+    unknowns: cells of the component unknowns; local label = list position
+    constraints: scope masks over local labels, cells and remaining as on the board
+    """
+    seed: int
+    unknowns: List[Tuple[int, int]]
+    constraints: List[Constraint]
+
+    @property
+    def unknown_indices(self) -> Set[int]:
+        """
+        Local labels, in the form Solver and the engines take.
+        """
+        return set(range(len(self.unknowns)))
+
+    def mask_to_cells(self, mask: int) -> Set[Tuple[int, int]]:
+        """
+        Cells of a local scope mask, as Frontier.mask_to_cells for the rules.
+        """
+        cells = set()
+        while mask:
+            low = mask & -mask
+            cells.add(self.unknowns[low.bit_length() - 1])
+            mask ^= low
+        return cells
+
+    @staticmethod
+    def from_component(seed: int, frontier: Frontier, constraints: List[Constraint],
+                       unknown_indices: Set[int]) -> "CorpusEntry":
+        """
+        Relabel a component of frontier to 0..k-1 in frontier index order.
+        """
+        order = sorted(unknown_indices)
+        label = {idx: pos for pos, idx in enumerate(order)}
+        local = []
+        for c in constraints:
+            scope = 0
+            mask = c.scope_mask
+            while mask:
+                low = mask & -mask
+                scope |= 1 << label[low.bit_length() - 1]
+                mask ^= low
+            local.append(Constraint(c.cell, scope, c.remaining))
+        return CorpusEntry(seed, [frontier.unknowns[idx] for idx in order], local)
+
+
+class Corpus:
+    """
+    Save and load component corpora.
+
+    Layout: a fixed HEADER, then one zlib stream of entries. Each entry is
+    ENTRY, the unknown cells as (x, y) pairs and the constraints as
+    (x, y, remaining) triples, all little-endian uint16. Scopes are not
+    stored: a constraint's scope is its neighbours among the unknowns, since
+    every unknown neighbour of a revealed number is in that number's scope
+    and therefore in its component.
+    """
+
+    @staticmethod
+    def dumps(entries: List[CorpusEntry]) -> bytes:
+        """
+        Encode entries.
+        """
+        parts = []
+        for entry in entries:
+            parts.append(ENTRY.pack(entry.seed, len(entry.unknowns), len(entry.constraints)))
+            values = [v for cell in entry.unknowns for v in cell]
+            values += [v for c in entry.constraints for v in (*c.cell, c.remaining)]
+            parts.append(struct.pack(f'<{len(values)}H', *values))
+        return HEADER.pack(MAGIC, VERSION, len(entries)) + zlib.compress(b"".join(parts), 9)
+
+    @staticmethod
+    def loads(data: bytes) -> List[CorpusEntry]:
+        """
+        Decode entries, rebuilding scope masks from cell geometry.
+        """
+        if len(data) < HEADER.size:
+            raise ValueError("Truncated corpus header")
+        magic, version, count = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a component corpus")
+        if version != VERSION:
+            raise ValueError(f"Unsupported corpus version {version}")
+
+        body = zlib.decompress(data[HEADER.size:])
+        entries = []
+        offset = 0
+        for _ in range(count):
+            seed, k, c = ENTRY.unpack_from(body, offset)
+            offset += ENTRY.size
+            values = struct.unpack_from(f'<{2 * k + 3 * c}H', body, offset)
+            offset += 2 * (2 * k + 3 * c)
+            unknowns = [(values[2 * i], values[2 * i + 1]) for i in range(k)]
+            label = {cell: pos for pos, cell in enumerate(unknowns)}
+            constraints = []
+            for j in range(2 * k, 2 * k + 3 * c, 3):
+                x, y, remaining = values[j:j + 3]
+                scope = 0
+                for dx, dy in OFFSETS:
+                    pos = label.get((x + dx, y + dy))
+                    if pos is not None:
+                        scope |= 1 << pos
+                constraints.append(Constraint((x, y), scope, remaining))
+            entries.append(CorpusEntry(seed, unknowns, constraints))
+        if offset != len(body):
+            raise ValueError("Corpus payload does not match its header")
+        return entries
+
+    @staticmethod
+    def save(entries: List[CorpusEntry], filepath: str) -> None:
+        """
+        Write entries to a corpus file.
+        """
+        with open(filepath, 'wb') as f:
+            f.write(Corpus.dumps(entries))
+
+    @staticmethod
+    def load(filepath: str) -> List[CorpusEntry]:
+        """
+        Read a corpus file.
+        """
+        with open(filepath, 'rb') as f:
+            return Corpus.loads(f.read())
+
+
+def extract(width: int, height: int, mines: int, games: int, seed: int = 0) -> List[CorpusEntry]:
+    """
+    Play seeded games and collect every component the solver sees.
+
+    Each game opens the centre and plays step_batch waves; every component
+    of every wave is recorded, whether the rules, enumeration or nothing
+    decides it. When the solver is stuck a random safe cell is opened, so
+    games run to the end and the corpus does not depend on guessing.
+    """
+    entries = []
+    for game_seed in range(seed, seed + games):
+        rng = RNG(game_seed)
+        board = Board(width, height, mines, rng)
+        board.open(width // 2, height // 2)
+        solver = Solver(board)
+        while board.game_state == GameState.PLAYING:
+            moves = solver.step_batch()
+            frontier = solver.frontier
+            for constraints, unknown_indices in frontier.get_components():
+                entries.append(CorpusEntry.from_component(game_seed, frontier, constraints, unknown_indices))
+            if moves:
+                solver.apply_moves(moves)
+                continue
+            safe = [(x, y) for y in range(height) for x in range(width)
+                    if board.get_state(x, y) == CellState.UNKNOWN and not board.is_mine(x, y)]
+            if not safe:
+                break
+            board.open(*rng.choice(safe))
+    return entries
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Parse corpus arguments, extract components and write the corpus file.
+    """
+    parser = argparse.ArgumentParser(prog="minemind corpus", description="Frontier component corpus")
+    parser.add_argument('out', help='Corpus file to write')
+    parser.add_argument('preset', nargs='?', default='expert',
+                        choices=sorted(PRESETS) + ['custom'], help='Board preset')
+    parser.add_argument('--games', type=int, default=50, help='Number of games')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the first game')
+    parser.add_argument('--w', type=int, default=None, help='Board width (custom)')
+    parser.add_argument('--h', type=int, default=None, help='Board height (custom)')
+    parser.add_argument('--mines', type=int, default=None, help='Number of mines (custom)')
+    args = parser.parse_args(argv)
+
+    if args.preset == 'custom':
+        if args.w is None or args.h is None or args.mines is None:
+            parser.error("custom preset needs --w, --h and --mines")
+        width, height, mines = args.w, args.h, args.mines
+    else:
+        width, height, mines = PRESETS[args.preset]
+
+    entries = extract(width, height, mines, args.games, args.seed)
+    Corpus.save(entries, args.out)
+    sizes: Dict[int, int] = {}
+    for entry in entries:
+        sizes[len(entry.unknowns)] = sizes.get(len(entry.unknowns), 0) + 1
+    print(f"{len(entries)} components from {args.games} games of {width}x{height}/{mines}"
+          f" -> {args.out} (largest {max(sizes, default=0)} unknowns)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
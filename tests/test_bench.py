@@ -0,0 +1,37 @@
+# Tests for the self-play benchmark harness.
+
+from core.board import GameState
+from minemind.bench import PRESETS, percentile, play_game, run_bench
+
+
+def test_play_game_is_deterministic():
+    """
+    Test the same seed plays the same game.
+    """
+    width, height, mines = PRESETS["beginner"]
+    first = play_game((width, height, mines, 7, 28))
+    second = play_game((width, height, mines, 7, 28))
+    assert first["state"] == second["state"]
+    assert first["state"] != GameState.PLAYING
+    assert len(first["latencies"]) == len(second["latencies"])
+
+def test_run_bench_report():
+    """
+    Test the report counts games and splits time over solver phases.
+    """
+    report = run_bench(9, 9, 10, games=4, seed=0, workers=1)
+    assert report["games"] == 4
+    assert report["wins"] + report["losses"] + report["unfinished"] == 4
+    assert report["moves"] > 0
+    assert report["move_latency_ms"]["median"] <= report["move_latency_ms"]["p99"]
+    assert set(report["phase_time_s"]) >= {"frontier", "rules", "enumeration"}
+    assert abs(sum(report["phase_share"].values()) - 1.0) < 1e-9
+
+def test_percentile_nearest_rank():
+    """
+    Test nearest-rank percentiles.
+    """
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 0.5) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.5) == 0.0
@@ -1,4 +1,5 @@
 from core.board import Board, CellState, GameState
+from core.flat_board import FlatBoard
 from core.rng import RNG
 
 def test_board_initial_state():
@@ -105,4 +106,51 @@ def test_win_condition():
 
 
 
-    
\ No newline at end of file
+    
+
+def test_apply_batch_matches_single_opens():
+    """
+    Test a batch reveals what the same opens and flags would, in one notification.
+    """
+    for board_cls in (Board, FlatBoard):
+        single = board_cls(16, 16, 40, RNG(9))
+        batch = board_cls(16, 16, 40, RNG(9))
+        single.open(8, 8)
+        batch.open(8, 8)
+
+        safe = [(x, y) for y in range(16) for x in range(16)
+                if single.get_state(x, y) == CellState.UNKNOWN and not single.is_mine(x, y)][:20]
+        mines = sorted(single.mines)[:5]
+
+        for x, y in safe:
+            single.open(x, y)
+        for x, y in mines:
+            single.flag(x, y)
+
+        changes = []
+        batch.add_listener(lambda cells: changes.append(set(cells)))
+        success, revealed, flagged = batch.apply_batch(safe, mines)
+
+        assert success
+        assert flagged == set(mines)
+        assert len(changes) == 1 and changes[0] == revealed | flagged
+        assert batch.revealed_count == single.revealed_count
+        assert batch.flag_count == single.flag_count
+        for y in range(16):
+            for x in range(16):
+                assert batch.get_state(x, y) == single.get_state(x, y)
+
+
+def test_apply_batch_mine_hit():
+    """
+    Test opens stop at the first mine and lose the game.
+    """
+    board = Board(9, 9, 10, RNG(42))
+    board.open(4, 4)
+    mine = sorted(board.mines)[0]
+
+    success, revealed, _ = board.apply_batch([mine, (4, 4)])
+
+    assert not success
+    assert revealed == {mine}
+    assert board.game_state == GameState.LOST
@@ -0,0 +1,54 @@
+# Tests for the frontier component corpus.
+
+import pytest
+
+from core.board import Board
+from core.enumeration import BitsetEnumerator
+from core.frontier import Frontier
+from core.rng import RNG
+from core.rules import Rules
+from minemind.corpus import Corpus, CorpusEntry, extract, main
+
+
+def test_corpus_round_trip():
+    """
+    Test that scopes rebuilt from cell geometry equal the extracted ones
+    and that foreign or damaged data is rejected.
+    """
+    entries = extract(16, 16, 40, games=3)
+    data = Corpus.dumps(entries)
+
+    assert entries and max(len(entry.unknowns) for entry in entries) > 8
+    assert Corpus.loads(data) == entries
+    assert extract(16, 16, 40, games=3) == entries
+    with pytest.raises(ValueError):
+        Corpus.loads(b"MMSN" + data[4:])
+    with pytest.raises(ValueError):
+        Corpus.loads(data[:6])
+
+def test_entries_replay_like_the_board():
+    """
+    Test that an entry gives the same probabilities and rule moves per cell
+    as the component on its board.
+    """
+    board = Board(30, 16, 99, RNG(3))
+    board.open(15, 8)
+    frontier = Frontier(board)
+    for constraints, unknown_indices in frontier.get_components():
+        entry = CorpusEntry.from_component(3, frontier, constraints, unknown_indices)
+        if len(entry.unknowns) <= 20:
+            expected = BitsetEnumerator(constraints, unknown_indices).run().probabilities()
+            replayed = BitsetEnumerator(entry.constraints, entry.unknown_indices).run().probabilities()
+            assert {frontier.unknowns[idx]: p for idx, p in expected.items()} == \
+                   {entry.unknowns[pos]: p for pos, p in replayed.items()}
+        moves = Rules.find_certain_moves(constraints, frontier.mask_to_cells)
+        replayed_moves = Rules.find_certain_moves(entry.constraints, entry.mask_to_cells)
+        assert [(m.cells, m.is_mine) for m in moves] == [(m.cells, m.is_mine) for m in replayed_moves]
+
+def test_corpus_command_writes_file(tmp_path):
+    """
+    Test the corpus command on a small preset.
+    """
+    path = str(tmp_path / "beginner.mmc")
+    assert main([path, "beginner", "--games", "2"]) == 0
+    assert Corpus.load(path) == extract(9, 9, 10, games=2)
@@ -0,0 +1,69 @@
+# Tests for the path-decomposition DP engine.
+
+import pytest
+
+from core.board import Board
+from core.decomposition import PathEnumerator
+from core.enumeration import BitsetEnumerator
+from core.frontier import Constraint, Frontier
+from core.rng import RNG
+from core.solver import ComponentStatus, Solver
+
+
+def by_cell(counts):
+    """
+    Per-cell mine counts keyed by frontier index, independent of order.
+    """
+    return {m: dict(zip(counts.variables, per_cell)) for m, per_cell in counts.mine_counts.items()}
+
+
+def test_dp_small_component():
+    """
+    Test exact counts on a hand-built component and an unsatisfiable one.
+    """
+    constraints = [
+        Constraint((0, 1), 0b0011, 1),
+        Constraint((1, 1), 0b0111, 1),
+        Constraint((2, 1), 0b1100, 1),
+    ]
+    enum = PathEnumerator(constraints, {0, 1, 2, 3}).run()
+
+    assert enum.solutions == {2: 2}
+    assert enum.probabilities() == {0: 0.5, 1: 0.5, 2: 0.0, 3: 1.0}
+
+    unsatisfiable = [Constraint((0, 1), 0b01, 1), Constraint((1, 1), 0b01, 0)]
+    enum = PathEnumerator(unsatisfiable, {0}).run()
+    assert enum.total == 0
+    assert enum.probabilities() == {0: 0.5}
+
+def test_dp_matches_bitset():
+    """
+    Test that solutions and per-cell mine counts by mine count equal the
+    bitset engine's on real frontier components.
+    """
+    for seed in range(10):
+        board = Board(30, 16, 99, RNG(seed))
+        board.open(15, 8)
+        frontier = Frontier(board)
+        for constraints, unknown_indices in frontier.get_components():
+            if len(unknown_indices) > 20:
+                continue
+            fast = BitsetEnumerator(constraints, unknown_indices).run().result()
+            dp = PathEnumerator(constraints, unknown_indices).run().result()
+            assert dp.solutions == fast.solutions
+            assert by_cell(dp) == by_cell(fast)
+
+def test_solver_dp_engine_counts_every_component():
+    """
+    Test that engine="dp" without a k_max cutoff counts every component
+    exactly, with the same probabilities as bitset enumeration.
+    """
+    for seed in range(3):
+        board = Board(16, 16, 40, RNG(seed))
+        board.open(8, 8)
+        exact = Solver(board, k_max=64).compute_probabilities()
+
+        solver = Solver(board, k_max=10 ** 6, engine="dp")
+        probabilities = solver.compute_probabilities()
+        assert all(status.method == ComponentStatus.EXACT for status in solver.status)
+        assert probabilities == pytest.approx(exact)
@@ -0,0 +1,197 @@
+# Tests for the bitset enumeration engine.
+
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from core import decomposition, enumeration
+from core.board import Board, CellState
+from core.decomposition import PathEnumerator
+from core.enumeration import CHECK_EVERY, ORDERS, BitsetEnumerator, EnumerationTimeout, enumerate_local, \
+    variable_order
+from core.frontier import Constraint, Frontier
+from core.metrics import SolverMetrics
+from core.rng import RNG
+from core.signatures import canonical_signature
+from core.solver import Solver
+
+
+def test_bitset_small_component():
+    """
+    Test exact counts on a hand-built component.
+    """
+    constraints = [
+        Constraint((0, 1), 0b011, 1),
+        Constraint((1, 1), 0b111, 1),
+    ]
+    enum = BitsetEnumerator(constraints, {0, 1, 2}).run()
+
+    assert enum.total == 2
+    assert enum.probabilities() == {0: 0.5, 1: 0.5, 2: 0.0}
+
+def test_bitset_no_solution():
+    """
+    Test unsatisfiable component falls back to 0.5.
+    """
+    constraints = [
+        Constraint((0, 1), 0b01, 1),
+        Constraint((1, 1), 0b01, 0),
+    ]
+    enum = BitsetEnumerator(constraints, {0}).run()
+
+    assert enum.total == 0
+    assert enum.probabilities() == {0: 0.5}
+
+def test_engines_agree():
+    """
+    Test bitset and backtrack engines give identical probabilities.
+    """
+    for seed in range(10):
+        board = Board(16, 16, 40, RNG(seed))
+        board.open(8, 8)
+        frontier = Frontier(board)
+
+        for constraints, unknown_indices in frontier.get_components():
+            if len(unknown_indices) > 16:
+                continue
+            fast = Solver(board, engine="bitset")._enumerate_component(
+                constraints, unknown_indices, frontier)
+            slow = Solver(board, engine="backtrack")._enumerate_component(
+                constraints, unknown_indices, frontier)
+            assert fast == slow
+
+def test_enumerate_local_matches_canonical_counts():
+    """
+    Test that the worker entry point returns counts in canonical label order.
+    """
+    board = Board(16, 16, 40, RNG(4))
+    board.open(8, 8)
+    frontier = Frontier(board)
+    for constraints, unknown_indices in frontier.get_components():
+        solver = Solver(board)
+        signature, order = canonical_signature(constraints, unknown_indices, frontier.unknowns)
+        counts = solver._count_component(constraints, unknown_indices, frontier)
+        solutions, mine_counts, nodes, _ = enumerate_local(len(order), signature[1])
+        assert counts.variables == order
+        assert (solutions, mine_counts) == (counts.solutions, counts.mine_counts)
+        assert nodes > 0
+
+def test_process_pool_matches_inline():
+    """
+    Test that dispatching components to a process pool gives the same
+    probabilities and moves as enumerating them inline.
+    """
+    metrics = SolverMetrics()
+    with ProcessPoolExecutor(2) as pool:
+        for seed in range(5):
+            board = Board(16, 16, 40, RNG(seed))
+            board.open(8, 8)
+            inline = Solver(board)
+            pooled = Solver(board, executor=pool, parallel_min=1, metrics=metrics)
+
+            expected = inline.compute_probabilities()
+            probabilities = pooled.compute_probabilities()
+            assert probabilities.keys() == expected.keys()
+            for cell, prob in expected.items():
+                assert probabilities[cell] == pytest.approx(prob)
+            assert pooled.step_batch() == inline.step_batch()
+    assert metrics.counters["dispatched"] > 0
+
+def test_orders_and_propagation_agree():
+    """
+    Test that every variable order, with and without propagation, gives the
+    same counts per cell, and that propagation visits fewer nodes.
+    """
+    for seed in range(5):
+        board = Board(30, 16, 99, RNG(seed))
+        board.open(15, 8)
+        frontier = Frontier(board)
+        for constraints, unknown_indices in frontier.get_components():
+            if len(unknown_indices) > 20:
+                continue
+            expected = BitsetEnumerator(constraints, unknown_indices).run()
+            for order in ORDERS:
+                plain = BitsetEnumerator(constraints, unknown_indices, order).run()
+                forced = BitsetEnumerator(constraints, unknown_indices, order, propagate=True).run()
+                assert sorted(plain.variables) == expected.variables
+                assert forced.nodes <= plain.nodes
+                assert forced.pruned >= 0
+                for enum in (plain, forced):
+                    assert enum.solutions == expected.solutions
+                    assert enum.probabilities() == expected.probabilities()
+
+def test_variable_order_in_workers_and_solver():
+    """
+    Test that enumerate_local returns label-order counts for any order and
+    that Solver rejects unknown orders.
+    """
+    board = Board(16, 16, 40, RNG(4))
+    board.open(8, 8)
+    frontier = Frontier(board)
+    for constraints, unknown_indices in frontier.get_components():
+        signature, order = canonical_signature(constraints, unknown_indices, frontier.unknowns)
+        expected = enumerate_local(len(order), signature[1])[:2]
+        assert enumerate_local(len(order), signature[1], "constrained", True)[:2] == expected
+        assert len(variable_order(constraints, unknown_indices, "bfs")) == len(unknown_indices)
+
+    with pytest.raises(ValueError):
+        Solver(board, order="random")
+
+
+def node_clock(monkeypatch, enumerator):
+    """
+    Make the engines read their node or state count as the clock, so a
+    deadline is a number of nodes.
+    """
+    clock = SimpleNamespace(perf_counter=lambda: enumerator.nodes)
+    monkeypatch.setattr(enumeration, "time", clock)
+    monkeypatch.setattr(decomposition, "time", clock)
+
+
+def test_deadline_overrun_on_large_component(monkeypatch):
+    """
+    Test that the bitset and DP engines raise EnumerationTimeout within
+    CHECK_EVERY nodes of the deadline on a component of hundreds of
+    unknowns, where a DP run has fewer states than a coarse interval.
+    """
+    board = Board(40, 40, 320, RNG(0))
+    board.open(20, 20)
+    rng = RNG(1)
+    for _ in range(80):
+        safe = [(x, y) for y in range(40) for x in range(40)
+                if board.get_state(x, y) == CellState.UNKNOWN and not board.is_mine(x, y)]
+        board.open(*rng.choice(safe))
+    constraints, unknown_indices = max(Frontier(board).get_components(), key=lambda c: len(c[1]))
+    assert len(unknown_indices) > 300
+
+    for enumerator in (BitsetEnumerator(constraints, unknown_indices),
+                       BitsetEnumerator(constraints, unknown_indices, "bfs", True),
+                       PathEnumerator(constraints, unknown_indices)):
+        node_clock(monkeypatch, enumerator)
+        with pytest.raises(EnumerationTimeout):
+            enumerator.run(deadline=1000)
+        assert 1000 < enumerator.nodes <= 1000 + CHECK_EVERY
+
+
+def test_component_deeper_than_recursion_limit(monkeypatch):
+    """
+    Test that every engine searches a component with more unknowns than
+    the recursion limit and times out rather than overflowing the stack.
+    """
+    k = sys.getrecursionlimit() + 100
+    unknown_indices = set(range(k))
+    one_empty_scope = [Constraint(None, (1 << k) - 1, 0)]
+    solver = Solver(Board(1, 1, 0, RNG(0)), engine="backtrack")
+    assert solver._run_engine(one_empty_scope, unknown_indices).solutions == {0: 1}
+    assert BitsetEnumerator(one_empty_scope, unknown_indices).run().solutions == {0: 1}
+
+    # one branch per pair with propagation, so 2k unknowns to go k deep
+    pairs = [Constraint(None, 0b11 << (2 * i), 1) for i in range(k)]
+    for propagate in (False, True):
+        enumerator = BitsetEnumerator(pairs, set(range(2 * k)), "sorted", propagate)
+        node_clock(monkeypatch, enumerator)
+        with pytest.raises(EnumerationTimeout):
+            enumerator.run(deadline=4 * k)
+        assert enumerator.total > 0
@@ -0,0 +1,66 @@
+# Tests for the flat array-backed board.
+
+from core.board import Board, CellState
+from core.flat_board import FlatBoard
+from core.rng import RNG
+
+
+def test_flat_board_matches_board():
+    """
+    Test same seed gives same mines, counts and flood fill.
+    """
+    for seed in range(10):
+        board = Board(16, 16, 40, RNG(seed))
+        flat = FlatBoard(16, 16, 40, RNG(seed))
+
+        assert board.open(8, 8) == flat.open(8, 8)
+        assert set(board.mines) == set(flat.mines)
+
+        for y in range(16):
+            for x in range(16):
+                assert board.get_state(x, y) == flat.get_state(x, y)
+                assert board.get_count(x, y) == flat.get_count(x, y)
+                assert board.is_mine(x, y) == flat.is_mine(x, y)
+
+def test_flat_board_state_rows():
+    """
+    Test state[y][x] writes through to the flat buffer.
+    """
+    board = FlatBoard(5, 4, 2, RNG(1))
+    board.flag(3, 2)
+
+    assert board.state[2][3] == CellState.FLAGGED
+    assert board.cells[2 * 5 + 3] == CellState.FLAGGED
+    assert board.get_state(3, 2) == CellState.FLAGGED
+
+def test_flat_mines_view():
+    """
+    Test mines view supports membership, length and iteration.
+    """
+    board = FlatBoard(9, 9, 10, RNG(42))
+    board.open(4, 4)
+
+    assert len(board.mines) == 10
+    assert len(set(board.mines)) == 10
+    assert (4, 4) not in board.mines
+    assert (-1, 0) not in board.mines
+    for x, y in board.mines:
+        assert board.get_count(x, y) == -1
+
+def test_lazy_counts_match_eager():
+    """
+    Test lazy counts reveal the same cells and only compute what is read.
+    """
+    for seed in range(5):
+        eager = FlatBoard(40, 30, 200, RNG(seed))
+        lazy = FlatBoard(40, 30, 200, RNG(seed), lazy_counts=True)
+
+        assert list(eager.open(20, 15)[1].indices) == list(lazy.open(20, 15)[1].indices)
+        assert lazy.count_buf.computed() < 40 * 30
+        assert lazy.count_buf.computed() == 40 * 30 - bytes(lazy.count_buf.memo).count(0)
+
+        for y in range(30):
+            for x in range(40):
+                assert eager.get_count(x, y) == lazy.get_count(x, y)
+        assert lazy.count_buf.computed() == 40 * 30
+        assert dict(eager.counts.items()) == dict(lazy.counts.items())
@@ -2,7 +2,8 @@
 
 from core.board import Board, CellState
 from core.rng import RNG
-from core.frontier import Frontier
+from core.frontier import Frontier, mask_indices
+from core.solver import Solver
 
 
 def test_frontier_extraction():
@@ -46,3 +47,105 @@ def test_bitmask_conversion():
 
         reconstructed_mask = frontier.cells_to_mask(cells)
         assert mask == reconstructed_mask
+
+def test_incremental_matches_rebuild():
+    """
+    Test incremental frontier stays equal to a full rebuild.
+    """
+    rng = RNG(7)
+    board = Board(16, 16, 40, rng)
+    frontier = Frontier(board, incremental=True)
+    board.open(8, 8)
+
+    for y in range(board.height):
+        for x in range(board.width):
+            if board.game_state != 0:
+                break
+            if board.get_state(x, y) != CellState.UNKNOWN:
+                continue
+            if board.is_mine(x, y):
+                board.flag(x, y)
+            elif (x + y) % 3 == 0:
+                board.open(x, y)
+
+            frontier.refresh()
+            rebuilt = Frontier(board)
+            unknown = [(x2, y2) for y2 in range(board.height) for x2 in range(board.width)
+                       if board.get_state(x2, y2) == CellState.UNKNOWN]
+            assert frontier.unknown_count() == len(unknown)
+            assert set(frontier.unconstrained_cells()) == set(unknown) - set(frontier.unknowns)
+            assert frontier.unknowns == rebuilt.unknowns
+            assert [(c.cell, c.scope_mask, c.remaining) for c in frontier.constraints] == \
+                   [(c.cell, c.scope_mask, c.remaining) for c in rebuilt.constraints]
+
+def test_refresh_without_changes():
+    """
+    Test refresh is a no-op when the board did not change.
+    """
+    rng = RNG(42)
+    board = Board(9, 9, 10, rng)
+    board.open(4, 4)
+    frontier = Frontier(board, incremental=True)
+
+    assert not frontier.refresh()
+    board.flag(0, 0)
+    assert frontier.refresh()
+
+def test_dropped_solvers_leave_no_listeners():
+    """
+    Test that closed or dropped solvers unsubscribe their frontiers, so
+    solvers rebuilt on one board do not pile up listeners.
+    """
+    board = Board(9, 9, 10, RNG(42))
+    board.open(4, 4)
+    listeners = list(board._listeners)
+
+    solver = Solver(board)
+    assert len(board._listeners) == len(listeners) + 1
+    solver.close()
+    board.flag(0, 0)
+    assert not solver.frontier.refresh()
+    assert board._listeners == listeners
+
+    for _ in range(5):
+        Solver(board).compute_probabilities()
+    assert board._listeners == listeners
+
+def test_components_partition_constraints():
+    """
+    Test components split constraints into non-overlapping groups, in order.
+    """
+    rng = RNG(11)
+    board = Board(40, 40, 250, rng)
+    board.open(20, 20)
+    for _ in range(30):
+        x, y = rng.randint(0, 39), rng.randint(0, 39)
+        if not board.is_mine(x, y):
+            board.open(x, y)
+    frontier = Frontier(board)
+
+    components = frontier.get_components()
+    assert len(components) > 1
+    seen = [c for constraints, _ in components for c in constraints]
+    assert sorted(seen, key=lambda c: (c.cell[1], c.cell[0])) == frontier.constraints
+    firsts = [frontier.constraints.index(constraints[0]) for constraints, _ in components]
+    assert firsts == sorted(firsts)
+
+    masks = []
+    for constraints, unknown_indices in components:
+        mask = 0
+        for c in constraints:
+            mask |= c.scope_mask
+        assert set(mask_indices(mask)) == unknown_indices
+        masks.append(mask)
+    for i in range(len(masks)):
+        for j in range(i + 1, len(masks)):
+            assert masks[i] & masks[j] == 0
+
+def test_mask_indices():
+    """
+    Test set bits come back in ascending order.
+    """
+    assert mask_indices(0) == []
+    assert mask_indices(0b101001) == [0, 3, 5]
+    assert mask_indices(1 << 500 | 2) == [1, 500]
@@ -60,3 +60,50 @@ def test_deterministic_placement():
     mines2 = gen2.place_mines(3, 3)
 
     assert mines1 == mines2
+
+def test_mine_indices_match_place_mines():
+    """
+    Test flat-index placement gives the same mines for the same seed.
+    """
+    for seed in range(20):
+        mines = Generator(16, 16, 40, RNG(seed)).place_mines(0, 5)
+        indices = Generator(16, 16, 40, RNG(seed)).place_mine_indices(0, 5)
+
+        assert mines == {(i % 16, i // 16) for i in indices}
+
+def test_numpy_counts_match_fallback():
+    """
+    Test the NumPy count path matches the pure-Python path.
+    """
+    import pytest
+    pytest.importorskip("numpy")
+
+    for seed in range(10):
+        gen = Generator(30, 16, 99, RNG(seed), use_numpy=True)
+        indices = gen.place_mine_indices(15, 8)
+
+        fast = Generator.compute_count_grid(indices, 30, 16, use_numpy=True)
+        slow = Generator.compute_count_grid(indices, 30, 16, use_numpy=False)
+        assert fast == slow
+        assert gen.mine_grid(indices) == Generator(30, 16, 99, RNG(seed)).mine_grid(indices)
+
+def test_neighbor_table_matches_get_neighbors():
+    """
+    Test cached neighbour tables agree with get_neighbors, with and without full tables.
+    """
+    from core.neighbors import NeighborTable
+
+    tabled = NeighborTable(7, 5)
+    limit = NeighborTable.TABLE_LIMIT
+    NeighborTable.TABLE_LIMIT = 0
+    try:
+        offsets = NeighborTable(7, 5)
+    finally:
+        NeighborTable.TABLE_LIMIT = limit
+
+    for y in range(5):
+        for x in range(7):
+            expected = Generator.get_neighbors(x, y, 7, 5)
+            for table in (tabled, offsets):
+                assert set(table.cells(x, y)) == expected
+                assert {(n % 7, n // 7) for n in table.neighbors(y * 7 + x)} == expected
@@ -0,0 +1,120 @@
+# Tests for undo/redo and speculative solver moves.
+
+import os
+import tempfile
+
+from core.board import Board, GameState
+from core.flat_board import FlatBoard
+from core.frontier import Frontier
+from core.history import History
+from core.journal import Journal, JournalReader
+from core.rng import RNG
+from core.rules import Move
+from core.solver import Solver
+
+
+def board_key(board):
+    """
+    State and counters that undo has to restore.
+    """
+    cells = bytes(board.get_state(x, y) for y in range(board.height) for x in range(board.width))
+    return cells, board.revealed_count, board.flag_count, board.game_state
+
+
+def test_undo_redo_round_trip():
+    """
+    Test that undo walks back through every call, including a lost game,
+    and redo walks forward again.
+    """
+    for board_cls in (Board, FlatBoard):
+        board = board_cls(16, 16, 40, RNG(3))
+        history = History(board)
+        keys = [board_key(board)]
+
+        board.open(8, 8)
+        keys.append(board_key(board))
+        board.flag(0, 0)
+        keys.append(board_key(board))
+        mine = next(iter(board.mines))
+        board.open(*mine)
+        keys.append(board_key(board))
+        assert board.game_state == GameState.LOST
+
+        for key in reversed(keys[:-1]):
+            assert history.undo() is not None
+            assert board_key(board) == key
+        assert history.undo() is None
+
+        for key in keys[1:]:
+            assert history.redo() is not None
+            assert board_key(board) == key
+        assert history.redo() is None
+
+
+def test_new_call_clears_redo():
+    """
+    Test that a call after an undo drops the undone branch.
+    """
+    board = Board(9, 9, 10, RNG(42))
+    history = History(board)
+    board.open(4, 4)
+    board.flag(0, 0)
+    history.undo()
+    assert history.redo_stack
+
+    x, y = next((x, y) for y in range(9) for x in range(9) if board.get_state(x, y) == 0)
+    board.flag(x, y)
+    assert not history.redo_stack
+    assert len(history.undo_stack) == 2
+
+
+def test_speculate_rolls_back_board_and_frontier():
+    """
+    Test that speculative moves are undone and the incremental frontier
+    matches a fresh one afterwards.
+    """
+    board = Board(16, 16, 40, RNG(11))
+    board.open(8, 8)
+    solver = Solver(board)
+    before = board_key(board)
+    probabilities = solver.compute_probabilities()
+    riskiest = max(probabilities, key=probabilities.get)
+
+    with solver.speculate([Move({riskiest}, False, "GUESS", "")]) as success:
+        assert board.get_state(*riskiest) != 0
+        assert success == (board.game_state != GameState.LOST)
+
+    assert board_key(board) == before
+    solver.frontier.refresh()
+    fresh = Frontier(board)
+    assert solver.frontier.constraints == fresh.constraints
+    assert solver.compute_probabilities() == probabilities
+
+
+def test_speculate_leaves_outer_history_and_journal_alone():
+    """
+    Test that an outer History and a Journal see neither the speculative
+    moves nor their rollback.
+    """
+    board = Board(16, 16, 40, RNG(3))
+    history = History(board)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "game.mmj")
+        journal = Journal(board, path)
+        board.open(8, 8)
+        solver = Solver(board)
+        before = board_key(board)
+
+        moves = solver.step_batch()
+        assert moves
+        with solver.speculate(moves):
+            assert board_key(board) != before
+        assert board_key(board) == before
+        assert len(history.undo_stack) == 1
+        journal.close()
+        assert len(JournalReader(path)) == 1
+
+        history.undo()
+        assert board.revealed_count == 0
+        history.redo()
+        assert board_key(board) == before
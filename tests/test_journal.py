@@ -0,0 +1,129 @@
+# Tests for the action journal and replay.
+
+import os
+import tempfile
+
+from core.board import Action, Board
+from core.flat_board import FlatBoard
+from core.history import History
+from core.journal import Journal, JournalReader
+from core.rng import RNG
+from core.solver import Solver
+
+
+def board_key(board):
+    """
+    Everything replay has to reproduce.
+    """
+    cells = bytes(board.get_state(x, y) for y in range(board.height) for x in range(board.width))
+    return cells, board.game_state, board.flag_count, board.revealed_count
+
+
+def test_replay_reaches_every_recorded_point():
+    """
+    Test that board_at(n) matches the live board after each call, across
+    checkpoints, solver waves and an unseeded board.
+    """
+    with tempfile.NamedTemporaryFile(suffix='.mmj', delete=False) as f:
+        filepath = f.name
+
+    try:
+        board = FlatBoard(16, 16, 40, RNG(None))
+        journal = Journal(board, filepath, checkpoint_every=5)
+        seen = {0: board_key(board)}
+
+        board.open(8, 8)
+        seen[journal.actions] = board_key(board)
+        solver = Solver(board)
+        for _ in range(6):
+            moves = solver.step_batch()
+            if not moves:
+                break
+            solver.apply_moves(moves)
+            seen[journal.actions] = board_key(board)
+        board.flag(0, 0)
+        board.flag(0, 0)
+        seen[journal.actions] = board_key(board)
+        journal.close()
+
+        reader = JournalReader(filepath)
+        assert len(reader) == journal.actions
+        assert len(reader.checkpoints) > 2
+        for n, key in seen.items():
+            assert board_key(reader.board_at(n)) == key
+            assert board_key(reader.board_at(n, compact=True)) == key
+    finally:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+
+
+def test_chord_is_one_action():
+    """
+    Test that a chord is recorded once, not as the opens it performs.
+    """
+    board = Board(9, 9, 10, RNG(42))
+    board.open(4, 4)
+    recorded = []
+    board.add_action_listener(lambda delta: recorded.extend(delta.actions))
+
+    for y in range(9):
+        for x in range(9):
+            count = board.get_count(x, y)
+            if board.get_state(x, y) == 1 and count:
+                for nx, ny in board.neighbors.cells(x, y):
+                    if board.is_mine(nx, ny) and board.get_state(nx, ny) == 0:
+                        board.flag(nx, ny)
+                recorded.clear()
+                success, revealed = board.chord(x, y)
+                if revealed:
+                    assert success
+                    assert recorded == [(Action.CHORD, x, y)]
+                    return
+    assert False, "no chord opened anything"
+
+
+def test_reader_ignores_torn_tail():
+    """
+    Test that a record cut off mid-write is dropped on replay.
+    """
+    with tempfile.NamedTemporaryFile(suffix='.mmj', delete=False) as f:
+        filepath = f.name
+
+    try:
+        board = Board(9, 9, 10, RNG(7))
+        journal = Journal(board, filepath)
+        board.open(4, 4)
+        board.flag(0, 0)
+        journal.close()
+        with open(filepath, 'ab') as f:
+            f.write(bytes([Action.OPEN, 1, 0]))
+
+        reader = JournalReader(filepath)
+        assert len(reader) == 2
+        assert board_key(reader.board_at()) == board_key(board)
+    finally:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+
+
+def test_undo_is_journaled_as_checkpoint():
+    """
+    Test that replay follows an undo, which has no actions to record.
+    """
+    with tempfile.NamedTemporaryFile(suffix='.mmj', delete=False) as f:
+        filepath = f.name
+
+    try:
+        board = Board(9, 9, 10, RNG(42))
+        journal = Journal(board, filepath)
+        history = History(board)
+        board.open(4, 4)
+        x, y = next((x, y) for y in range(9) for x in range(9) if board.get_state(x, y) == 0)
+        board.flag(x, y)
+        history.undo()
+        journal.close()
+
+        assert board_key(JournalReader(filepath).board_at()) == board_key(board)
+    finally:
+        if os.path.exists(filepath):
+            os.remove(filepath)
@@ -40,3 +40,19 @@ def test_lru_update():
     assert cache.get('a') == 1
     assert cache.get('b') is None
 
+
+def test_lru_hit_counters():
+    """
+    Test hit/miss counters and hit rate.
+    """
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.get('a')
+    cache.get('b')
+
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert cache.hit_rate() == 0.5
+
+    cache.reset_stats()
+    assert cache.hit_rate() == 0.0
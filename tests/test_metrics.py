@@ -0,0 +1,61 @@
+# Tests for opt-in solver metrics.
+
+from core.board import Board
+from core.enumeration import BitsetEnumerator
+from core.frontier import Constraint
+from core.metrics import SolverMetrics
+from core.rng import RNG
+from core.solver import Solver
+
+
+def test_metrics_do_not_change_results():
+    """
+    Test a solver with metrics gives the same answers and fills counters.
+    """
+    plain_board = Board(16, 16, 40, RNG(5))
+    timed_board = Board(16, 16, 40, RNG(5))
+    plain_board.open(8, 8)
+    timed_board.open(8, 8)
+
+    metrics = SolverMetrics()
+    plain = Solver(plain_board)
+    timed = Solver(timed_board, metrics=metrics)
+    assert plain.compute_probabilities() == timed.compute_probabilities()
+    assert plain.auto_solve(True, 1000) == timed.auto_solve(True, 1000)
+
+    counters = metrics.counters
+    assert counters["components"] > 0
+    assert counters["cache_hits"] + counters["cache_misses"] > 0
+    assert counters["enumerated"] == counters["cache_misses"]
+    assert sum(metrics.component_sizes.values()) == counters["enumerated"]
+    assert metrics.phase_calls["frontier"] > 0
+    assert all(seconds >= 0.0 for seconds in metrics.phase_time.values())
+
+def test_pruned_branches():
+    """
+    Test the pruned count derived from nodes and leaves.
+    """
+    c = Constraint(cell=(0, 0), scope_mask=0b11, remaining=1)
+    enumerator = BitsetEnumerator([c], {0, 1}).run()
+    # root -> x0=0 -> x1=1 ; root -> x0=1 -> x1=0 ; x1=0 and x1=1 cut once each
+    assert enumerator.nodes == 5
+    assert enumerator.total == 2
+    assert enumerator.pruned == 2
+
+def test_merge_and_histogram():
+    """
+    Test merging metrics and bucketing component sizes.
+    """
+    a = SolverMetrics()
+    b = SolverMetrics()
+    a.count("nodes", 3)
+    b.count("nodes", 4)
+    a.observe_component(2)
+    b.observe_component(3)
+    b.observe_component(9)
+    a.merge(b)
+    assert a.counters["nodes"] == 7
+    assert a.size_histogram(4) == [(0, 3, 2), (8, 11, 1)]
+    a.reset()
+    assert a.counters["nodes"] == 0
+    assert a.component_sizes == {}
@@ -0,0 +1,71 @@
+# Tests for the compact revealed region and flat flood fill.
+
+from array import array
+
+from core.board import Board, CellState
+from core.flat_board import FlatBoard
+from core.region import Region
+from core.rng import RNG
+
+
+def reference_fill(board, x, y):
+    """
+    Cells a plain BFS over (x, y) tuples would reveal, without touching the board.
+    """
+    seen = {(x, y)}
+    stack = [(x, y)]
+    while stack:
+        cx, cy = stack.pop()
+        if board.get_count(cx, cy) == 0:
+            for cell in board.neighbors.cells(cx, cy):
+                if cell not in seen and board.get_state(*cell) == CellState.UNKNOWN:
+                    seen.add(cell)
+                    stack.append(cell)
+    return seen
+
+
+def test_region_set_behaviour():
+    """
+    Test a region iterates, tests membership and combines like a set of cells.
+    """
+    region = Region(array('i', [0, 5, 7]), 4)
+    assert len(region) == 3
+    assert list(region) == [(0, 0), (1, 1), (3, 1)]
+    assert (1, 1) in region and (2, 1) not in region and (5, 0) not in region
+    assert region == {(0, 0), (1, 1), (3, 1)}
+    assert region | {(2, 2)} == {(0, 0), (1, 1), (3, 1), (2, 2)}
+    region.add((2, 2))
+    region.add((2, 2))
+    assert list(region.indices) == [0, 5, 7, 10]
+
+def test_flood_fill_matches_reference():
+    """
+    Test both boards reveal exactly the cells of a plain BFS.
+    """
+    for board_cls in (Board, FlatBoard):
+        for seed in range(5):
+            board = board_cls(60, 40, 60, RNG(seed))
+            board._place_mines(30, 20)
+            board.first_click_done = True
+            expected = reference_fill(board, 30, 20)
+
+            success, revealed = board.open(30, 20)
+            assert success
+            assert isinstance(revealed, Region)
+            assert set(revealed) == expected
+            assert len(revealed) == len(expected) == board.revealed_count
+
+def test_flood_fill_stops_at_flags():
+    """
+    Test flagged cells are neither revealed nor crossed.
+    """
+    board = Board(20, 1, 1, RNG(0))
+    board._place_mines(0, 0)
+    board.first_click_done = True
+    mine_x = next(iter(board.mines))[0]
+    wall = 5 if mine_x > 6 else 15
+    board.flag(wall, 0)
+
+    _, revealed = board.open(0 if wall == 5 else 19, 0)
+    assert (wall, 0) not in revealed
+    assert board.get_state(wall, 0) == CellState.FLAGGED
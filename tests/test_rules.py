@@ -1,7 +1,9 @@
 # Test for deterministic solver rules.
 
 
-from core.frontier import Constraint
+from core.board import Board
+from core.frontier import Constraint, Frontier
+from core.rng import RNG
 from core.rules import Rules
 
 
@@ -66,3 +68,39 @@ def test_subset_rule():
         if not move.is_mine:
             assert (2, 0) in move.cells
 
+
+def test_propagation_reaches_fixpoint():
+    """
+    Test deductions that need earlier moves come back in one call.
+    """
+    def mask_to_cells(mask):
+        return {(i, 0) for i in range(8) if mask & (1 << i)}
+
+    constraints = [
+        Constraint((0, 1), 0b0001, 0),
+        Constraint((1, 1), 0b0011, 1),
+        Constraint((2, 1), 0b1110, 1),
+    ]
+    one_pass = Rules.apply_singles(constraints, mask_to_cells) + \
+               Rules.apply_subset_rule(constraints, mask_to_cells)
+    assert (2, 0) not in set().union(*(m.cells for m in one_pass))
+
+    moves = Rules.find_certain_moves(constraints, mask_to_cells)
+    safe = set().union(*(m.cells for m in moves if not m.is_mine))
+    mines = set().union(*(m.cells for m in moves if m.is_mine))
+    assert safe == {(0, 0), (2, 0), (3, 0)}
+    assert mines == {(1, 0)}
+    assert sum(len(m.cells) for m in moves) == 4
+
+def test_propagation_moves_are_correct():
+    """
+    Test every propagated move agrees with the board.
+    """
+    for seed in range(10):
+        board = Board(30, 16, 99, RNG(seed))
+        board.open(15, 8)
+        frontier = Frontier(board)
+        for constraints, _ in frontier.get_components():
+            for move in Rules.find_certain_moves(constraints, frontier.mask_to_cells):
+                for x, y in move.cells:
+                    assert board.is_mine(x, y) == move.is_mine
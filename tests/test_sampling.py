@@ -0,0 +1,76 @@
+# Tests for the sampling estimator of large components.
+
+import random
+
+from core.board import Board
+from core.enumeration import BitsetEnumerator
+from core.frontier import Constraint, Frontier
+from core.rng import RNG
+from core.sampling import ComponentSampler, SamplingBudget
+from core.solver import Solver
+
+BUDGET = SamplingBudget(seconds=10.0, sweeps=3000, burn_in=20)
+
+
+def test_sampler_matches_enumeration():
+    """
+    Test that sampled marginals approach the exact ones on a component
+    where a mine can only move together with mines of both other constraints.
+    """
+    constraints = [
+        Constraint((0, 0), 0b0000111, 1),
+        Constraint((1, 0), 0b0011110, 2),
+        Constraint((2, 0), 0b1111000, 2),
+    ]
+    unknown_indices = set(range(7))
+    exact = BitsetEnumerator(constraints, unknown_indices).run().probabilities()
+    sampler = ComponentSampler(constraints, unknown_indices, random.Random(1)).run(BUDGET)
+
+    assert sampler.sweeps == BUDGET.sweeps
+    estimate = sampler.result().probabilities()
+    for idx, prob in exact.items():
+        assert abs(estimate[idx] - prob) < 0.05
+
+
+def test_batches_regroup_all_samples():
+    """
+    Test that batches partition the samples and that a single batch
+    gives no interval.
+    """
+    constraints = [Constraint((0, 0), 0b111, 1)]
+    sampler = ComponentSampler(constraints, {0, 1, 2}, random.Random(2)).run(BUDGET)
+    batches = sampler.batches(BUDGET.batches)
+
+    assert len(batches) == BUDGET.batches
+    assert sum(batch.total for batch in batches) == sampler.result().total == sampler.sweeps
+    assert ComponentSampler.half_width([0.3]) == 1.0
+    assert ComponentSampler.half_width([0.3, 0.3, 0.3]) == 0.0
+
+    unsatisfiable = [Constraint((0, 0), 0b1, 1), Constraint((1, 0), 0b1, 0)]
+    assert ComponentSampler(unsatisfiable, {0}, random.Random(0)).run(BUDGET).sweeps == 0
+
+
+def test_solver_samples_components_above_k_max():
+    """
+    Test that components above k_max get sampled probabilities close to
+    the exact ones, with intervals, instead of the flat density.
+    """
+    for seed in range(3):
+        board = Board(16, 16, 40, RNG(seed))
+        board.open(8, 8)
+        frontier = Frontier(board)
+        large = {frontier.unknowns[idx] for _, unknown_indices in frontier.get_components()
+                 if len(unknown_indices) > 4 for idx in unknown_indices}
+
+        exact = Solver(board, k_max=64).compute_probabilities()
+        flat = Solver(board, k_max=4)
+        flat.compute_probabilities()
+        assert not flat.intervals
+
+        sampling = Solver(board, k_max=4, sampling=SamplingBudget(seconds=10.0, sweeps=800))
+        estimate = sampling.compute_probabilities()
+        assert set(sampling.intervals) == large
+        for cell in large:
+            low, high = sampling.intervals[cell]
+            assert low <= estimate[cell] <= high
+            assert abs(estimate[cell] - exact[cell]) < 0.1
@@ -0,0 +1,71 @@
+# Tests for canonical component signatures.
+
+from core.board import Board
+from core.frontier import Constraint, Frontier
+from core.lru import LRUCache
+from core.rng import RNG
+from core.signatures import canonical_signature
+from core.solver import Solver
+
+
+def _component(cells, scopes):
+    """
+    Build (constraints, unknown_indices, cells) from scopes given as cell lists.
+    """
+    index = {cell: idx for idx, cell in enumerate(cells)}
+    constraints = []
+    for scope, remaining in scopes:
+        mask = 0
+        for cell in scope:
+            mask |= 1 << index[cell]
+        constraints.append(Constraint((0, 0), mask, remaining))
+    return constraints, set(range(len(cells))), cells
+
+def test_signature_translation_and_rotation():
+    """
+    Test translated and rotated copies of a pattern share a signature.
+    """
+    base = [(0, 0), (1, 0), (2, 0), (2, 1)]
+    shifted = [(x + 5, y + 3) for x, y in base]
+    rotated = [(-y, x) for x, y in base]
+
+    signatures = []
+    for cells in (base, shifted, rotated):
+        constraints, unknowns, _ = _component(cells, [(cells[:2], 1), (cells[1:], 2)])
+        signature, _ = canonical_signature(constraints, unknowns, cells)
+        signatures.append(signature)
+
+    assert signatures[0] == signatures[1] == signatures[2]
+
+def test_cached_counts_map_back():
+    """
+    Test a cache hit on a mirrored component returns per-cell results for that component.
+    """
+    base = [(0, 0), (1, 0), (2, 0)]
+    mirrored = [(2, 0), (1, 0), (0, 0)]
+    solver = Solver(Board(1, 1, 0, RNG(0)))
+
+    for cells in (base, mirrored):
+        constraints, unknowns, _ = _component(cells, [([cells[0]], 1), (cells, 2)])
+        frontier = Frontier(Board(1, 1, 0, RNG(0)))
+        frontier.unknowns = cells
+        probs = solver._enumerate_component(constraints, unknowns, frontier)
+
+        assert probs[0] == 1.0
+        assert probs[1] == 0.5
+        assert probs[2] == 0.5
+
+    assert solver.cache.hits == 1
+
+def test_shared_cache_across_games():
+    """
+    Test a shared cache records hits across solvers.
+    """
+    cache = LRUCache(500)
+    for seed in range(5):
+        board = Board(16, 16, 40, RNG(seed))
+        board.open(8, 8)
+        Solver(board, cache=cache).compute_probabilities()
+
+    assert cache.hits + cache.misses > 0
+    assert 0.0 <= cache.hit_rate() <= 1.0
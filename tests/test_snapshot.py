@@ -2,9 +2,12 @@
 
 import os
 import tempfile
+
+import pytest
 from core.board import Board
+from core.flat_board import FlatBoard
 from core.rng import RNG
-from core.snapshot import Snapshot
+from core.snapshot import Snapshot, pack_cells, unpack_cells
 
 
 def test_save_load_round_trip():
@@ -64,3 +67,128 @@ def test_load_determinism():
 
 
 
+
+def test_binary_round_trip_recomputes_counts():
+    """
+    Test that binary snapshots restore state and mines for both board types.
+    """
+    board = FlatBoard(31, 17, 60, RNG(5))
+    board.open(10, 8)
+    board.flag(0, 0)
+
+    with tempfile.NamedTemporaryFile(suffix='.mms', delete=False) as f:
+        filepath = f.name
+
+    try:
+        for compress in (True, False):
+            Snapshot.save_binary(board, filepath, compress=compress)
+            for compact in (False, True):
+                loaded = Snapshot.load(filepath, compact=compact)
+                assert isinstance(loaded, FlatBoard) == compact
+                assert set(loaded.mines) == set(board.mines)
+                assert loaded.revealed_count == board.revealed_count
+                assert loaded.flag_count == board.flag_count
+                for y in range(board.height):
+                    for x in range(board.width):
+                        assert loaded.get_state(x, y) == board.get_state(x, y)
+                        assert loaded.get_count(x, y) == board.get_count(x, y)
+    finally:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+
+
+def test_pack_cells_round_trip():
+    """
+    Test 2-bit and 1-bit packing on lengths that do not fill the last byte.
+    """
+    states = bytes([0, 1, 2, 2, 1, 0, 2])
+    assert len(pack_cells(states, 2)) == 2
+    assert unpack_cells(pack_cells(states, 2), 2, len(states)) == states
+
+    bits = bytes([1, 0, 0, 1, 1, 0, 1, 0, 1])
+    assert len(pack_cells(bits, 1)) == 2
+    assert unpack_cells(pack_cells(bits, 1), 1, len(bits)) == bits
+
+
+def test_json_snapshot_loads_compact():
+    """
+    Test that the existing JSON format still loads, including into a FlatBoard.
+    """
+    board = Snapshot.load(os.path.join(os.path.dirname(__file__), '..', 'my_game.json'))
+    compact = Snapshot.load(os.path.join(os.path.dirname(__file__), '..', 'my_game.json'),
+                            compact=True)
+
+    assert isinstance(compact, FlatBoard)
+    assert set(compact.mines) == set(board.mines)
+    assert compact.revealed_count == board.revealed_count
+    for y in range(board.height):
+        for x in range(board.width):
+            assert compact.get_state(x, y) == board.get_state(x, y)
+            assert compact.get_count(x, y) == board.get_count(x, y)
+
+
+def test_open_mapped_is_copy_on_write():
+    """
+    Test that a mapped raw snapshot matches the board and never writes back.
+    """
+    board = FlatBoard(40, 30, 150, RNG(8))
+    board.open(20, 15)
+
+    with tempfile.NamedTemporaryFile(suffix='.mmr', delete=False) as f:
+        filepath = f.name
+
+    try:
+        Snapshot.save_binary(board, filepath, raw=True)
+        with open(filepath, 'rb') as f:
+            original = f.read()
+
+        mapped = Snapshot.open_mapped(filepath)
+        assert set(mapped.mines) == set(board.mines)
+        for y in range(board.height):
+            for x in range(board.width):
+                assert mapped.get_state(x, y) == board.get_state(x, y)
+                assert mapped.get_count(x, y) == board.get_count(x, y)
+
+        unknown = next((x, y) for y in range(board.height) for x in range(board.width)
+                       if board.get_state(x, y) == 0)
+        mapped.flag(*unknown)
+        assert mapped.get_state(*unknown) == 2
+        with open(filepath, 'rb') as f:
+            assert f.read() == original
+        assert Snapshot.load(filepath, compact=True).get_state(*unknown) == 0
+
+        Snapshot.save_binary(board, filepath)
+        with pytest.raises(ValueError):
+            Snapshot.open_mapped(filepath)
+    finally:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+
+
+def test_cli_mapped_load_does_not_scan(capsys):
+    """
+    Test that loading a large mapped snapshot in the CLI reads no cell
+    counts and builds no solver until a solver command asks for one.
+    """
+    from minemind.cli import CommandHandlers
+
+    board = FlatBoard(600, 600, 36000, RNG(3), lazy_counts=True)
+    board.open(300, 300)
+
+    with tempfile.NamedTemporaryFile(suffix='.mmr', delete=False) as f:
+        filepath = f.name
+
+    try:
+        Snapshot.save_binary(board, filepath, raw=True)
+        handler = CommandHandlers()
+        handler._cmd_load(filepath, mapped=True)
+        assert "Loaded from" in capsys.readouterr().out
+        assert handler.solver is None
+        assert handler.board.count_buf.computed() == 0
+
+        handler._cmd_frontier()
+        assert handler.solver is not None
+        assert handler.board.count_buf.computed() > 0
+    finally:
+        if os.path.exists(filepath):
+            os.remove(filepath)
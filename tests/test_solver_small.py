@@ -1,8 +1,9 @@
 # Tests for solver with exact enumeration.
 
-from core.board import Board, GameState
+from core.board import Board, CellState, GameState
+from core.frontier import Frontier
 from core.rng import RNG
-from core.solver import Solver
+from core.solver import ComponentStatus, Solver
 
 def test_solver_hint():
     """
@@ -80,3 +81,88 @@ def test_guess_selection():
         x, y = guess
         assert 0 <= x < board.width
         assert 0 <= y < board.height
+
+def test_step_batch_moves_are_certain():
+    """
+    Test a wave holds disjoint moves that agree with the board.
+    """
+    board = Board(30, 16, 99, RNG(4))
+    solver = Solver(board)
+    board.open(15, 8)
+
+    moves = solver.step_batch()
+    assert moves
+    seen = set()
+    for move in moves:
+        assert not (move.cells & seen)
+        seen |= move.cells
+        for x, y in move.cells:
+            assert board.is_mine(x, y) == move.is_mine
+
+    assert solver.apply_moves(moves)
+    assert board.game_state != GameState.LOST
+
+def test_budget_ignores_k_max_and_reports_status():
+    """
+    Test that a generous budget enumerates every component whatever k_max,
+    and a spent budget falls back to cached counts or the flat density.
+    """
+    board = Board(16, 16, 40, RNG(6))
+    board.open(8, 8)
+    exact = Solver(board, k_max=64).compute_probabilities()
+
+    solver = Solver(board, k_max=4)
+    flat = solver.compute_probabilities()
+    assert {status.method for status in solver.status} <= {ComponentStatus.EXACT, ComponentStatus.FLAT}
+
+    assert solver.compute_probabilities(budget=0.0) == flat
+    assert all(status.method == ComponentStatus.FLAT for status in solver.status)
+
+    assert solver.compute_probabilities(budget=10.0) == exact
+    assert all(status.method == ComponentStatus.EXACT for status in solver.status)
+    sizes = [len(status.cells) for status in solver.status]
+    assert sizes == sorted(sizes)
+
+    assert solver.compute_probabilities(budget=0.0) == exact
+
+def test_inconsistent_component_is_reported():
+    """
+    Test that a component no assignment fits, after wrong flags, gets 0.5
+    and an INCONSISTENT status instead of the off-frontier density.
+    """
+    board = Board(16, 16, 40, RNG(6))
+    board.open(8, 8)
+    frontier = Frontier(board)
+    constraint = next(c for c in frontier.constraints
+                      if len(frontier.mask_to_cells(c.scope_mask)) > c.remaining + 1)
+    for cell in sorted(frontier.mask_to_cells(constraint.scope_mask))[:constraint.remaining + 1]:
+        board.flag(*cell)
+
+    solver = Solver(board, k_max=64)
+    probabilities = solver.compute_probabilities()
+    inconsistent = [status for status in solver.status if status.method == ComponentStatus.INCONSISTENT]
+    assert inconsistent
+    for status in inconsistent:
+        assert all(probabilities[cell] == 0.5 for cell in status.cells)
+    assert set(probabilities) == {(x, y) for y in range(16) for x in range(16)
+                                  if board.get_state(x, y) == CellState.UNKNOWN}
+
+def test_budget_hint_enumerates_past_k_max():
+    """
+    Test that get_hint with a budget finds an EXACT move in a component
+    above k_max, and reports the components it skipped when out of time.
+    """
+    board = Board(16, 16, 40, RNG(12))
+    board.open(8, 8)
+    solver = Solver(board, k_max=4)
+    solver.apply_moves(solver.step_batch())
+    assert not solver.step_batch()
+    assert solver.get_hint() is None
+
+    assert solver.get_hint(budget=0.0) is None
+    assert {status.method for status in solver.status} == {ComponentStatus.SKIPPED}
+
+    move = solver.get_hint(budget=10.0)
+    assert move is not None and move.rule == "EXACT"
+    assert all(board.is_mine(*cell) == move.is_mine for cell in move.cells)
+    assert solver.status[-1].method == ComponentStatus.EXACT
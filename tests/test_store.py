@@ -0,0 +1,106 @@
+# Tests for the persistent enumeration store.
+
+import os
+import sqlite3
+import tempfile
+
+from core.board import Board
+from core.rng import RNG
+from core.solver import Solver
+from core.store import EnumerationStore
+
+
+def test_store_round_trip():
+    """
+    Test counts survive closing and reopening the store.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "store.db")
+        store = EnumerationStore(path)
+        store.put(((None, ((3, 1),))), ({1: 2}, {1: [1, 1]}))
+        store.close()
+
+        store = EnumerationStore(path)
+        assert store.get(((None, ((3, 1),)))) == ({1: 2}, {1: [1, 1]})
+        assert store.get(((None, ((1, 1),)))) is None
+        assert store.hits == 1
+        assert store.misses == 1
+        store.close()
+
+def test_store_eviction():
+    """
+    Test the store stays within max_entries, dropping least recently used rows.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EnumerationStore(os.path.join(tmp, "store.db"), max_entries=3)
+        for i in range(3):
+            store.put((i,), ({0: 1}, {0: [0]}))
+        store.get((0,))
+        store.put((3,), ({0: 1}, {0: [0]}))
+
+        assert len(store) == 3
+        assert store.get((0,)) is not None
+        store.close()
+
+def test_store_hits_write_in_batches():
+    """
+    Test that hits only write their last_used stamps on flush or close.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "store.db")
+        store = EnumerationStore(path)
+        store.put((0,), ({0: 1}, {0: [0]}))
+        store.put((1,), ({0: 1}, {0: [0]}))
+        changes = store.conn.total_changes
+        for _ in range(10):
+            assert store.get((0,)) is not None
+        assert store.conn.total_changes == changes
+        store.flush()
+        assert store.conn.total_changes == changes + 1
+
+        store.get((1,))
+        store.close()
+        conn = sqlite3.connect(path)
+        order = [row[0] for row in conn.execute("SELECT signature FROM results ORDER BY last_used")]
+        conn.close()
+        assert order == [repr((0,)), repr((1,))]
+
+def test_store_version_mismatch_clears():
+    """
+    Test a store written with another format version is cleared on open.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "store.db")
+        store = EnumerationStore(path)
+        store.put((1,), ({0: 1}, {0: [0]}))
+        store.close()
+
+        conn = sqlite3.connect(path)
+        conn.execute("UPDATE meta SET value = '0' WHERE key = 'version'")
+        conn.commit()
+        conn.close()
+
+        store = EnumerationStore(path)
+        assert len(store) == 0
+        store.close()
+
+def test_solver_warm_start():
+    """
+    Test a second solver with a fresh in-memory cache reads results from the store.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "store.db")
+
+        store = EnumerationStore(path, min_unknowns=1)
+        board = Board(16, 16, 40, RNG(5))
+        board.open(8, 8)
+        first = Solver(board, store=store).compute_probabilities()
+        store.close()
+
+        store = EnumerationStore(path, min_unknowns=1)
+        second = Solver(board, store=store).compute_probabilities()
+
+        assert first == second
+        assert store.hits > 0
+        assert store.misses == 0
+        store.close()
@@ -0,0 +1,67 @@
+# Tests for global mine-count weighting.
+
+import itertools
+
+from core.board import Board, CellState
+from core.enumeration import BitsetEnumerator
+from core.frontier import Constraint
+from core.rng import RNG
+from core.solver import Solver
+from core.weighting import MineCountWeighting
+
+
+def test_convolve():
+    """
+    Test convolution of mine-count distributions.
+    """
+    result = MineCountWeighting.convolve({0: 1, 1: 2}, {1: 3, 2: 1})
+
+    assert result == {1: 3, 2: 7, 3: 2}
+
+def test_combine_weights_by_remaining_mines():
+    """
+    Test a component whose solutions use different numbers of mines.
+    """
+    constraints = [
+        Constraint((0, 1), 0b011, 1),
+        Constraint((1, 1), 0b110, 1),
+    ]
+    counts = BitsetEnumerator(constraints, {0, 1, 2}).run().result()
+
+    assert counts.solutions == {1: 1, 2: 1}
+
+    component_probs, off_prob = MineCountWeighting.combine([counts], 3, 2)
+
+    assert abs(component_probs[0][0] - 0.25) < 1e-12
+    assert abs(component_probs[0][1] - 0.75) < 1e-12
+    assert abs(component_probs[0][2] - 0.25) < 1e-12
+    assert abs(off_prob - 0.25) < 1e-12
+
+def test_solver_matches_brute_force():
+    """
+    Test solver probabilities equal brute force over all mine placements.
+    """
+    for seed in range(20):
+        board = Board(5, 5, 6, RNG(seed))
+        board.open(2, 2)
+        if board.game_state != 0:
+            continue
+
+        unknown = [(x, y) for y in range(5) for x in range(5)
+                   if board.get_state(x, y) == CellState.UNKNOWN]
+        revealed = [(x, y) for y in range(5) for x in range(5)
+                    if board.get_state(x, y) == CellState.REVEALED]
+
+        total = 0
+        mine_counts = {cell: 0 for cell in unknown}
+        for mines in itertools.combinations(unknown, board.num_mines):
+            mine_set = set(mines)
+            if all(sum(1 for n in board.neighbors.cells(x, y) if n in mine_set) == board.get_count(x, y)
+                   for x, y in revealed):
+                total += 1
+                for cell in mines:
+                    mine_counts[cell] += 1
+
+        probs = Solver(board).compute_probabilities()
+        for cell in unknown:
+            assert abs(probs[cell] - mine_counts[cell] / total) < 1e-9